@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.data_access.database import AsyncSessionLocal
 from app.data_access.repositories.user_repository import UserRepository
 from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.data_access.repositories.scholar_neighbor_repository import ScholarNeighborRepository
 from app.data_access.repositories.university_repository import UniversityRepository
 from app.services.university_service import UniversityService
 from app.data_access.repositories.department_repository import DepartmentRepository
@@ -21,8 +22,11 @@ from app.services.email_service import EmailService
 from app.services.scraper.service import ScraperService
 from app.services.research_areas_service import ResearchAreasService
 from app.services.recommendation_service import RecommendationService
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, get_embedding_service as get_shared_embedding_service
 from app.services.scholar_vector_service import ScholarVectorService
+from app.services.semantic_search_service import SemanticSearchService
+from app.services.profile_response_cache import ProfileResponseCache, get_profile_response_cache as get_shared_profile_response_cache
+from app.services.scholar_image_service import ScholarImageService, get_scholar_image_service as get_shared_scholar_image_service
 from app.orchestrators.user_orchestrator import UserOrchestrator
 from app.orchestrators.scraper_orchestrator import ScraperOrchestrator
 from app.schemas.token import TokenPayload
@@ -45,6 +49,9 @@ def get_user_repository(session: AsyncSession = Depends(get_db)) -> UserReposito
 def get_scholar_repository(session: AsyncSession = Depends(get_db)) -> ScholarRepository:
     return ScholarRepository(session)
 
+def get_scholar_neighbor_repository(session: AsyncSession = Depends(get_db)) -> ScholarNeighborRepository:
+    return ScholarNeighborRepository(session)
+
 def get_university_repository(session: AsyncSession = Depends(get_db)) -> UniversityRepository:
     return UniversityRepository(session)
 
@@ -62,11 +69,8 @@ def get_education_history_repository(session: AsyncSession = Depends(get_db)) ->
 def get_academic_history_repository(session: AsyncSession = Depends(get_db)) -> AcademicHistoryRepository:
     return AcademicHistoryRepository(session)
 
-from functools import lru_cache
-
-@lru_cache()
 def get_embedding_service() -> EmbeddingService:
-    return EmbeddingService()
+    return get_shared_embedding_service()
 
 def get_user_service(
     user_repo: UserRepository = Depends(get_user_repository),
@@ -118,6 +122,18 @@ def get_scholar_vector_service(
 ) -> ScholarVectorService:
     return ScholarVectorService(scholar_repo, embedding_service)
 
+def get_semantic_search_service(
+    scholar_repo: ScholarRepository = Depends(get_scholar_repository),
+    embedding_service: EmbeddingService = Depends(get_embedding_service)
+) -> SemanticSearchService:
+    return SemanticSearchService(scholar_repo, embedding_service)
+
+def get_scholar_image_service() -> ScholarImageService:
+    return get_shared_scholar_image_service()
+
+def get_profile_response_cache() -> ProfileResponseCache:
+    return get_shared_profile_response_cache()
+
 def get_saved_search_repository(session: AsyncSession = Depends(get_db)) -> SavedSearchRepository:
     return SavedSearchRepository(session)
 
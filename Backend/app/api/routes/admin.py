@@ -72,6 +72,82 @@ async def generate_scholar_vectors(
         }
 
 
+@router.post("/vector-index/rebuild", response_model=Dict[str, Any])
+async def rebuild_vector_index(
+    background_tasks: BackgroundTasks,
+    index: Optional[str] = Query(None, description="Index to rebuild; all profile vector indexes if omitted"),
+    current_user = Depends(deps.RoleChecker(["ADMIN"]))
+):
+    """
+    Rebuild the HNSW indexes on scholar and user profile vectors.
+    
+    A replacement index is built with CREATE INDEX CONCURRENTLY using the configured
+    vector_index_m and vector_index_ef_construction values and then swapped in, so
+    recommendation queries keep using the old index while the build runs in the background.
+    
+    Args:
+        index: Name of a single index to rebuild. Rebuilds every profile vector index if omitted.
+    
+    Returns:
+        A dictionary confirming that the rebuild has started and listing the affected indexes.
+    
+    Raises:
+        HTTPException: 400 if the index name is unknown.
+        HTTPException: 403 if the current user does not have administrator privileges.
+    """
+    from app.data_access.database import engine
+    from app.services.vector_index_service import VectorIndexService, VECTOR_INDEXES
+    
+    if index is not None and index not in VECTOR_INDEXES:
+        raise HTTPException(status_code=400, detail=f"Unknown vector index: {index}")
+    
+    index_service = VectorIndexService(engine)
+    if index is None:
+        background_tasks.add_task(index_service.rebuild_all)
+    else:
+        background_tasks.add_task(index_service.rebuild_index, index)
+    
+    return {
+        "message": "Vector index rebuild started in background",
+        "indexes": [index] if index else list(VECTOR_INDEXES)
+    }
+
+
+@router.get("/vector-index/recall", response_model=Dict[str, Any])
+async def check_vector_index_recall(
+    sample_size: int = Query(50, ge=1, le=1000, description="Number of random scholar vectors to query with"),
+    top_k: int = Query(20, ge=1, le=200, description="Neighbours compared per query"),
+    ef_search: Optional[int] = Query(None, ge=1, le=1000, description="HNSW ef_search override"),
+    current_user = Depends(deps.RoleChecker(["ADMIN"]))
+):
+    """
+    Compare the HNSW index against exact nearest-neighbour search.
+    
+    Runs the same kNN queries through the index and through a sequential scan and reports
+    the mean and minimum recall@top_k together with latency percentiles for both paths.
+    Useful for tuning vector_index_ef_search and the index build parameters.
+    
+    Args:
+        sample_size: Number of query vectors, sampled from existing scholar vectors.
+        top_k: Number of neighbours retrieved per query.
+        ef_search: Optional ef_search value to test instead of the configured one.
+    
+    Returns:
+        A dictionary with recall figures and index/exact latency summaries in milliseconds.
+    
+    Raises:
+        HTTPException: 403 if the current user does not have administrator privileges.
+    """
+    from app.data_access.database import engine
+    from app.services.vector_index_service import VectorIndexService
+    
+    return await VectorIndexService(engine).check_recall(
+        sample_size=sample_size,
+        top_k=top_k,
+        ef_search=ef_search
+    )
+
+
 class EditRequestResponse(BaseModel):
     request_id: UUID
     user_id: UUID
@@ -244,6 +320,9 @@ async def approve_edit(
         if key != '_reason' and hasattr(scholar, key):
             setattr(scholar, key, value)
     
+    if 'research_areas' in changes:
+        scholar.vector_dirty = True
+    
     edit_request.status = 'APPROVED'
     edit_request.admin_reviewer_id = current_user.user_id
     
@@ -257,6 +336,10 @@ async def approve_edit(
     
     await edit_repo.session.commit()
     await edit_repo.session.refresh(edit_request)
+    await scholar_repo.invalidate_profile_cache(edit_request.scholar_id)
+    
+    if 'research_areas' in changes:
+        scholar_repo.notify_vector_refresh()
     
     return EditRequestResponse(
         request_id=edit_request.request_id,
@@ -501,7 +584,15 @@ async def merge_scholars(
     )
     admin_log_repo.session.add(admin_log)
     
+    await scholar_repo.mark_vector_dirty(
+        primary.scholar_id,
+        *(dup.scholar_id for dup in duplicates),
+        commit=False,
+        notify=False
+    )
     await scholar_repo.session.commit()
+    scholar_repo.notify_vector_refresh()
+    await scholar_repo.invalidate_profile_cache(primary.scholar_id, *(dup.scholar_id for dup in duplicates))
     
     return {"message": f"Successfully merged {len(duplicates)} scholars into primary scholar"}
 
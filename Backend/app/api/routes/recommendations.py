@@ -24,6 +24,8 @@ async def get_recommendations(
     and profile information. Recommendations are calculated using similarity matching
     between user interests and scholar profiles. If research interests are provided,
     they will update the user's profile and trigger a recalculation of recommendations.
+    Otherwise stored recommendations are served as-is, and a background refresh is
+    queued if they were built from an older user vector or scholar index version.
     
     Args:
         skip: Number of recommendations to skip for pagination.
@@ -46,9 +48,13 @@ async def get_recommendations(
                 interests=interests_list,
                 valid_areas=valid_areas
             )
-            await recommendation_service.recalculate_recommendations(current_user.user_id)
+            # The caller asked for recommendations against these interests, so compute
+            # them now; unchanged interests keep the stored ones.
+            await recommendation_service.refresh_recommendations(current_user.user_id)
+    else:
+        await recommendation_service.request_refresh_if_outdated(current_user.user_id)
     
-    recommendations = await recommendation_service.get_recommendations(
+    recommendations, total = await recommendation_service.get_recommendations(
         user_id=current_user.user_id,
         skip=skip,
         limit=limit
@@ -56,7 +62,7 @@ async def get_recommendations(
     
     return RecommendationsListResponse(
         recommendations=recommendations,
-        total=len(recommendations),
+        total=total,
         skip=skip,
         limit=limit
     )
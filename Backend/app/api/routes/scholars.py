@@ -1,20 +1,122 @@
 import json
 import re
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from pydantic import TypeAdapter
 from typing import Optional, List, Dict, Any
 from app.services.scholar_service import ScholarService
 from app.schemas.scholar import (
     ScholarProfileResponse, 
     PublicationResponse,
     ScholarListItemResponse,
-    ScholarsListResponse
+    ScholarsListResponse,
+    SemanticScholarItemResponse,
+    SemanticSearchResponse,
+    SimilarScholarsResponse
 )
 from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.data_access.repositories.scholar_neighbor_repository import ScholarNeighborRepository
+from app.services.semantic_search_service import SemanticSearchService
+from app.services.scholar_image_service import ScholarImageService, THUMBNAIL_SIZES
+from app.services.profile_response_cache import ProfileResponseCache
 from app.api import deps
 
 router = APIRouter()
 
+PUBLICATION_LIST_ADAPTER = TypeAdapter(List[PublicationResponse])
+
+
+def scholar_image_url(request: Request, scholar) -> Optional[str]:
+    """
+    Path of the scholar's image endpoint, versioned with the image hash so
+    it can be cached for good; None if the scholar has no image. Relative,
+    so responses do not depend on the Host header or the scheme the proxy
+    terminated.
+    """
+    if not scholar.image or not scholar.image.image_hash:
+        return None
+    path = request.url_for("get_scholar_image", scholar_id=str(scholar.scholar_id)).path
+    return f"{path}?v={scholar.image.image_hash}"
+
+
+def scholar_image_fields(request: Request, scholar) -> Dict[str, Any]:
+    return dict(
+        image=scholar_image_url(request, scholar),
+        image_hash=scholar.image.image_hash if scholar.image else None
+    )
+
+
+def build_list_item_fields(scholar, request: Request) -> Dict[str, Any]:
+    institution_name = scholar.institution
+    department_name = scholar.department
+    
+    if scholar.department_rel:
+        if scholar.department_rel.university:
+            institution_name = scholar.department_rel.university.name
+        department_name = scholar.department_rel.name
+    
+    metrics = scholar.metrics
+    
+    return dict(
+        scholar_id=scholar.scholar_id,
+        yok_id=scholar.yok_id,
+        full_name=scholar.full_name,
+        title=scholar.title,
+        email=scholar.email,
+        research_areas=scholar.research_areas if scholar.research_areas else [],
+        institution=institution_name,
+        department=department_name,
+        **scholar_image_fields(request, scholar),
+        h_index=metrics.h_index if metrics else 0,
+        citation_count=metrics.citation_count if metrics else 0,
+        publication_count=metrics.publication_count if metrics else 0
+    )
+
+
+IMAGE_CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+IMAGE_CACHE_CONTROL_UNVERSIONED = "public, max-age=300"
+# Profiles change without a URL change, so clients revalidate them with the ETag.
+PROFILE_CACHE_CONTROL = "no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def profile_etag(scholar_id: UUID, version: int, variant: str) -> str:
+    return f'"{scholar_id}-{version}-{variant}"'
+
+
+def build_publication_responses(publications) -> List[PublicationResponse]:
+    responses = []
+    for pub in publications:
+        authors = None
+        if pub.authors_json:
+            if isinstance(pub.authors_json, list):
+                authors = pub.authors_json
+            elif isinstance(pub.authors_json, str):
+                try:
+                    authors = json.loads(pub.authors_json)
+                except (json.JSONDecodeError, TypeError):
+                    authors = None
+        
+        responses.append(PublicationResponse(
+            pub_id=pub.pub_id,
+            title=pub.title,
+            year=pub.year,
+            doi=pub.doi,
+            venue=pub.venue,
+            type=pub.type,
+            publication_index=pub.publication_index,
+            category=pub.category,
+            authors=authors
+        ))
+    return responses
+
 
 @router.get("/titles", response_model=List[str])
 async def get_unique_titles(
@@ -59,6 +161,7 @@ async def get_research_interests(
 
 @router.get("/", response_model=ScholarsListResponse)
 async def list_scholars(
+    request: Request,
     search: Optional[str] = Query(None, description="Search term for name or research areas"),
     field: Optional[str] = Query(None, description="Filter by research field/interest (exact match)"),
     interests: Optional[str] = Query(None, description="Filter by research interests (comma-separated, partial match)"),
@@ -68,18 +171,24 @@ async def list_scholars(
     minHIndex: Optional[int] = Query(None, alias="minHIndex", description="Minimum H-index"),
     maxHIndex: Optional[int] = Query(None, alias="maxHIndex", description="Maximum H-index"),
     minCitations: Optional[int] = Query(None, alias="minCitations", description="Minimum citations"),
-    sortBy: Optional[str] = Query(None, alias="sortBy", description="Sort by: citations, publications, name"),
+    sortBy: Optional[str] = Query(None, alias="sortBy", description="Sort by: citations, publications, hIndex, name"),
     title: Optional[str] = Query(None, description="Filter by academic title"),
+    mode: Optional[str] = Query(None, description="Set to 'hybrid' to rank search results by name/keyword and semantic relevance"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository)
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(True, description="Count all matches exactly; false returns an estimate"),
+    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository),
+    semantic_search_service: SemanticSearchService = Depends(deps.get_semantic_search_service)
 ):
     """
     Retrieve a paginated list of scholars with comprehensive filtering and sorting options.
     
     This endpoint allows you to search and filter scholars based on various criteria including
-    name, research interests, institution, academic metrics, and more. Results are paginated
-    for efficient data retrieval.
+    name, research interests, institution, academic metrics, and more. Filtering, sorting and
+    counting run in the database over the full result set, using the scholar_metrics table
+    for H-index, citation and publication counts. Results are paginated for efficient data
+    retrieval.
     
     Args:
         search: Search term to match against scholar names or research areas (partial match).
@@ -93,12 +202,23 @@ async def list_scholars(
         minCitations: Minimum citation count threshold for filtering results.
         sortBy: Sort order for results - options include 'citations', 'publications', 'name', or 'hIndex'.
         title: Filter by academic title (e.g., Professor, Associate Professor).
+        mode: With 'hybrid' and a search term, results are ranked by reciprocal-rank fusion of
+              trigram name/research-area matches and vector similarity instead of sortBy.
         page: Page number for pagination (starts from 1).
         limit: Number of items to return per page (between 1 and 100).
+        cursor: Opaque cursor from the previous page's next_cursor. The page then starts
+                right after that scholar in the same sortBy order (keyset pagination), so
+                deep pages cost the same as the first one. page is ignored.
+        include_total: If false, total is a cached count for the same filters or the
+                       planner's estimate instead of an exact count (total_is_estimate).
     
     Returns:
         A paginated response containing a list of scholars matching the specified criteria,
-        along with pagination metadata including total count and total pages.
+        along with pagination metadata including total count, total pages and the cursor
+        of the next page (null on the last page).
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for another sortBy.
     """
     skip = (page - 1) * limit
     
@@ -106,87 +226,118 @@ async def list_scholars(
     if interests:
         interests_list = [interest.strip() for interest in interests.split(",") if interest.strip()]
     
-    scholars, total = await scholar_repo.list_scholars(
-        skip=skip,
-        limit=limit,
-        search=search,
-        field=field,
-        interests=interests_list,
-        institution=institution,
-        university_id=university_id,
-        department_id=department_id,
-        min_h_index=minHIndex,
-        max_h_index=maxHIndex,
-        min_citations=minCitations,
-        sort_by=sortBy,
-        title=title
-    )
-    
-    scholar_items = []
-    for scholar in scholars:
-        image_data = None
-        if scholar.image:
-            image_data = scholar.image.image_data
-        
-        institution_name = scholar.institution
-        department_name = scholar.department
-        
-        if scholar.department_rel:
-            if scholar.department_rel.university:
-                institution_name = scholar.department_rel.university.name
-            department_name = scholar.department_rel.name
-        
-        publications = scholar.publications if scholar.publications else []
-        publication_count = len(publications)
-        
-        citation_count = ScholarService.estimate_citation_count(publications)
-        h_index = ScholarService.calculate_h_index(publications)
-        
-        if minHIndex is not None and h_index < minHIndex:
-            continue
-        if maxHIndex is not None and h_index > maxHIndex:
-            continue
-        if minCitations is not None and citation_count < minCitations:
-            continue
-        
-        scholar_items.append(ScholarListItemResponse(
-            scholar_id=scholar.scholar_id,
-            yok_id=scholar.yok_id,
-            full_name=scholar.full_name,
-            title=scholar.title,
-            email=scholar.email,
-            research_areas=scholar.research_areas if scholar.research_areas else [],
-            institution=institution_name,
-            department=department_name,
-            image=image_data,
-            h_index=h_index,
-            citation_count=citation_count,
-            publication_count=publication_count
-        ))
-    
-    if sortBy == "citations":
-        scholar_items.sort(key=lambda x: x.citation_count or 0, reverse=True)
-    elif sortBy == "publications":
-        scholar_items.sort(key=lambda x: x.publication_count or 0, reverse=True)
-    elif sortBy == "hIndex":
-        scholar_items.sort(key=lambda x: x.h_index or 0, reverse=True)
-    else:
-        scholar_items.sort(key=lambda x: x.full_name)
-    
+    if mode == "hybrid" and search and search.strip():
+        ranked = await semantic_search_service.hybrid_search(
+            search.strip(),
+            university_id=university_id,
+            department_id=department_id,
+            title=title,
+            field=field,
+            interests=interests_list,
+            institution=institution,
+            min_h_index=minHIndex,
+            max_h_index=maxHIndex,
+            min_citations=minCitations
+        )
+        # Every candidate already matches the filters, so only the page is loaded.
+        total = len(ranked)
+        scholars = await scholar_repo.get_scholars_for_listing([scholar_id for scholar_id, _ in ranked[skip:skip + limit]])
+        return ScholarsListResponse(
+            scholars=[ScholarListItemResponse(**build_list_item_fields(scholar, request)) for scholar in scholars],
+            total=total,
+            page=page,
+            total_pages=(total + limit - 1) // limit if total > 0 else 1
+        )
+    
+    try:
+        scholar_page = await scholar_repo.list_scholars(
+            skip=skip,
+            limit=limit,
+            search=search,
+            field=field,
+            interests=interests_list,
+            institution=institution,
+            university_id=university_id,
+            department_id=department_id,
+            min_h_index=minHIndex,
+            max_h_index=maxHIndex,
+            min_citations=minCitations,
+            sort_by=sortBy,
+            title=title,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    scholar_items = [ScholarListItemResponse(**build_list_item_fields(scholar, request)) for scholar in scholar_page.scholars]
+    
+    total = scholar_page.total
     total_pages = (total + limit - 1) // limit if total > 0 else 1
     
     return ScholarsListResponse(
         scholars=scholar_items,
         total=total,
         page=page,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=scholar_page.next_cursor,
+        total_is_estimate=scholar_page.total_is_estimate
     )
 
 
+@router.get("/semantic", response_model=SemanticSearchResponse)
+async def semantic_search_scholars(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Free-text description of the research to search for"),
+    university_id: Optional[UUID] = Query(None, description="Filter by university ID"),
+    department_id: Optional[UUID] = Query(None, description="Filter by department ID"),
+    title: Optional[str] = Query(None, description="Filter by academic title"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    semantic_search_service: SemanticSearchService = Depends(deps.get_semantic_search_service)
+):
+    """
+    Search scholars by meaning rather than by keyword.
+    
+    The query text is embedded once and compared against scholar profile vectors with cosine
+    similarity. University, department and title filters are applied inside the vector search,
+    so the results are the best matches among the filtered scholars rather than a filtered
+    subset of the global best matches.
+    
+    Args:
+        q: Free-text query, e.g. a research topic or a short project description.
+        university_id: Restrict results to scholars of this university.
+        department_id: Restrict results to scholars of this department.
+        title: Restrict results to scholars with this academic title.
+        limit: Maximum number of results to return (between 1 and 100).
+    
+    Returns:
+        Scholars ranked by similarity to the query, each with its similarity score.
+    """
+    query = q.strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query must not be empty")
+    
+    results = await semantic_search_service.search_scholars(
+        query,
+        top_k=limit,
+        university_id=university_id,
+        department_id=department_id,
+        title=title
+    )
+    
+    scholar_items = [
+        SemanticScholarItemResponse(**build_list_item_fields(scholar, request), similarity_score=round(score, 4))
+        for scholar, score in results
+    ]
+    return SemanticSearchResponse(query=query, scholars=scholar_items, total=len(scholar_items))
+
+
 @router.get("/{scholar_id}", response_model=ScholarProfileResponse)
 async def get_scholar_profile(
+    request: Request,
     scholar_id: UUID,
-    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository)
+    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository),
+    profile_cache: ProfileResponseCache = Depends(deps.get_profile_response_cache)
 ):
     """
     Retrieve comprehensive profile information for a specific scholar.
@@ -195,6 +346,10 @@ async def get_scholar_profile(
     background, publications, research interests, education history, and professional
     achievements. The response includes calculated metrics such as H-index and citation counts.
     
+    The serialized response is cached per scholar and profile version; the version changes
+    whenever the scholar or any of the profile's records is written. Responses carry an ETag
+    and are answered with 304 Not Modified when the client already has the current version.
+    
     Args:
         scholar_id: Unique identifier of the scholar to retrieve.
     
@@ -206,77 +361,178 @@ async def get_scholar_profile(
     Raises:
         HTTPException: 404 if the scholar with the provided ID is not found.
     """
-    scholar = await scholar_repo.get_scholar_profile(scholar_id)
-    
-    if not scholar:
+    version = await scholar_repo.get_profile_version(scholar_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Scholar not found")
     
-    image_data = None
-    if scholar.image:
-        image_data = scholar.image.image_data
+    headers = {"ETag": profile_etag(scholar_id, version, "profile"), "Cache-Control": PROFILE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
     
-    institution = scholar.institution
-    department = scholar.department
+    body = await profile_cache.get(scholar_id, "profile", version)
+    if body is None:
+        scholar = await scholar_repo.get_scholar_profile(scholar_id)
+        
+        if not scholar:
+            raise HTTPException(status_code=404, detail="Scholar not found")
+        
+        institution = scholar.institution
+        department = scholar.department
+        
+        if scholar.department_id and scholar.department_rel:
+            if scholar.department_rel.university:
+                institution = scholar.department_rel.university.name
+            department = scholar.department_rel.name
+        
+        citation_count = ScholarService.estimate_citation_count(scholar.publications)
+        h_index = ScholarService.calculate_h_index(scholar.publications)
+        
+        profile = ScholarProfileResponse(
+            scholar_id=scholar.scholar_id,
+            yok_id=scholar.yok_id,
+            full_name=scholar.full_name,
+            title=scholar.title,
+            orcid=scholar.orcid,
+            profile_url=scholar.profile_url,
+            email=scholar.email,
+            research_areas=scholar.research_areas if scholar.research_areas else [],
+            institution=institution,
+            department=department,
+            **scholar_image_fields(request, scholar),
+            h_index=h_index,
+            citation_count=citation_count,
+            publications=build_publication_responses(scholar.publications),
+            education=[edu for edu in scholar.education_history],
+            academic_history=[acad for acad in scholar.academic_history],
+            courses=[course for course in scholar.courses],
+            thesis_supervisions=[thesis for thesis in scholar.thesis_supervisions],
+            administrative_duties=[duty for duty in scholar.administrative_duties]
+        )
+        body = profile.model_dump_json().encode("utf-8")
+        # The profile may be newer than the version read above.
+        version = scholar.profile_version
+        headers["ETag"] = profile_etag(scholar_id, version, "profile")
+        await profile_cache.put(scholar_id, "profile", version, body)
+    
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/{scholar_id}/similar", response_model=SimilarScholarsResponse)
+async def get_similar_scholars(
+    request: Request,
+    scholar_id: UUID,
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of similar scholars to return"),
+    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository),
+    neighbor_repo: ScholarNeighborRepository = Depends(deps.get_scholar_neighbor_repository)
+):
+    """
+    Retrieve the scholars whose research profiles are most similar to a given scholar.
     
-    if scholar.department_id and scholar.department_rel:
-        if scholar.department_rel.university:
-            institution = scholar.department_rel.university.name
-        department = scholar.department_rel.name
+    Neighbours are precomputed from profile vectors by scripts/compute_similar_scholars.py
+    and stored in one row per scholar, so this endpoint reads them with a single primary-key
+    lookup instead of running a similarity search per request.
     
-    publications = []
-    for pub in scholar.publications:
-        authors = None
-        if pub.authors_json:
-            if isinstance(pub.authors_json, list):
-                authors = pub.authors_json
-            elif isinstance(pub.authors_json, str):
-                try:
-                    authors = json.loads(pub.authors_json)
-                except (json.JSONDecodeError, TypeError):
-                    authors = None
-        
-        publications.append(PublicationResponse(
-            pub_id=pub.pub_id,
-            title=pub.title,
-            year=pub.year,
-            doi=pub.doi,
-            venue=pub.venue,
-            type=pub.type,
-            publication_index=pub.publication_index,
-            category=pub.category,
-            authors=authors
-        ))
+    Args:
+        scholar_id: Unique identifier of the scholar to find similar scholars for.
+        limit: Maximum number of similar scholars to return (between 1 and 50).
     
-    citation_count = ScholarService.estimate_citation_count(scholar.publications)
-    h_index = ScholarService.calculate_h_index(scholar.publications)
+    Returns:
+        Similar scholars, most similar first, each with its cosine similarity score, and
+        the time the neighbours were computed. The list is empty if none have been computed yet.
     
-    return ScholarProfileResponse(
-        scholar_id=scholar.scholar_id,
-        yok_id=scholar.yok_id,
-        full_name=scholar.full_name,
-        title=scholar.title,
-        orcid=scholar.orcid,
-        profile_url=scholar.profile_url,
-        email=scholar.email,
-        research_areas=scholar.research_areas if scholar.research_areas else [],
-        institution=institution,
-        department=department,
-        image=image_data,
-        h_index=h_index,
-        citation_count=citation_count,
-        publications=publications,
-        education=[edu for edu in scholar.education_history],
-        academic_history=[acad for acad in scholar.academic_history],
-        courses=[course for course in scholar.courses],
-        thesis_supervisions=[thesis for thesis in scholar.thesis_supervisions],
-        administrative_duties=[duty for duty in scholar.administrative_duties]
+    Raises:
+        HTTPException: 404 if the scholar with the provided ID is not found.
+    """
+    neighbors = await neighbor_repo.get_by_scholar(scholar_id)
+    if not neighbors:
+        if not await scholar_repo.get(scholar_id):
+            raise HTTPException(status_code=404, detail="Scholar not found")
+        return SimilarScholarsResponse(scholar_id=scholar_id, scholars=[])
+    
+    scores = dict(zip(neighbors.neighbor_ids[:limit], neighbors.similarities[:limit]))
+    scholars = await scholar_repo.get_scholars_for_listing(list(scores.keys()))
+    
+    return SimilarScholarsResponse(
+        scholar_id=scholar_id,
+        scholars=[
+            SemanticScholarItemResponse(**build_list_item_fields(scholar, request), similarity_score=round(scores[scholar.scholar_id], 4))
+            for scholar in scholars
+        ],
+        computed_at=neighbors.computed_at
     )
 
 
+@router.get("/{scholar_id}/image")
+async def get_scholar_image(
+    request: Request,
+    scholar_id: UUID,
+    size: Optional[int] = Query(None, description=f"Thumbnail size in pixels, one of {', '.join(map(str, THUMBNAIL_SIZES))}"),
+    v: Optional[str] = Query(None, description="Image hash from the image URL; makes the response cacheable indefinitely"),
+    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository),
+    image_service: ScholarImageService = Depends(deps.get_scholar_image_service)
+):
+    """
+    Retrieve a scholar's photo as an image file.
+    
+    List and profile responses link here instead of embedding the base64 photo. The photo
+    is decoded once and kept in a disk cache keyed by its content hash, so repeated requests
+    only look up the hash. Responses carry a strong ETag and are answered with 304 Not Modified
+    when the client already has that version; URLs that include the current hash as `v`
+    are cacheable for a year, since a changed photo gets a new URL.
+    
+    Args:
+        scholar_id: Unique identifier of the scholar.
+        size: Optional thumbnail size; the image is scaled to fit a size x size box as JPEG.
+        v: Image hash the URL was built with.
+    
+    Returns:
+        The image bytes with their media type.
+    
+    Raises:
+        HTTPException: 400 if size is not an allowed thumbnail size.
+        HTTPException: 404 if the scholar has no image.
+    """
+    if size is not None and size not in THUMBNAIL_SIZES:
+        raise HTTPException(status_code=400, detail=f"size must be one of {', '.join(map(str, THUMBNAIL_SIZES))}")
+    
+    image_hash = await scholar_repo.get_image_hash(scholar_id)
+    if not image_hash:
+        raise HTTPException(status_code=404, detail="Image not found")
+    
+    etag = f'"{image_hash}-{size}"' if size else f'"{image_hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMAGE_CACHE_CONTROL_IMMUTABLE if v == image_hash else IMAGE_CACHE_CONTROL_UNVERSIONED
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    
+    cached = image_service.find_cached(image_hash, size)
+    if not cached:
+        stored = await scholar_repo.get_image_data(scholar_id)
+        if not stored:
+            raise HTTPException(status_code=404, detail="Image not found")
+        stored_hash, image_data = stored
+        if stored_hash != image_hash:
+            # Replaced between the two reads; serve the stored version under its own tag.
+            image_hash = stored_hash
+            headers["ETag"] = f'"{image_hash}-{size}"' if size else f'"{image_hash}"'
+            headers["Cache-Control"] = IMAGE_CACHE_CONTROL_UNVERSIONED
+        try:
+            cached = await image_service.store(image_hash, image_data, size)
+        except ValueError:
+            raise HTTPException(status_code=404, detail="Image not found")
+    
+    path, media_type = cached
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
 @router.get("/{scholar_id}/publications", response_model=List[PublicationResponse])
 async def get_scholar_publications(
+    request: Request,
     scholar_id: UUID,
-    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository)
+    scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository),
+    profile_cache: ProfileResponseCache = Depends(deps.get_profile_response_cache)
 ):
     """
     Retrieve all publications associated with a specific scholar.
@@ -285,6 +541,8 @@ async def get_scholar_publications(
     the specified scholar. Each publication includes details such as title, year,
     DOI, venue, publication type, and author information.
     
+    Cached and revalidated with ETag like the scholar profile; only publications are loaded.
+    
     Args:
         scholar_id: Unique identifier of the scholar whose publications are to be retrieved.
     
@@ -295,40 +553,33 @@ async def get_scholar_publications(
     Raises:
         HTTPException: 404 if the scholar with the provided ID is not found.
     """
-    scholar = await scholar_repo.get_scholar_profile(scholar_id)
-    
-    if not scholar:
+    version = await scholar_repo.get_profile_version(scholar_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Scholar not found")
     
-    publications = []
-    for pub in scholar.publications:
-        authors = None
-        if pub.authors_json:
-            if isinstance(pub.authors_json, list):
-                authors = pub.authors_json
-            elif isinstance(pub.authors_json, str):
-                try:
-                    authors = json.loads(pub.authors_json)
-                except (json.JSONDecodeError, TypeError):
-                    authors = None
+    headers = {"ETag": profile_etag(scholar_id, version, "publications"), "Cache-Control": PROFILE_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    body = await profile_cache.get(scholar_id, "publications", version)
+    if body is None:
+        scholar = await scholar_repo.get_with_publications(scholar_id)
         
-        publications.append(PublicationResponse(
-            pub_id=pub.pub_id,
-            title=pub.title,
-            year=pub.year,
-            doi=pub.doi,
-            venue=pub.venue,
-            type=pub.type,
-            publication_index=pub.publication_index,
-            category=pub.category,
-            authors=authors
-        ))
+        if not scholar:
+            raise HTTPException(status_code=404, detail="Scholar not found")
+        
+        publications = build_publication_responses(scholar.publications)
+        body = PUBLICATION_LIST_ADAPTER.dump_json(publications)
+        version = scholar.profile_version
+        headers["ETag"] = profile_etag(scholar_id, version, "publications")
+        await profile_cache.put(scholar_id, "publications", version, body)
     
-    return publications
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/{scholar_id}/collaborations")
 async def get_scholar_collaborations(
+    request: Request,
     scholar_id: UUID,
     scholar_repo: ScholarRepository = Depends(deps.get_scholar_repository)
 ):
@@ -342,7 +593,7 @@ async def get_scholar_collaborations(
     
     The endpoint automatically processes author names, removes date patterns, normalizes
     names for duplicate detection, and consolidates multiple entries for the same person.
-    Scholar images are included in the response when available.
+    Scholar image URLs are included in the response when available.
     
     Args:
         scholar_id: Unique identifier of the scholar whose collaboration network is to be analyzed.
@@ -440,11 +691,8 @@ async def get_scholar_collaborations(
         conditions.append(func.lower(Scholar.full_name) == func.lower(name))
     
     if not conditions:
-        image_data = None
-        if scholar.image:
-            image_data = scholar.image.image_data
         return {
-            "nodes": [{"id": str(scholar_id), "name": scholar.full_name, "image": image_data}],
+            "nodes": [{"id": str(scholar_id), "name": scholar.full_name, "image": scholar_image_url(request, scholar)}],
             "links": []
         }
     
@@ -483,30 +731,24 @@ async def get_scholar_collaborations(
             total_weight += co_author_counts.get(matched_name, 0)
         
         if total_weight > 0:
-            image_data = None
-            if scholar_obj.image:
-                image_data = scholar_obj.image.image_data
+            image_url = scholar_image_url(request, scholar_obj)
             
             if s_name_normalized in name_based_collaborations:
                 name_based_collaborations[s_name_normalized]['weight'] += total_weight
-                if image_data and not name_based_collaborations[s_name_normalized].get('image'):
-                    name_based_collaborations[s_name_normalized]['image'] = image_data
+                if image_url and not name_based_collaborations[s_name_normalized].get('image'):
+                    name_based_collaborations[s_name_normalized]['image'] = image_url
             else:
                 name_based_collaborations[s_name_normalized] = {
                     'id': s_id,
                     'name': s_name,
-                    'image': image_data,
+                    'image': image_url,
                     'weight': total_weight
                 }
     
-    main_scholar_image = None
-    if scholar.image:
-        main_scholar_image = scholar.image.image_data
-    
     nodes = [{
         "id": str(scholar.scholar_id),
         "name": scholar.full_name,
-        "image": main_scholar_image,
+        "image": scholar_image_url(request, scholar),
         "group": 1
     }]
     links = []
@@ -1,6 +1,6 @@
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Query
 from pydantic import BaseModel
 from app.schemas.user import UserCreate, UserResponse, UserUpdate, ProfileUpdate
 from app.schemas.saved_scholar import SavedScholarCreate, SavedScholarResponse
@@ -14,6 +14,7 @@ from app.services.recommendation_service import RecommendationService
 from app.services.log_service import LogService
 from app.data_access.repositories.saved_search_repository import SavedSearchRepository
 from app.api import deps
+from app.api.routes.scholars import scholar_image_fields
 
 router = APIRouter()
 
@@ -73,7 +74,6 @@ async def read_users(
 async def update_profile(
     profile_data: ProfileUpdate,
     request: Request,
-    background_tasks: BackgroundTasks,
     current_user = Depends(deps.get_current_active_user),
     user_service = Depends(deps.get_user_service),
     research_areas_service: ResearchAreasService = Depends(deps.get_research_areas_service),
@@ -85,14 +85,13 @@ async def update_profile(
     
     This endpoint allows authenticated users to update their profile details including
     full name, password, and research interests. When research interests are updated,
-    recommendations are automatically recalculated in the background. Password changes
+    recommendations are queued for a background refresh. Password changes
     are logged for security auditing purposes.
     
     Args:
         profile_data: Contains the fields to be updated (full_name, old_password,
                      new_password, researchInterests).
         request: HTTP request object for extracting client information for logging.
-        background_tasks: FastAPI background tasks for asynchronous recommendation recalculation.
     
     Returns:
         The updated user object with all current profile information.
@@ -175,10 +174,7 @@ async def update_profile(
                 )
                 
                 if interests_updated:
-                    background_tasks.add_task(
-                        recommendation_service.recalculate_recommendations,
-                        current_user.user_id
-                    )
+                    await recommendation_service.request_refresh(current_user.user_id)
                     
                     if not updated_user:
                         updated_user = interests_updated
@@ -294,7 +290,6 @@ async def read_user_me(
 @router.put("/interests", response_model=UserInterestsResponse)
 async def update_user_interests(
     interests_update: UserInterestsUpdate,
-    background_tasks: BackgroundTasks,
     request: Request,
     current_user = Depends(deps.get_current_active_user),
     user_service = Depends(deps.get_user_service),
@@ -307,12 +302,11 @@ async def update_user_interests(
     
     This endpoint allows users to replace their entire research interests list with
     a new set of interests. The update is validated against available research areas,
-    and upon successful update, recommendations are automatically recalculated in the
-    background. The action is logged for tracking purposes.
+    and upon successful update, recommendations are queued for a background
+    refresh. The action is logged for tracking purposes.
     
     Args:
         interests_update: Contains the new list of research interests to set.
-        background_tasks: FastAPI background tasks for asynchronous recommendation recalculation.
         request: HTTP request object for extracting client information for logging.
     
     Returns:
@@ -348,10 +342,7 @@ async def update_user_interests(
             user_agent=user_agent
         )
         
-        background_tasks.add_task(
-            recommendation_service.recalculate_recommendations,
-            current_user.user_id
-        )
+        await recommendation_service.request_refresh(current_user.user_id)
         
         return UserInterestsResponse(interests=interests)
         
@@ -384,7 +375,6 @@ async def get_user_interests(
 @router.post("/me/interests", response_model=UserInterestsResponse)
 async def add_user_interest(
     interest_data: UserInterestAdd,
-    background_tasks: BackgroundTasks,
     request: Request,
     current_user = Depends(deps.get_current_active_user),
     user_service = Depends(deps.get_user_service),
@@ -397,12 +387,11 @@ async def add_user_interest(
     
     This endpoint allows users to add one new research interest to their existing list.
     The interest is validated against available research areas, and if successfully added,
-    recommendations are automatically recalculated in the background. The action is logged
+    recommendations are queued for a background refresh. The action is logged
     for tracking purposes.
     
     Args:
         interest_data: Contains the research interest name to be added.
-        background_tasks: FastAPI background tasks for asynchronous recommendation recalculation.
         request: HTTP request object for extracting client information for logging.
     
     Returns:
@@ -438,10 +427,7 @@ async def add_user_interest(
             user_agent=user_agent
         )
         
-        background_tasks.add_task(
-            recommendation_service.recalculate_recommendations,
-            current_user.user_id
-        )
+        await recommendation_service.request_refresh(current_user.user_id)
         
         return UserInterestsResponse(interests=interests)
         
@@ -454,7 +440,6 @@ async def add_user_interest(
 async def remove_user_interest(
     request: Request,
     interest: str = Query(..., description="Research interest to remove"),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     current_user = Depends(deps.get_current_active_user),
     user_service = Depends(deps.get_user_service),
     recommendation_service: RecommendationService = Depends(deps.get_recommendation_service),
@@ -464,12 +449,11 @@ async def remove_user_interest(
     Remove a single research interest from the current user's interests list.
     
     This endpoint allows users to remove one research interest from their existing list.
-    The interest is removed from the user's profile, and recommendations are automatically
-    recalculated in the background. The action is logged for tracking purposes.
+    The interest is removed from the user's profile, and recommendations are queued
+    for a background refresh. The action is logged for tracking purposes.
     
     Args:
         interest: The name of the research interest to be removed (provided as query parameter).
-        background_tasks: FastAPI background tasks for asynchronous recommendation recalculation.
         request: HTTP request object for extracting client information for logging.
     
     Returns:
@@ -502,10 +486,7 @@ async def remove_user_interest(
             user_agent=user_agent
         )
         
-        background_tasks.add_task(
-            recommendation_service.recalculate_recommendations,
-            current_user.user_id
-        )
+        await recommendation_service.request_refresh(current_user.user_id)
         
         return UserInterestsResponse(interests=interests)
         
@@ -729,6 +710,7 @@ async def read_user(
 
 @router.get("/me/saved-scholars", response_model=List[SavedScholarResponse])
 async def get_saved_scholars(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user = Depends(deps.get_current_active_user),
@@ -738,7 +720,7 @@ async def get_saved_scholars(
     Retrieve all scholars saved by the current authenticated user.
     
     This endpoint provides access to the user's saved scholar list with complete scholar
-    information including academic metrics, publications, and images. Results are paginated
+    information including academic metrics, publications, and image URLs. Results are paginated
     to manage large collections efficiently.
     
     Args:
@@ -759,11 +741,6 @@ async def get_saved_scholars(
         scholar = saved.scholar
         if not scholar:
             continue
-            
-
-        image_data = None
-        if scholar.image:
-            image_data = scholar.image.image_data
         
         institution_name = scholar.institution
         department_name = scholar.department
@@ -787,7 +764,7 @@ async def get_saved_scholars(
             research_areas=scholar.research_areas if scholar.research_areas else [],
             institution=institution_name,
             department=department_name,
-            image=image_data,
+            **scholar_image_fields(request, scholar),
             h_index=h_index,
             citation_count=citation_count,
             publication_count=publication_count
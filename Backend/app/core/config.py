@@ -24,6 +24,32 @@ class Settings(BaseModel):
     github_client_secret: Optional[str] = None
     oauth_redirect_base_url: Optional[str] = None
     frontend_base_url: Optional[str] = None
+    embedding_cache_path: Optional[str] = "cache/embeddings.sqlite3"
+    embedding_cache_size: int = 10000
+    user_vector_mode: str = "joined"
+    embedding_executor_workers: int = 1
+    embedding_batch_window_ms: float = 5.0
+    embedding_max_batch_size: int = 64
+    embedding_server_socket: Optional[str] = None
+    vector_index_m: int = 16
+    vector_index_ef_construction: int = 64
+    vector_index_ef_search: int = 40
+    scholar_vector_index_enabled: bool = False
+    scholar_vector_index_path: str = "cache/scholar_vector_index"
+    scholar_vector_index_reload_seconds: float = 30.0
+    scholar_vector_index_rebuild_min_seconds: float = 60.0
+    hybrid_search_candidates: int = 100
+    hybrid_word_similarity_threshold: float = 0.4
+    recommendation_ttl_seconds: int = 86400
+    recommendation_refresh_debounce_seconds: float = 5.0
+    recommendation_refresh_poll_seconds: float = 5.0
+    recommendation_refresh_in_api: bool = True
+    explanation_semantic_threshold: Optional[float] = None
+    similar_scholars_top_k: int = 20
+    scholar_list_count_cache_seconds: float = 60.0
+    scholar_image_cache_path: str = "cache/scholar_images"
+    profile_cache_size: int = 2000
+    profile_cache_path: Optional[str] = None
 
     class Config:
         env_file = ".env"
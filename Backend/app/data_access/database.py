@@ -1,5 +1,7 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from pgvector.asyncpg import register_vector
 from app.core.config import settings
 import ssl
 
@@ -11,6 +13,16 @@ engine = create_async_engine(
     pool_pre_ping=True
 )
 
+@event.listens_for(engine.sync_engine, "connect")
+def register_vector_codec(dbapi_connection, connection_record):
+    """Exchange ``vector`` values with asyncpg in pgvector's binary format."""
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError:
+        # The extension does not exist yet; main.startup creates it and
+        # recycles the pool so later connections pick the codec up.
+        pass
+
 AsyncSessionLocal = sessionmaker(
     bind=engine,
     class_=AsyncSession,
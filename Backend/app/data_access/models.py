@@ -1,43 +1,55 @@
 import uuid
+import numpy as np
 from typing import List, Optional
-from sqlalchemy import Column, String, Boolean, Text, TIMESTAMP, ForeignKey, Integer, Float, CheckConstraint, JSON, UniqueConstraint, TypeDecorator
+from sqlalchemy import Column, String, Boolean, Text, TIMESTAMP, ForeignKey, Integer, BigInteger, Float, REAL, CheckConstraint, JSON, UniqueConstraint, TypeDecorator, Index, Computed, false
+from sqlalchemy.types import UserDefinedType
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY as PG_ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.data_access.database import Base
 
 
+class _PGVector(UserDefinedType):
+    cache_ok = True
+
+    def __init__(self, dimensions=None):
+        self.dimensions = dimensions
+
+    def get_col_spec(self, **kw):
+        if self.dimensions is None:
+            return "VECTOR"
+        return f"VECTOR({self.dimensions})"
+
+    class comparator_factory(UserDefinedType.Comparator):
+        def cosine_distance(self, other):
+            return self.op("<=>", return_type=Float)(other)
+
+
 class Vector(TypeDecorator):
-    impl = Text
+    """
+    pgvector ``vector(n)`` column.
+
+    Values travel over asyncpg in pgvector's binary format (the codec is
+    registered per connection in ``database.py``), so rows are never formatted
+    to or parsed from ``'[...]'`` strings. The Python value is a 1-d
+    ``numpy.float32`` array.
+    """
+    impl = _PGVector
     cache_ok = True
-    
-    def __init__(self, dimensions=None, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+
+    def __init__(self, dimensions=None):
+        super().__init__(dimensions)
         self.dimensions = dimensions
-    
-    def load_dialect_impl(self, dialect):
-        if dialect.name == 'postgresql':
-            return dialect.type_descriptor(Text)
-        return self.impl
-    
+
     def process_bind_param(self, value, dialect):
         if value is None:
             return None
-        if dialect.name == 'postgresql':
-            if isinstance(value, list):
-                return '[' + ','.join(str(float(v)) for v in value) + ']'
-            return value
-        return str(value)
-    
+        return np.asarray(value, dtype=np.float32)
+
     def process_result_value(self, value, dialect):
         if value is None:
             return None
-        if dialect.name == 'postgresql':
-            if isinstance(value, str):
-                value = value.strip('[]')
-                return [float(x) for x in value.split(',') if x.strip()]
-            return value
-        return value
+        return np.asarray(value, dtype=np.float32)
 
 class User(Base):
     __tablename__ = "user"
@@ -55,6 +67,15 @@ class User(Base):
     password_reset_code = Column(String(6), nullable=True)
     password_reset_expires = Column(TIMESTAMP, nullable=True)
     created_at = Column(TIMESTAMP, server_default=func.now())
+    recommendations_stale = Column(Boolean, nullable=False, default=False, server_default=false())
+    recommendations_requested_at = Column(TIMESTAMP, nullable=True)
+    recommendations_generated_at = Column(TIMESTAMP, nullable=True)
+    recommendation_vector_hash = Column(String(64), nullable=True)
+    recommendation_index_version = Column(String(64), nullable=True)
+
+    __table_args__ = (
+        Index('ix_user_recommendations_stale', 'recommendations_requested_at', postgresql_where=recommendations_stale),
+    )
 
     saved_searches = relationship("SavedSearch", back_populates="user")
     saved_scholars = relationship("SavedScholar", back_populates="user", cascade="all, delete-orphan")
@@ -113,10 +134,22 @@ class Scholar(Base):
     
     last_updated = Column(TIMESTAMP, server_default=func.now())
     profile_vector = Column(Vector(384), nullable=True)
+    vector_dirty = Column(Boolean, nullable=False, default=False, server_default=false())
+    # scholar_vector_version_seq value stamped by the last vector write.
+    vector_version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # Bumped by database triggers whenever the profile response would change.
+    profile_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index('ix_scholar_vector_dirty', 'scholar_id', postgresql_where=vector_dirty),
+        Index('ix_scholar_full_name_id', 'full_name', 'scholar_id'),
+    )
 
     department_rel = relationship("Department", back_populates="scholars")
     
     image = relationship("ScholarImage", uselist=False, back_populates="scholar", cascade="all, delete-orphan")
+    # Written only by database triggers.
+    metrics = relationship("ScholarMetrics", uselist=False, back_populates="scholar", viewonly=True)
 
     education_history = relationship("EducationHistory", back_populates="scholar", cascade="all, delete-orphan")
     academic_history = relationship("AcademicHistory", back_populates="scholar", cascade="all, delete-orphan")
@@ -130,12 +163,48 @@ class Scholar(Base):
     collaborations_b = relationship("Collaboration", back_populates="scholar_b", foreign_keys="[Collaboration.scholar_b_id]")
 
 
+class ScholarMetrics(Base):
+    """
+    Publication metrics per scholar for list filtering and sorting. Rows are
+    maintained by triggers on publication and scholar (see schema_upgrades),
+    so every writer, including the scraper, keeps them current.
+    """
+    __tablename__ = "scholar_metrics"
+
+    scholar_id = Column(UUID(as_uuid=True), ForeignKey("scholar.scholar_id", ondelete="CASCADE"), primary_key=True)
+    publication_count = Column(Integer, nullable=False, default=0, server_default="0")
+    citation_count = Column(Integer, nullable=False, default=0, server_default="0")
+    h_index = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(TIMESTAMP, server_default=func.now())
+
+    scholar = relationship("Scholar", back_populates="metrics")
+
+    __table_args__ = (
+        Index('ix_scholar_metrics_publication_count', 'publication_count', 'scholar_id'),
+        Index('ix_scholar_metrics_citation_count', 'citation_count', 'scholar_id'),
+        Index('ix_scholar_metrics_h_index', 'h_index', 'scholar_id'),
+    )
+
+
+class ScholarNeighbor(Base):
+    """Precomputed nearest scholars by profile vector, one row per scholar, best first."""
+    __tablename__ = "scholar_neighbor"
+
+    scholar_id = Column(UUID(as_uuid=True), ForeignKey("scholar.scholar_id", ondelete="CASCADE"), primary_key=True)
+    neighbor_ids = Column(PG_ARRAY(UUID(as_uuid=True)), nullable=False)
+    similarities = Column(PG_ARRAY(REAL), nullable=False)
+    computed_at = Column(TIMESTAMP, server_default=func.now())
+
+
 class ScholarImage(Base):
     __tablename__ = "scholar_image"
     
     image_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     scholar_id = Column(UUID(as_uuid=True), ForeignKey("scholar.scholar_id"), unique=True, nullable=False)
-    image_data = Column(Text, nullable=False)
+    # Data URL written by the scraper; only read by the image endpoint, which
+    # caches the decoded file, so it is not loaded with the row.
+    image_data = deferred(Column(Text, nullable=False))
+    image_hash = Column(String(32), Computed("md5(image_data)", persisted=True))
     
     scholar = relationship("Scholar", back_populates="image")
 
@@ -298,6 +367,12 @@ class Recommendation(Base):
     
     __table_args__ = (
         UniqueConstraint('user_id', 'scholar_id', name='uq_recommendation_user_scholar'),
+        Index(
+            'ix_recommendation_user_active_score',
+            'user_id',
+            similarity_score.desc(),
+            postgresql_where=(is_dismissed == false())
+        ),
     )
 
 
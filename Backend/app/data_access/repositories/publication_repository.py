@@ -1,7 +1,5 @@
 from app.data_access.repositories.base import BaseRepository
 from app.data_access.models import Publication
-from app.services.scholar_vector_service import ScholarVectorService
-from app.services.embedding_service import EmbeddingService
 from app.data_access.repositories.scholar_repository import ScholarRepository
 from uuid import UUID
 
@@ -10,32 +8,36 @@ class PublicationRepository(BaseRepository[Publication]):
         super().__init__(Publication, session)
         self.session = session
     
-    def _get_vector_service(self):
-        return ScholarVectorService(ScholarRepository(self.session), EmbeddingService())
+    async def _mark_vector_dirty(self, *scholar_ids: UUID):
+        # Joins the transaction committed by the write that follows, so the
+        # publication change and the dirty flag land together.
+        await ScholarRepository(self.session).mark_vector_dirty(*scholar_ids, commit=False, notify=False)
     
     async def create(self, **kwargs) -> Publication:
+        scholar_id = kwargs.get('scholar_id')
+        if scholar_id:
+            await self._mark_vector_dirty(scholar_id)
         instance = await super().create(**kwargs)
         if instance and instance.scholar_id:
-            vector_service = self._get_vector_service()
-            await vector_service.generate_vector_for_scholar(instance.scholar_id)
+            ScholarRepository.notify_vector_refresh()
         return instance
     
     async def update(self, id: UUID, **kwargs) -> Publication:
         instance = await self.get(id)
         if instance:
+            scholar_ids = {instance.scholar_id, kwargs.get('scholar_id', instance.scholar_id)}
+            await self._mark_vector_dirty(*scholar_ids)
             result = await super().update(id, **kwargs)
-            if result and result.scholar_id:
-                vector_service = self._get_vector_service()
-                await vector_service.generate_vector_for_scholar(result.scholar_id)
+            ScholarRepository.notify_vector_refresh()
             return result
         return None
     
     async def delete(self, id: UUID) -> bool:
         instance = await self.get(id)
-        scholar_id = instance.scholar_id if instance else None
+        if instance and instance.scholar_id:
+            await self._mark_vector_dirty(instance.scholar_id)
         result = await super().delete(id)
-        if result and scholar_id:
-            vector_service = self._get_vector_service()
-            await vector_service.generate_vector_for_scholar(scholar_id)
+        if result and instance and instance.scholar_id:
+            ScholarRepository.notify_vector_refresh()
         return result
 
@@ -1,8 +1,62 @@
 from app.data_access.repositories.base import BaseRepository
-from app.data_access.models import Recommendation
+from app.data_access.models import Recommendation, Scholar
 from sqlalchemy.future import select
+from sqlalchemy import delete, func, all_, bindparam, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert, ARRAY as PG_ARRAY, UUID as PG_UUID
 from uuid import UUID
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import uuid
+import numpy as np
+
+CREATE_RECOMMENDATION_STAGING_QUERY = text("""
+    CREATE TEMP TABLE recommendation_staging (
+        rec_id uuid NOT NULL,
+        user_id uuid NOT NULL,
+        scholar_id uuid NOT NULL,
+        similarity_score double precision,
+        explanation jsonb
+    ) ON COMMIT DROP
+""")
+
+MERGE_RECOMMENDATION_STAGING_QUERY = text("""
+    INSERT INTO recommendation (rec_id, user_id, scholar_id, similarity_score, explanation, is_dismissed, generated_at)
+    SELECT rec_id, user_id, scholar_id, similarity_score, explanation, false, now()
+    FROM recommendation_staging
+    ON CONFLICT ON CONSTRAINT uq_recommendation_user_scholar DO UPDATE SET
+        similarity_score = EXCLUDED.similarity_score,
+        explanation = EXCLUDED.explanation,
+        is_dismissed = false,
+        generated_at = now()
+""")
+
+DELETE_STALE_RECOMMENDATIONS_QUERY = text("""
+    DELETE FROM recommendation AS r
+    WHERE r.user_id = ANY(CAST(:user_ids AS uuid[]))
+      AND NOT EXISTS (
+          SELECT 1 FROM recommendation_staging AS s
+          WHERE s.user_id = r.user_id AND s.scholar_id = r.scholar_id
+      )
+""")
+
+# Whether a scholar vector written in (since, until] can change the user's
+# recommendations: it is one of them, or it now scores at least as high as
+# the weakest one (any score while the user has fewer than top_k).
+VECTOR_CHANGES_AFFECTING_USER_QUERY = text("""
+    WITH recommended AS (
+        SELECT scholar_id, similarity_score FROM recommendation WHERE user_id = :user_id
+    ), threshold AS (
+        SELECT CASE WHEN count(*) < :top_k THEN -1 ELSE min(similarity_score) END AS score FROM recommended
+    )
+    SELECT EXISTS (
+        SELECT 1 FROM scholar AS s, threshold
+        WHERE s.vector_version > :since AND s.vector_version <= :until
+          AND (
+              s.scholar_id IN (SELECT scholar_id FROM recommended)
+              OR 1 - (s.profile_vector <=> CAST(:user_vector AS vector)) >= threshold.score
+          )
+    )
+""")
 
 class RecommendationRepository(BaseRepository[Recommendation]):
     def __init__(self, session):
@@ -16,6 +70,56 @@ class RecommendationRepository(BaseRepository[Recommendation]):
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    async def get_page_with_scholars(
+        self,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        exclude_dismissed: bool = True
+    ) -> Tuple[List[Any], int]:
+        """
+        One page of a user's recommendations joined to the scholar columns the
+        API returns, plus the total number of matching recommendations.
+        The total comes from a window count in the same statement; a separate
+        count only runs when the page is past the end.
+        """
+        filters = [Recommendation.user_id == user_id]
+        if exclude_dismissed:
+            filters.append(Recommendation.is_dismissed == False)
+        
+        query = (
+            select(
+                Recommendation.rec_id,
+                Recommendation.scholar_id,
+                Recommendation.similarity_score,
+                Recommendation.explanation,
+                Recommendation.generated_at,
+                Scholar.full_name.label("scholar_name"),
+                Scholar.title.label("scholar_title"),
+                Scholar.institution.label("scholar_institution"),
+                func.count().over().label("total")
+            )
+            .join(Scholar, Scholar.scholar_id == Recommendation.scholar_id)
+            .filter(*filters)
+            .order_by(Recommendation.similarity_score.desc(), Recommendation.rec_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+        
+        if rows:
+            return rows, rows[0].total
+        if skip == 0:
+            return [], 0
+        
+        count_result = await self.session.execute(
+            select(func.count(Recommendation.rec_id))
+            .join(Scholar, Scholar.scholar_id == Recommendation.scholar_id)
+            .filter(*filters)
+        )
+        return [], count_result.scalar() or 0
+    
     async def get_by_id(self, rec_id: UUID) -> Optional[Recommendation]:
         result = await self.session.execute(select(Recommendation).filter(Recommendation.rec_id == rec_id))
         return result.scalars().first()
@@ -29,15 +133,109 @@ class RecommendationRepository(BaseRepository[Recommendation]):
         await self.session.refresh(recommendation)
         return recommendation
     
-    async def delete_by_user_id(self, user_id: UUID):
+    async def has_vector_changes_affecting(self, user_id: UUID, user_vector, since: int, until: int, top_k: int = 20) -> bool:
+        """True if a scholar vector written after version `since`, up to `until`, may change the user's recommendations."""
         result = await self.session.execute(
-            select(Recommendation).filter(Recommendation.user_id == user_id)
+            VECTOR_CHANGES_AFFECTING_USER_QUERY,
+            {
+                "user_id": user_id,
+                "user_vector": np.asarray(user_vector, dtype=np.float32) if user_vector is not None else None,
+                "since": since,
+                "until": until,
+                "top_k": top_k
+            }
+        )
+        return bool(result.scalar())
+    
+    async def delete_by_user_id(self, user_id: UUID):
+        await self.session.execute(
+            delete(Recommendation).where(Recommendation.user_id == user_id)
         )
-        recommendations = result.scalars().all()
-        for rec in recommendations:
-            await self.session.delete(rec)
         await self.session.commit()
     
+    async def replace_for_user(self, user_id: UUID, recommendations: List[Dict[str, Any]]):
+        """
+        Make `recommendations` the user's complete recommendation set in one
+        transaction: a single INSERT ... ON CONFLICT (user_id, scholar_id)
+        DO UPDATE for the new rows, then a single DELETE of every other row.
+        Each item needs scholar_id, similarity_score and explanation.
+        """
+        try:
+            if recommendations:
+                insert_stmt = pg_insert(Recommendation).values([
+                    {
+                        "user_id": user_id,
+                        "scholar_id": rec["scholar_id"],
+                        "similarity_score": rec["similarity_score"],
+                        "explanation": rec["explanation"],
+                        "is_dismissed": False,
+                    }
+                    for rec in recommendations
+                ])
+                await self.session.execute(
+                    insert_stmt.on_conflict_do_update(
+                        constraint="uq_recommendation_user_scholar",
+                        set_={
+                            "similarity_score": insert_stmt.excluded.similarity_score,
+                            "explanation": insert_stmt.excluded.explanation,
+                            "is_dismissed": False,
+                            "generated_at": func.now(),
+                        }
+                    )
+                )
+            
+            keep_ids = bindparam(
+                "keep_scholar_ids",
+                value=[rec["scholar_id"] for rec in recommendations],
+                type_=PG_ARRAY(PG_UUID(as_uuid=True))
+            )
+            await self.session.execute(
+                delete(Recommendation).where(
+                    Recommendation.user_id == user_id,
+                    Recommendation.scholar_id != all_(keep_ids)
+                )
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    async def replace_for_users(self, recommendations_by_user: Dict[UUID, List[Dict[str, Any]]]) -> int:
+        """
+        Bulk form of replace_for_user() for many users in one transaction:
+        every row is streamed into a temp table with COPY, merged with one
+        INSERT ... ON CONFLICT, and one DELETE drops each listed user's rows
+        that are no longer recommended. Users mapped to an empty list lose
+        all their recommendations. Returns the number of rows written.
+        """
+        if not recommendations_by_user:
+            return 0
+        records = [
+            (uuid.uuid4(), user_id, rec["scholar_id"], rec["similarity_score"], json.dumps(rec["explanation"]))
+            for user_id, recommendations in recommendations_by_user.items()
+            for rec in recommendations
+        ]
+        try:
+            # Opens the transaction, so the driver-level COPY below runs inside it.
+            await self.session.execute(CREATE_RECOMMENDATION_STAGING_QUERY)
+            connection = await self.session.connection()
+            raw_connection = await connection.get_raw_connection()
+            await raw_connection.driver_connection.copy_records_to_table(
+                "recommendation_staging",
+                records=records,
+                columns=["rec_id", "user_id", "scholar_id", "similarity_score", "explanation"]
+            )
+            await self.session.execute(MERGE_RECOMMENDATION_STAGING_QUERY)
+            await self.session.execute(
+                DELETE_STALE_RECOMMENDATIONS_QUERY,
+                {"user_ids": list(recommendations_by_user.keys())}
+            )
+            await self.session.commit()
+            return len(records)
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
     async def create_recommendation(self, user_id: UUID, scholar_id: UUID, similarity_score: float, explanation: dict) -> Recommendation:
         recommendation = Recommendation(
             user_id=user_id,
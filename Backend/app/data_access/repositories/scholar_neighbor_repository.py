@@ -0,0 +1,64 @@
+from datetime import datetime
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.future import select
+from app.data_access.repositories.base import BaseRepository
+from app.data_access.models import ScholarNeighbor
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+class ScholarNeighborRepository(BaseRepository[ScholarNeighbor]):
+    def __init__(self, session):
+        super().__init__(ScholarNeighbor, session)
+
+    async def get_by_scholar(self, scholar_id: UUID) -> Optional[ScholarNeighbor]:
+        result = await self.session.execute(
+            select(ScholarNeighbor).filter(ScholarNeighbor.scholar_id == scholar_id)
+        )
+        return result.scalars().first()
+
+    async def upsert_neighbors(self, rows: List[Tuple[UUID, List[UUID], List[float]]]) -> int:
+        """Write (scholar_id, neighbor_ids, similarities) rows with one INSERT ... ON CONFLICT."""
+        if not rows:
+            return 0
+        try:
+            insert_stmt = pg_insert(ScholarNeighbor).values([
+                {
+                    "scholar_id": scholar_id,
+                    "neighbor_ids": neighbor_ids,
+                    "similarities": similarities,
+                }
+                for scholar_id, neighbor_ids, similarities in rows
+            ])
+            await self.session.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=[ScholarNeighbor.scholar_id],
+                    set_={
+                        "neighbor_ids": insert_stmt.excluded.neighbor_ids,
+                        "similarities": insert_stmt.excluded.similarities,
+                        "computed_at": func.now(),
+                    }
+                )
+            )
+            await self.session.commit()
+            return len(rows)
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+
+    async def delete_computed_before(self, computed_before: datetime) -> int:
+        """Drop rows a full rebuild did not rewrite (scholars that lost their vector)."""
+        try:
+            result = await self.session.execute(
+                delete(ScholarNeighbor).where(ScholarNeighbor.computed_at < computed_before)
+            )
+            await self.session.commit()
+            return result.rowcount
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+
+    async def get_database_time(self) -> datetime:
+        """Current time as the server writes it into computed_at (timestamp without time zone)."""
+        result = await self.session.execute(select(func.localtimestamp()))
+        return result.scalar()
@@ -1,32 +1,256 @@
+from app.core.config import settings
 from app.data_access.repositories.base import BaseRepository
-from app.data_access.models import Scholar, Department, Publication
-from app.services.embedding_service import EmbeddingService
+from app.data_access.models import Scholar, ScholarMetrics, ScholarImage, Department, Publication
 from sqlalchemy.future import select
-from sqlalchemy import func, distinct, text, String, or_
-from sqlalchemy.orm import selectinload, joinedload
-from typing import List, Optional
+from sqlalchemy import bindparam, func, distinct, text, or_, update, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import selectinload, joinedload, contains_eager
+from typing import AsyncIterator, Any, Dict, List, NamedTuple, Optional, Tuple
 from uuid import UUID
+import base64
+import hashlib
+import json
+import time
+import numpy as np
+from pgvector import Vector as PgVector
+
+VECTOR_WRITE_CHUNK_SIZE = 1000
+
+BULK_UPDATE_VECTORS_QUERY = text("""
+    UPDATE scholar AS s
+    SET profile_vector = v.profile_vector
+    FROM unnest(CAST(:scholar_ids AS uuid[]), CAST(:vectors AS vector[])) AS v(scholar_id, profile_vector)
+    WHERE s.scholar_id = v.scholar_id
+""")
+
+# Next batch of a full scholar_metrics re-sync, locked like the metrics trigger
+# locks the scholars it recomputes.
+LOCK_METRICS_BATCH_QUERY = text("""
+    SELECT scholar_id FROM scholar
+    WHERE scholar_id > :after_scholar_id
+    ORDER BY scholar_id
+    LIMIT :limit
+    FOR NO KEY UPDATE
+""")
+
+REFRESH_METRICS_QUERY = text("SELECT refresh_scholar_metrics(CAST(:scholar_ids AS uuid[]))")
+
+# One new sequence value for the whole write, stamped on the written scholars.
+STAMP_VECTOR_VERSION_QUERY = text("""
+    WITH version AS (SELECT nextval('scholar_vector_version_seq') AS value)
+    UPDATE scholar SET vector_version = version.value
+    FROM version
+    WHERE scholar_id = ANY(CAST(:scholar_ids AS uuid[]))
+""")
+
+VECTOR_VERSION_QUERY = text("SELECT last_value FROM scholar_vector_version_seq")
+
+# NO KEY UPDATE still lets publication inserts take their FK KEY SHARE locks.
+CLAIM_DIRTY_SCHOLARS_QUERY = text("""
+    SELECT scholar_id FROM scholar
+    WHERE vector_dirty
+    ORDER BY scholar_id
+    LIMIT :limit
+    FOR NO KEY UPDATE SKIP LOCKED
+""")
+
+CLEAR_VECTOR_DIRTY_QUERY = text("""
+    UPDATE scholar SET vector_dirty = false
+    WHERE scholar_id = ANY(CAST(:scholar_ids AS uuid[]))
+""")
+
+NEAREST_SCHOLARS_QUERY = text("""
+    SELECT
+        scholar_id,
+        research_areas,
+        1 - (profile_vector <=> CAST(:query_vector AS vector)) AS similarity_score
+    FROM scholar
+    WHERE profile_vector IS NOT NULL
+    ORDER BY profile_vector <=> CAST(:query_vector AS vector)
+    LIMIT :top_k
+""")
+
+# Filtered kNN: the filters run first and the ranking is exact over the
+# matching rows. Filtering after an HNSW scan could return fewer than top_k.
+FILTERED_NEAREST_SCHOLARS_QUERY = """
+    WITH candidates AS MATERIALIZED (
+        SELECT s.scholar_id, s.research_areas, s.profile_vector
+        FROM scholar AS s
+        LEFT JOIN department AS d ON d.department_id = s.department_id{joins}
+        WHERE s.profile_vector IS NOT NULL{filters}
+    )
+    SELECT
+        scholar_id,
+        research_areas,
+        1 - (profile_vector <=> CAST(:query_vector AS vector)) AS similarity_score
+    FROM candidates
+    ORDER BY profile_vector <=> CAST(:query_vector AS vector)
+    LIMIT :top_k
+"""
+
+# Lexical retriever for hybrid search: trigram word similarity of the query
+# against lower(full_name + research_areas), served by ix_scholar_search_text_trgm.
+LEXICAL_SCHOLARS_QUERY = """
+    SELECT
+        s.scholar_id,
+        word_similarity(:query, scholar_search_text(s.full_name, s.research_areas)) AS score
+    FROM scholar AS s
+    LEFT JOIN department AS d ON d.department_id = s.department_id{joins}
+    WHERE :query <% scholar_search_text(s.full_name, s.research_areas){filters}
+    ORDER BY score DESC
+    LIMIT :limit
+"""
+
+# Conditions of the kNN and lexical retrievers, matching list_scholars() filters.
+# Substring patterns are escaped by contains_like_pattern() and lowercased in Postgres.
+SCHOLAR_SEARCH_FILTERS = {
+    "university_id": "d.university_id = :university_id",
+    "department_id": "s.department_id = :department_id",
+    "title": "s.title = :title",
+    "field": "s.research_areas @> ARRAY[CAST(:field AS text)]",
+    "interests": "scholar_research_areas_text(s.research_areas) LIKE ANY (SELECT lower(p) FROM unnest(CAST(:interests AS text[])) AS p)",
+    "institution": "lower(s.institution) LIKE lower(:institution)",
+    "min_h_index": "m.h_index >= :min_h_index",
+    "max_h_index": "m.h_index <= :max_h_index",
+    "min_citations": "m.citation_count >= :min_citations",
+}
+METRIC_SEARCH_FILTERS = {"min_h_index", "max_h_index", "min_citations"}
+METRICS_SEARCH_JOIN = " JOIN scholar_metrics AS m ON m.scholar_id = s.scholar_id"
+
+SET_LOCAL_QUERY = text("SELECT set_config(:name, :value, true)")
+
+# sortBy -> (sort key column, descending). scholar_id of the key's own table
+# breaks ties in the same direction, so (key, scholar_id) is unique and every
+# order is keyset-pageable along that table's (key, scholar_id) index.
+LIST_SORT_KEYS = {
+    "citations": (ScholarMetrics.citation_count, True),
+    "publications": (ScholarMetrics.publication_count, True),
+    "hIndex": (ScholarMetrics.h_index, True),
+    "name_desc": (Scholar.full_name, True),
+    "name": (Scholar.full_name, False),
+}
+
+# Exact list counts keyed by filter hash: filter hash -> (expires_at, count).
+_list_count_cache: Dict[str, Tuple[float, int]] = {}
+LIST_COUNT_CACHE_MAX_ENTRIES = 1000
+
+
+class ScholarPage(NamedTuple):
+    scholars: List[Scholar]
+    total: int
+    next_cursor: Optional[str]
+    total_is_estimate: bool
+
+
+def explain_query(query):
+    """
+    EXPLAIN (FORMAT JSON) of a SQLAlchemy query, with its values passed as
+    bind parameters of their own types rather than rendered as literals, so
+    the plan is the one the query gets when executed.
+    """
+    compiled = query.compile(dialect=postgresql.dialect(paramstyle="named"), compile_kwargs={"render_postcompile": True})
+    params = [
+        bindparam(name, value, type_=compiled.binds[name].type if name in compiled.binds else None)
+        for name, value in compiled.params.items()
+    ]
+    return text(f"EXPLAIN (FORMAT JSON) {compiled}").bindparams(*params)
+
+
+def contains_like_pattern(term: str) -> str:
+    """LIKE pattern for a substring match, with LIKE wildcards in term escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def encode_list_cursor(sort_by: str, scholar: Scholar) -> str:
+    """Opaque cursor pointing just past `scholar` in the given sort order."""
+    key_column, _ = LIST_SORT_KEYS[sort_by]
+    if key_column.class_ is ScholarMetrics:
+        key = getattr(scholar.metrics, key_column.key) if scholar.metrics else 0
+    else:
+        key = getattr(scholar, key_column.key)
+    payload = json.dumps({"s": sort_by, "k": key, "id": str(scholar.scholar_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str, sort_by: str) -> Tuple[Any, UUID]:
+    """(sort key, scholar_id) from a cursor; ValueError if it is malformed or for another sort order."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key, scholar_id = payload["k"], UUID(payload["id"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if payload.get("s") != sort_by:
+        raise ValueError("Cursor does not match sortBy")
+    return key, scholar_id
+
 
 class ScholarRepository(BaseRepository[Scholar]):
     def __init__(self, session):
         super().__init__(Scholar, session)
     
-    def _get_vector_service(self):
-        from app.services.scholar_vector_service import ScholarVectorService
-        return ScholarVectorService(self, EmbeddingService())
+    @staticmethod
+    def notify_vector_refresh():
+        from app.services.vector_refresh_queue import get_vector_refresh_queue
+        get_vector_refresh_queue().notify()
+    
+    @staticmethod
+    async def invalidate_profile_cache(*scholar_ids: UUID):
+        """Drop cached profile responses of scholars changed through the API."""
+        from app.services.profile_response_cache import get_profile_response_cache
+        await get_profile_response_cache().invalidate(*scholar_ids)
+    
+    async def mark_vector_dirty(self, *scholar_ids: UUID, commit: bool = True, notify: bool = True):
+        """
+        Flag scholars for deferred, batched profile vector regeneration.
+        With commit=False the flag joins the caller's pending transaction.
+        """
+        scholar_ids = [scholar_id for scholar_id in scholar_ids if scholar_id]
+        if not scholar_ids:
+            return
+        await self.session.execute(
+            update(Scholar)
+            .where(Scholar.scholar_id.in_(scholar_ids))
+            .values(vector_dirty=True)
+        )
+        if commit:
+            await self.session.commit()
+        if notify:
+            self.notify_vector_refresh()
+    
+    async def claim_dirty_scholars(self, limit: int) -> List[UUID]:
+        """
+        Lock up to `limit` dirty scholars that no other drainer holds and
+        return their ids. The flag is not cleared here: the row locks last
+        until the session's transaction ends, and the vector write clears the
+        flag in that same transaction (bulk_update_scholar_vectors with
+        clear_dirty=True). If the process dies before that commit, the
+        transaction is rolled back and the scholars stay dirty. Edits to a
+        claimed scholar wait for the commit and flag it again afterwards.
+        """
+        result = await self.session.execute(CLAIM_DIRTY_SCHOLARS_QUERY, {"limit": limit})
+        return [row[0] for row in result.fetchall()]
+    
+    async def clear_vector_dirty(self, scholar_ids: List[UUID], commit: bool = True):
+        if scholar_ids:
+            await self.session.execute(CLEAR_VECTOR_DIRTY_QUERY, {"scholar_ids": list(scholar_ids)})
+        if commit:
+            await self.session.commit()
     
     async def update(self, id: UUID, **kwargs) -> Optional[Scholar]:
+        vector_inputs_changed = 'research_areas' in kwargs or 'research_keywords' in kwargs
+        if vector_inputs_changed:
+            kwargs['vector_dirty'] = True
         result = await super().update(id, **kwargs)
-        if result and ('research_areas' in kwargs or 'research_keywords' in kwargs):
-            vector_service = self._get_vector_service()
-            await vector_service.generate_vector_for_scholar(id)
+        if result and vector_inputs_changed:
+            self.notify_vector_refresh()
         return result
     
     async def create(self, **kwargs) -> Scholar:
+        kwargs.setdefault('vector_dirty', True)
         instance = await super().create(**kwargs)
         if instance:
-            vector_service = self._get_vector_service()
-            await vector_service.generate_vector_for_scholar(instance.scholar_id)
+            self.notify_vector_refresh()
         return instance
 
     async def get_by_yok_id(self, yok_id: str):
@@ -88,6 +312,151 @@ class ScholarRepository(BaseRepository[Scholar]):
         titles = result.scalars().all()
         return [title for title in titles if title and title.strip()]
     
+    async def find_nearest_scholars(
+        self,
+        query_vector,
+        top_k: int = 20,
+        ef_search: Optional[int] = None,
+        exact: bool = False,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None,
+        **list_filters
+    ) -> List[Tuple[UUID, List[str], float]]:
+        """
+        Return (scholar_id, research_areas, cosine similarity) for the top_k
+        scholars closest to query_vector. The HNSW scan returns at most
+        ef_search candidates, so it is raised to top_k when smaller; exact=True
+        disables index scans to get the brute-force ground truth.
+        University, department and title filters, and the list_scholars()
+        filters in list_filters (field, interests, institution, min_h_index,
+        max_h_index, min_citations), are applied inside the search, so a
+        selective filter still yields top_k matches.
+        """
+        filters = self._search_filters(university_id, department_id, title, **list_filters)
+        params = {"query_vector": np.asarray(query_vector, dtype=np.float32), "top_k": top_k}
+        
+        if filters:
+            query = text(FILTERED_NEAREST_SCHOLARS_QUERY.format(**self._search_filters_sql(filters)))
+            result = await self.session.execute(query, {**params, **filters})
+            return [(scholar_id, research_areas, float(similarity)) for scholar_id, research_areas, similarity in result.fetchall()]
+        
+        if exact:
+            await self.session.execute(SET_LOCAL_QUERY, {"name": "enable_indexscan", "value": "off"})
+        else:
+            ef_search = max(ef_search or settings.vector_index_ef_search, top_k)
+            await self.session.execute(SET_LOCAL_QUERY, {"name": "hnsw.ef_search", "value": str(ef_search)})
+        
+        result = await self.session.execute(NEAREST_SCHOLARS_QUERY, params)
+        return [(scholar_id, research_areas, float(similarity)) for scholar_id, research_areas, similarity in result.fetchall()]
+    
+    async def find_lexical_matches(
+        self,
+        query: str,
+        limit: int = 100,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None,
+        **list_filters
+    ) -> List[Tuple[UUID, float]]:
+        """
+        Return up to `limit` (scholar_id, word similarity) pairs whose name or
+        research areas contain a fuzzy match for query, best first. Only rows
+        above settings.hybrid_word_similarity_threshold are considered.
+        Filters are those of find_nearest_scholars().
+        """
+        query = " ".join(query.lower().split())
+        if not query:
+            return []
+        filters = self._search_filters(university_id, department_id, title, **list_filters)
+        
+        await self.session.execute(
+            SET_LOCAL_QUERY,
+            {"name": "pg_trgm.word_similarity_threshold", "value": str(settings.hybrid_word_similarity_threshold)}
+        )
+        result = await self.session.execute(
+            text(LEXICAL_SCHOLARS_QUERY.format(**self._search_filters_sql(filters))),
+            {"query": query, "limit": limit, **filters}
+        )
+        return [(scholar_id, float(score)) for scholar_id, score in result.fetchall()]
+    
+    @staticmethod
+    def _search_filters(
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None,
+        field: Optional[str] = None,
+        interests: Optional[List[str]] = None,
+        institution: Optional[str] = None,
+        min_h_index: Optional[int] = None,
+        max_h_index: Optional[int] = None,
+        min_citations: Optional[int] = None
+    ) -> dict:
+        """Bind parameters of the SCHOLAR_SEARCH_FILTERS that are set."""
+        interest_patterns = [contains_like_pattern(interest.strip()) for interest in interests or [] if interest.strip()]
+        filters = {
+            "university_id": university_id,
+            "department_id": department_id,
+            "title": title,
+            "field": field,
+            "interests": interest_patterns or None,
+            "institution": contains_like_pattern(institution) if institution else None,
+        }
+        filters = {name: value for name, value in filters.items() if value}
+        metrics = {"min_h_index": min_h_index, "max_h_index": max_h_index, "min_citations": min_citations}
+        filters.update({name: value for name, value in metrics.items() if value is not None})
+        return filters
+    
+    @staticmethod
+    def _search_filters_sql(filters: dict) -> dict:
+        """{joins} and {filters} fragments of the retriever queries for these filters."""
+        return {
+            "joins": METRICS_SEARCH_JOIN if METRIC_SEARCH_FILTERS & filters.keys() else "",
+            "filters": "".join(f" AND {SCHOLAR_SEARCH_FILTERS[name]}" for name in filters),
+        }
+    
+    async def resync_metrics_batch(self, after_scholar_id: Optional[UUID], limit: int) -> List[UUID]:
+        """
+        Recompute scholar_metrics for the next `limit` scholars after
+        after_scholar_id in one transaction and return their ids; an empty
+        list once every scholar is done. The recompute runs after the rows
+        are locked, so it cannot overwrite counts from a concurrent writer.
+        """
+        try:
+            result = await self.session.execute(
+                LOCK_METRICS_BATCH_QUERY,
+                {"after_scholar_id": after_scholar_id or UUID(int=0), "limit": limit}
+            )
+            scholar_ids = [row[0] for row in result.fetchall()]
+            if scholar_ids:
+                await self.session.execute(REFRESH_METRICS_QUERY, {"scholar_ids": scholar_ids})
+            await self.session.commit()
+            return scholar_ids
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    async def get_vector_version(self) -> int:
+        """Current value of the counter bumped by every scholar vector write."""
+        result = await self.session.execute(VECTOR_VERSION_QUERY)
+        return result.scalar() or 0
+    
+    async def get_scholars_for_listing(self, scholar_ids: List[UUID]) -> List[Scholar]:
+        """Load scholars with the relationships list responses need, in the order of scholar_ids."""
+        if not scholar_ids:
+            return []
+        result = await self.session.execute(
+            select(Scholar)
+            .options(
+                joinedload(Scholar.image),
+                joinedload(Scholar.metrics),
+                joinedload(Scholar.department_rel).joinedload(Department.university)
+            )
+            .filter(Scholar.scholar_id.in_(scholar_ids))
+        )
+        scholars = {scholar.scholar_id: scholar for scholar in result.scalars().unique().all()}
+        return [scholars[scholar_id] for scholar_id in scholar_ids if scholar_id in scholars]
+    
     async def get_scholars_with_vectors(self, skip: int = 0, limit: int = 100) -> List[Scholar]:
         result = await self.session.execute(
             select(Scholar)
@@ -117,63 +486,200 @@ class ScholarRepository(BaseRepository[Scholar]):
         result = await self.session.execute(select(Scholar))
         return result.scalars().all()
     
-    async def update_scholar_vector(self, scholar_id, vector: List[float]):
-        if not vector:
-            return None
-        
-        try:
-
-            vector_str = '[' + ','.join(str(float(v)) for v in vector) + ']'
+    async def count_scholars_for_vectors(self, only_missing: bool = False) -> int:
+        query = select(func.count(Scholar.scholar_id))
+        if only_missing:
+            query = query.filter(
+                Scholar.profile_vector.is_(None),
+                Scholar.research_areas.isnot(None)
+            )
+        result = await self.session.execute(query)
+        return result.scalar() or 0
+    
+    async def iter_scholar_vector_inputs(
+        self,
+        batch_size: int = 100,
+        only_missing: bool = False
+    ) -> AsyncIterator[List[Tuple[UUID, List[str], List[str]]]]:
+        """
+        Stream (scholar_id, research_areas, publication_titles) tuples in
+        scholar_id keyset order, one batch per iteration.
+        Only plain columns are selected, so no ORM objects accumulate in the
+        session and memory stays flat regardless of corpus size.
+        """
+        last_scholar_id = None
+        while True:
+            query = self._vector_inputs_query()
+            if only_missing:
+                query = query.filter(
+                    Scholar.profile_vector.is_(None),
+                    Scholar.research_areas.isnot(None)
+                )
+            if last_scholar_id is not None:
+                query = query.filter(Scholar.scholar_id > last_scholar_id)
+            query = query.order_by(Scholar.scholar_id).limit(batch_size)
             
-
-            query = text(f"""
-                UPDATE scholar 
-                SET profile_vector = '{vector_str}'::vector
-                WHERE scholar_id = :scholar_id
-            """)
+            rows = await self._fetch_vector_inputs(query)
+            if not rows:
+                return
             
-            await self.session.execute(query, {"scholar_id": scholar_id})
-            await self.session.commit()
+            yield rows
             
-
-            scholar = await self.get(scholar_id)
-            return scholar
-        except Exception as e:
-            await self.session.rollback()
-            raise e
+            if len(rows) < batch_size:
+                return
+            last_scholar_id = rows[-1][0]
+    
+    async def get_scholar_vector_inputs(self, scholar_ids: List[UUID]) -> List[Tuple[UUID, List[str], List[str]]]:
+        if not scholar_ids:
+            return []
+        query = self._vector_inputs_query().filter(Scholar.scholar_id.in_(scholar_ids))
+        return await self._fetch_vector_inputs(query)
+    
+    def _vector_inputs_query(self):
+        titles_subquery = (
+            select(func.array_agg(Publication.title))
+            .where(
+                Publication.scholar_id == Scholar.scholar_id,
+                Publication.title.isnot(None)
+            )
+            .scalar_subquery()
+        )
+        return select(Scholar.scholar_id, Scholar.research_areas, titles_subquery)
+    
+    async def _fetch_vector_inputs(self, query) -> List[Tuple[UUID, List[str], List[str]]]:
+        result = await self.session.execute(query)
+        return [
+            (scholar_id, research_areas or [], titles or [])
+            for scholar_id, research_areas, titles in result.all()
+        ]
+    
+    async def iter_vector_index_rows(
+        self,
+        batch_size: int = 5000
+    ) -> AsyncIterator[List[Tuple[UUID, Optional[UUID], Optional[UUID], Optional[str], np.ndarray]]]:
+        """
+        Stream (scholar_id, department_id, university_id, title, profile_vector)
+        for every scholar with a vector, in scholar_id keyset order. Feeds the
+        in-process ScholarVectorIndex snapshot.
+        """
+        last_scholar_id = None
+        while True:
+            query = (
+                select(
+                    Scholar.scholar_id,
+                    Scholar.department_id,
+                    Department.university_id,
+                    Scholar.title,
+                    Scholar.profile_vector
+                )
+                .outerjoin(Department, Scholar.department_id == Department.department_id)
+                .filter(Scholar.profile_vector.isnot(None))
+            )
+            if last_scholar_id is not None:
+                query = query.filter(Scholar.scholar_id > last_scholar_id)
+            query = query.order_by(Scholar.scholar_id).limit(batch_size)
+            
+            result = await self.session.execute(query)
+            rows = [tuple(row) for row in result.all()]
+            if not rows:
+                return
+            
+            yield rows
+            
+            if len(rows) < batch_size:
+                return
+            last_scholar_id = rows[-1][0]
+    
+    async def get_research_areas_by_ids(self, scholar_ids: List[UUID]) -> dict:
+        if not scholar_ids:
+            return {}
+        result = await self.session.execute(
+            select(Scholar.scholar_id, Scholar.research_areas).filter(Scholar.scholar_id.in_(scholar_ids))
+        )
+        return {scholar_id: research_areas or [] for scholar_id, research_areas in result.all()}
+    
+    async def update_scholar_vector(self, scholar_id, vector: List[float]):
+        if vector is None or len(vector) == 0:
+            return None
+        
+        await self.bulk_update_scholar_vectors({scholar_id: vector})
+        return await self.get(scholar_id)
     
-    async def bulk_update_scholar_vectors(self, scholar_vector_map: dict):
+    async def bulk_update_scholar_vectors(self, scholar_vector_map: dict, clear_dirty: Optional[List[UUID]] = None):
         """
         Bulk update vectors for multiple scholars.
         scholar_vector_map: {scholar_id: vector_list}
-        Returns the number of updated rows.
+        Each chunk of VECTOR_WRITE_CHUNK_SIZE scholars is written by a single
+        parameterized UPDATE ... FROM unnest(uuid[], vector[]) statement.
+        clear_dirty, if given, lists scholars whose vector_dirty flag is
+        cleared in the same transaction. Returns the number of updated rows.
         """
-        if not scholar_vector_map:
+        items = [
+            (scholar_id, vector)
+            for scholar_id, vector in scholar_vector_map.items()
+            if vector is not None and len(vector) > 0
+        ]
+        if not items:
+            if clear_dirty:
+                await self.clear_vector_dirty(clear_dirty)
             return 0
         
         try:
-
-
             updated_count = 0
-            for scholar_id, vector in scholar_vector_map.items():
-                if vector:
-                    vector_str = '[' + ','.join(str(float(v)) for v in vector) + ']'
-                    query = text(f"""
-                        UPDATE scholar 
-                        SET profile_vector = '{vector_str}'::vector
-                        WHERE scholar_id = :scholar_id
-                    """)
-                    await self.session.execute(query, {"scholar_id": scholar_id})
-                    updated_count += 1
+            for i in range(0, len(items), VECTOR_WRITE_CHUNK_SIZE):
+                chunk = items[i:i + VECTOR_WRITE_CHUNK_SIZE]
+                result = await self.session.execute(
+                    BULK_UPDATE_VECTORS_QUERY,
+                    {
+                        "scholar_ids": [scholar_id for scholar_id, _ in chunk],
+                        # pgvector.Vector is not a sequence, so asyncpg encodes
+                        # each one as a vector[] element instead of a sub-array.
+                        "vectors": [PgVector(np.asarray(vector, dtype=np.float32)) for _, vector in chunk],
+                    }
+                )
+                updated_count += result.rowcount
             
-            if updated_count > 0:
+            if clear_dirty:
+                await self.clear_vector_dirty(clear_dirty, commit=False)
+            await self.session.commit()
+            if updated_count:
+                # After the commit, so a snapshot or recommendation built from
+                # a version read later always contains these vectors.
+                await self.session.execute(STAMP_VECTOR_VERSION_QUERY, {"scholar_ids": [scholar_id for scholar_id, _ in items]})
                 await self.session.commit()
-            
             return updated_count
         except Exception as e:
             await self.session.rollback()
             raise e
     
+    async def get_image_hash(self, scholar_id: UUID) -> Optional[str]:
+        result = await self.session.execute(
+            select(ScholarImage.image_hash).filter(ScholarImage.scholar_id == scholar_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_image_data(self, scholar_id: UUID) -> Optional[Tuple[str, str]]:
+        """(image_hash, image_data) of a scholar's photo, read together so they match."""
+        result = await self.session.execute(
+            select(ScholarImage.image_hash, ScholarImage.image_data).filter(ScholarImage.scholar_id == scholar_id)
+        )
+        row = result.first()
+        return (row.image_hash, row.image_data) if row else None
+    
+    async def get_profile_version(self, scholar_id: UUID) -> Optional[int]:
+        result = await self.session.execute(
+            select(Scholar.profile_version).filter(Scholar.scholar_id == scholar_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_with_publications(self, scholar_id: UUID) -> Optional[Scholar]:
+        result = await self.session.execute(
+            select(Scholar)
+            .options(selectinload(Scholar.publications))
+            .filter(Scholar.scholar_id == scholar_id)
+        )
+        return result.scalars().first()
+    
     async def get_scholar_profile(self, scholar_id: UUID) -> Optional[Scholar]:
         result = await self.session.execute(
             select(Scholar)
@@ -191,10 +697,17 @@ class ScholarRepository(BaseRepository[Scholar]):
         )
         return result.scalars().first()
     
-    async def list_scholars(
+    @staticmethod
+    def _contains_pattern(term: str):
+        """
+        LIKE pattern for a case-insensitive substring match. The term is
+        lowercased by Postgres, like the indexed expressions, and LIKE
+        wildcards in it are escaped.
+        """
+        return func.lower(contains_like_pattern(term))
+    
+    def build_list_scholars_query(
         self,
-        skip: int = 0,
-        limit: int = 20,
         search: Optional[str] = None,
         field: Optional[str] = None,
         interests: Optional[List[str]] = None,
@@ -204,101 +717,170 @@ class ScholarRepository(BaseRepository[Scholar]):
         min_h_index: Optional[int] = None,
         max_h_index: Optional[int] = None,
         min_citations: Optional[int] = None,
-        sort_by: Optional[str] = None,
-        title: Optional[str] = None
-    ) -> tuple[List[Scholar], int]:
-        query = select(Scholar).options(
-            joinedload(Scholar.image),
-            selectinload(Scholar.publications),
-            joinedload(Scholar.department_rel).joinedload(Department.university)
-        )
+        title: Optional[str] = None,
+        eager: bool = True
+    ):
+        """
+        Filtered scholar query behind list_scholars(), without ordering or paging.
+        With eager=False the relationships list items need are not loaded,
+        for counting and EXPLAIN.
+        The substring filters are written against the expressions of the
+        pg_trgm GIN indexes (ix_scholar_full_name_trgm,
+        ix_scholar_research_areas_trgm, ix_scholar_institution_trgm) so
+        they are index scans rather than full table scans;
+        scripts/check_search_indexes.py verifies that with EXPLAIN.
+        """
+        # Every scholar has a scholar_metrics row (kept by triggers), so the
+        # inner join filters and sorts on its indexed columns.
+        query = select(Scholar).join(Scholar.metrics)
+        if eager:
+            query = query.options(
+                joinedload(Scholar.image),
+                contains_eager(Scholar.metrics),
+                joinedload(Scholar.department_rel).joinedload(Department.university)
+            )
         
         if search:
-            search_term = f"%{search.lower()}%"
-            query = query.filter(
-                func.lower(Scholar.full_name).like(search_term)
-                | func.lower(Scholar.research_areas.cast(String)).like(search_term)
-            )
+            # Name or research-area substring, each served by its own trigram
+            # index (a BitmapOr of the two scans).
+            pattern = self._contains_pattern(search)
+            query = query.filter(or_(
+                func.lower(Scholar.full_name).like(pattern),
+                func.scholar_research_areas_text(Scholar.research_areas).like(pattern)
+            ))
         
         if field:
             query = query.filter(Scholar.research_areas.contains([field]))
         
         if interests:
-
-
             interest_filters = []
             for interest in interests:
                 interest_clean = interest.strip()
                 if not interest_clean:
                     continue
-
-
-                interest_lower = f"%{interest_clean.lower()}%"
                 interest_filters.append(
-                    func.lower(func.array_to_string(Scholar.research_areas, '|')).like(interest_lower)
+                    func.scholar_research_areas_text(Scholar.research_areas).like(self._contains_pattern(interest_clean))
                 )
             if interest_filters:
                 query = query.filter(or_(*interest_filters))
         
         if institution:
-            inst_term = f"%{institution.lower()}%"
             query = query.filter(
-                func.lower(Scholar.institution).like(inst_term)
+                func.lower(Scholar.institution).like(self._contains_pattern(institution))
             )
 
         if title:
             query = query.filter(Scholar.title == title)
 
         if university_id:
-
-
-            
-
-
-
-
-
-
-            
-
-
             query = query.join(Scholar.department_rel)
             query = query.filter(Department.university_id == university_id)
 
         if department_id:
             query = query.filter(Scholar.department_id == department_id)
         
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.session.execute(count_query)
-        total = total_result.scalar() or 0
+        if min_h_index is not None:
+            query = query.filter(ScholarMetrics.h_index >= min_h_index)
+        if max_h_index is not None:
+            query = query.filter(ScholarMetrics.h_index <= max_h_index)
+        if min_citations is not None:
+            query = query.filter(ScholarMetrics.citation_count >= min_citations)
         
-        if sort_by == "citations":
-
-
-
-
-
-            query = query.order_by(Scholar.full_name)
-        elif sort_by == "publications":
-
-
-             pub_count_stmt = (
-                 select(Publication.scholar_id, func.count(Publication.pub_id).label("pub_count"))
-                 .group_by(Publication.scholar_id)
-                 .subquery()
-             )
-             
-             query = query.outerjoin(pub_count_stmt, Scholar.scholar_id == pub_count_stmt.c.scholar_id)
-             query = query.order_by(pub_count_stmt.c.pub_count.desc().nulls_last())
-        elif sort_by == "name_desc":
-            query = query.order_by(Scholar.full_name.desc())
+        return query
+    
+    async def list_scholars(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        search: Optional[str] = None,
+        field: Optional[str] = None,
+        interests: Optional[List[str]] = None,
+        institution: Optional[str] = None,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        min_h_index: Optional[int] = None,
+        max_h_index: Optional[int] = None,
+        min_citations: Optional[int] = None,
+        sort_by: Optional[str] = None,
+        title: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True
+    ) -> ScholarPage:
+        """
+        One page of scholars. With a cursor (next_cursor of the previous page)
+        the page starts right after the cursor's (sort key, scholar_id) with
+        a keyset condition instead of OFFSET, so every page costs the same
+        as the first. include_total=False skips the exact count and returns
+        a cached count for the same filters or the planner's row estimate,
+        flagged with total_is_estimate. Raises ValueError for a bad cursor.
+        """
+        filters = dict(
+            search=search,
+            field=field,
+            interests=interests,
+            institution=institution,
+            university_id=university_id,
+            department_id=department_id,
+            min_h_index=min_h_index,
+            max_h_index=max_h_index,
+            min_citations=min_citations,
+            title=title
+        )
+        sort_by = sort_by if sort_by in LIST_SORT_KEYS else "name"
+        key_column, descending = LIST_SORT_KEYS[sort_by]
+        # Equal through the join, but only the key's own table has the index
+        # covering (key, scholar_id).
+        id_column = ScholarMetrics.scholar_id if key_column.class_ is ScholarMetrics else Scholar.scholar_id
+        
+        query = self.build_list_scholars_query(**filters)
+        if cursor:
+            key, scholar_id = decode_list_cursor(cursor, sort_by)
+            position = tuple_(key_column, id_column)
+            query = query.filter(position < tuple_(key, scholar_id) if descending else position > tuple_(key, scholar_id))
         else:
-
-            query = query.order_by(Scholar.full_name.asc())
+            query = query.offset(skip)
         
-        query = query.offset(skip).limit(limit)
+        if descending:
+            query = query.order_by(key_column.desc(), id_column.desc())
+        else:
+            query = query.order_by(key_column.asc(), id_column.asc())
         
-        result = await self.session.execute(query)
-        scholars = result.scalars().unique().all()
+        result = await self.session.execute(query.limit(limit))
+        scholars = list(result.scalars().unique().all())
+        next_cursor = encode_list_cursor(sort_by, scholars[-1]) if len(scholars) == limit else None
         
-        return list(scholars), total
\ No newline at end of file
+        total, total_is_estimate = await self.count_list_scholars(filters, exact=include_total)
+        return ScholarPage(scholars, total, next_cursor, total_is_estimate)
+    
+    async def count_list_scholars(self, filters: Dict[str, Any], exact: bool = True) -> Tuple[int, bool]:
+        """
+        (count, is_estimate) for list_scholars() filters. Exact counts run
+        without the eager-load joins and are cached per filter hash for
+        settings.scholar_list_count_cache_seconds; with exact=False a cached
+        count is reused, or the planner's estimate is returned.
+        """
+        filter_hash = hashlib.sha1(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+        query = self.build_list_scholars_query(**filters, eager=False)
+        
+        if not exact:
+            cached = _list_count_cache.get(filter_hash)
+            if cached is not None and cached[0] > time.monotonic():
+                return cached[1], True
+            estimate = await self._estimate_rows(query)
+            if estimate is not None:
+                return estimate, True
+        
+        result = await self.session.execute(query.with_only_columns(func.count(Scholar.scholar_id)))
+        total = result.scalar() or 0
+        if len(_list_count_cache) >= LIST_COUNT_CACHE_MAX_ENTRIES:
+            _list_count_cache.clear()
+        _list_count_cache[filter_hash] = (time.monotonic() + settings.scholar_list_count_cache_seconds, total)
+        return total, False
+    
+    async def _estimate_rows(self, query) -> Optional[int]:
+        """Planner row estimate for a query."""
+        result = await self.session.execute(explain_query(query))
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
\ No newline at end of file
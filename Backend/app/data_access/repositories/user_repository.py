@@ -1,9 +1,51 @@
 from sqlalchemy.future import select
-from sqlalchemy import text
+from sqlalchemy import func, text, update
 from app.data_access.repositories.base import BaseRepository
 from app.data_access.models import User
 from typing import List, Optional
 import uuid
+import numpy as np
+from pgvector import Vector as PgVector
+
+BULK_UPDATE_USER_VECTORS_QUERY = text("""
+    UPDATE "user" AS u
+    SET profile_vector = v.profile_vector
+    FROM unnest(CAST(:user_ids AS uuid[]), CAST(:vectors AS vector[])) AS v(user_id, profile_vector)
+    WHERE u.user_id = v.user_id
+""")
+
+CLAIM_STALE_RECOMMENDATION_USERS_QUERY = text("""
+    UPDATE "user" SET recommendations_stale = false
+    WHERE user_id IN (
+        SELECT user_id FROM "user"
+        WHERE recommendations_stale
+          AND recommendations_requested_at <= now() - make_interval(secs => :debounce_seconds)
+        ORDER BY recommendations_requested_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING user_id
+""")
+
+RECOMMENDATION_STATE_QUERY = text("""
+    SELECT
+        profile_vector,
+        recommendations_stale,
+        recommendation_vector_hash,
+        recommendation_index_version,
+        coalesce(recommendations_generated_at > now() - make_interval(secs => :ttl_seconds), false) AS within_ttl
+    FROM "user"
+    WHERE user_id = :user_id
+""")
+
+BULK_SET_RECOMMENDATION_STATE_QUERY = text("""
+    UPDATE "user" AS u
+    SET recommendation_vector_hash = v.vector_hash,
+        recommendation_index_version = :index_version,
+        recommendations_generated_at = now()
+    FROM unnest(CAST(:user_ids AS uuid[]), CAST(:vector_hashes AS varchar[])) AS v(user_id, vector_hash)
+    WHERE u.user_id = v.user_id
+""")
 
 class UserRepository(BaseRepository[User]):
     def __init__(self, session):
@@ -34,10 +76,9 @@ class UserRepository(BaseRepository[User]):
         
 
         if profile_vector is not None:
-            vector_str = '[' + ','.join(str(float(v)) for v in profile_vector) + ']'
             columns.append('profile_vector')
-
-            param_placeholders.append(f"'{vector_str}'::vector")
+            param_placeholders.append('CAST(:profile_vector AS vector)')
+            params['profile_vector'] = np.asarray(profile_vector, dtype=np.float32)
         
 
         columns_str = ', '.join([f'"{col}"' for col in columns])
@@ -72,33 +113,112 @@ class UserRepository(BaseRepository[User]):
         )
         return result.scalars().first()
     
+    async def get_interests_page(self, after_user_id: Optional[uuid.UUID], limit: int):
+        """
+        (user_id, research_interests) of up to `limit` users ordered by user_id,
+        starting after after_user_id; pass the last id of one page to get the next.
+        """
+        query = select(User.user_id, User.research_interests).order_by(User.user_id).limit(limit)
+        if after_user_id is not None:
+            query = query.where(User.user_id > after_user_id)
+        result = await self.session.execute(query)
+        return result.all()
+    
+    async def bulk_update_user_vectors(self, user_vector_map: dict) -> int:
+        """
+        Write many user vectors with one UPDATE ... FROM unnest(...) statement.
+        A None vector clears the user's profile_vector.
+        """
+        if not user_vector_map:
+            return 0
+        try:
+            cleared = [user_id for user_id, vector in user_vector_map.items() if vector is None]
+            updated = {user_id: vector for user_id, vector in user_vector_map.items() if vector is not None}
+            if cleared:
+                await self.session.execute(
+                    update(User).where(User.user_id.in_(cleared)).values(profile_vector=None)
+                )
+            if updated:
+                await self.session.execute(
+                    BULK_UPDATE_USER_VECTORS_QUERY,
+                    {
+                        "user_ids": list(updated.keys()),
+                        "vectors": [PgVector(np.asarray(v, dtype=np.float32)) for v in updated.values()],
+                    }
+                )
+            await self.session.commit()
+            return len(user_vector_map)
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    async def mark_recommendations_stale(self, *user_ids, commit: bool = True):
+        """
+        Queue users for a recommendation refresh. Repeated requests only move
+        recommendations_requested_at forward, so a burst of edits is debounced
+        into one refresh.
+        """
+        user_ids = [user_id for user_id in user_ids if user_id]
+        if not user_ids:
+            return
+        await self.session.execute(
+            update(User)
+            .where(User.user_id.in_(user_ids))
+            .values(recommendations_stale=True, recommendations_requested_at=func.now())
+        )
+        if commit:
+            await self.session.commit()
+    
+    async def claim_stale_recommendation_users(self, limit: int, debounce_seconds: float) -> List[uuid.UUID]:
+        """
+        Clear recommendations_stale on up to `limit` users whose last request
+        is older than debounce_seconds and return their ids.
+        """
+        result = await self.session.execute(
+            CLAIM_STALE_RECOMMENDATION_USERS_QUERY,
+            {"limit": limit, "debounce_seconds": debounce_seconds}
+        )
+        user_ids = [row[0] for row in result.fetchall()]
+        await self.session.commit()
+        return user_ids
+    
+    async def get_recommendation_state(self, user_id, ttl_seconds: int):
+        result = await self.session.execute(
+            RECOMMENDATION_STATE_QUERY,
+            {"user_id": user_id, "ttl_seconds": ttl_seconds}
+        )
+        return result.first()
+    
+    async def set_recommendation_state(self, user_vector_hashes: dict, index_version: int):
+        """Record which user vector hash and scholar index version the current recommendations were built from."""
+        if not user_vector_hashes:
+            return
+        try:
+            await self.session.execute(
+                BULK_SET_RECOMMENDATION_STATE_QUERY,
+                {
+                    "user_ids": list(user_vector_hashes.keys()),
+                    "vector_hashes": list(user_vector_hashes.values()),
+                    "index_version": str(index_version)
+                }
+            )
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
     async def update_user_vector(self, user_id, vector: Optional[List[float]]):
         try:
-            if not vector:
-
-                query = text("""
-                    UPDATE "user" 
-                    SET profile_vector = NULL
-                    WHERE user_id = :user_id
-                """)
-                await self.session.execute(query, {"user_id": user_id})
-                await self.session.commit()
-                return await self.get(user_id)
+            if vector is not None and len(vector) == 0:
+                vector = None
             
-
-            vector_str = '[' + ','.join(str(float(v)) for v in vector) + ']'
-            
-
-            query = text(f"""
-                UPDATE "user" 
-                SET profile_vector = '{vector_str}'::vector
-                WHERE user_id = :user_id
-            """)
-            
-            await self.session.execute(query, {"user_id": user_id})
+            await self.session.execute(
+                update(User)
+                .where(User.user_id == user_id)
+                .values(profile_vector=vector)
+            )
             await self.session.commit()
             
-
             user = await self.get(user_id)
             return user
         except Exception as e:
@@ -0,0 +1,347 @@
+from sqlalchemy import text
+
+# Databases created before profile_vector was a pgvector column still store it
+# as '[...]' text. Text that does not cast (malformed or of another dimension)
+# becomes NULL, so one bad row cannot stop startup; those vectors are simply
+# regenerated.
+LEGACY_VECTOR_CAST_FUNCTION = """
+CREATE OR REPLACE FUNCTION legacy_text_to_vector(value text)
+RETURNS vector(384) LANGUAGE plpgsql IMMUTABLE AS $$
+BEGIN
+    RETURN NULLIF(trim(value), '')::vector(384);
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END $$
+"""
+
+PROFILE_VECTOR_TYPE_UPGRADE = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = '{table}' AND column_name = 'profile_vector' AND udt_name <> 'vector'
+    ) THEN
+        ALTER TABLE "{table}" ALTER COLUMN profile_vector TYPE vector(384)
+        USING legacy_text_to_vector(profile_vector::text);
+    END IF;
+END $$
+"""
+
+# Same estimate as ScholarService.estimate_citation_count() for one publication.
+PUBLICATION_CITATIONS_FUNCTION = r"""
+CREATE OR REPLACE FUNCTION publication_estimated_citations(year text, publication_index text)
+RETURNS integer LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT CASE WHEN upper(coalesce(publication_index, '')) LIKE '%SCI%' THEN 20 ELSE 5 END
+         + CASE WHEN y.value IS NOT NULL AND 2024 - y.value > 0 THEN (2024 - y.value) * 2 ELSE 0 END
+    FROM (
+        SELECT substring(split_part(coalesce(year, ''), '-', 1) from '^\s*\+?(\d{1,9})\s*$')::integer AS value
+    ) y
+$$
+"""
+
+# Recomputes scholar_metrics rows for the given scholars; h_index is the
+# number of publications whose estimate is at least their rank.
+REFRESH_SCHOLAR_METRICS_FUNCTION = """
+CREATE OR REPLACE FUNCTION refresh_scholar_metrics(scholar_ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    INSERT INTO scholar_metrics (scholar_id, publication_count, citation_count, h_index, updated_at)
+    SELECT s.scholar_id, coalesce(m.publication_count, 0), coalesce(m.citation_count, 0), coalesce(m.h_index, 0), now()
+    FROM scholar s
+    LEFT JOIN (
+        SELECT
+            scholar_id,
+            count(*) AS publication_count,
+            sum(citations) AS citation_count,
+            count(*) FILTER (WHERE citations >= rn) AS h_index
+        FROM (
+            SELECT
+                p.scholar_id,
+                publication_estimated_citations(p.year, p.publication_index) AS citations,
+                row_number() OVER (
+                    PARTITION BY p.scholar_id
+                    ORDER BY publication_estimated_citations(p.year, p.publication_index) DESC
+                ) AS rn
+            FROM publication p
+            WHERE p.scholar_id = ANY(scholar_ids)
+        ) ranked
+        GROUP BY scholar_id
+    ) m ON m.scholar_id = s.scholar_id
+    WHERE s.scholar_id = ANY(scholar_ids)
+    ON CONFLICT (scholar_id) DO UPDATE SET
+        publication_count = EXCLUDED.publication_count,
+        citation_count = EXCLUDED.citation_count,
+        h_index = EXCLUDED.h_index,
+        updated_at = EXCLUDED.updated_at
+$$
+"""
+
+# Statement-level, so a bulk write recomputes each affected scholar once.
+# Writers of the same scholars queue on their scholar rows first; the
+# recompute is a later statement, so under READ COMMITTED its snapshot
+# includes the publications of the writer that held the lock before.
+# NO KEY UPDATE does not conflict with the KEY SHARE locks publication
+# inserts take on their scholar.
+SCHOLAR_METRICS_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION scholar_metrics_trigger()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        ids := ARRAY(SELECT DISTINCT scholar_id FROM new_rows WHERE scholar_id IS NOT NULL);
+    ELSIF TG_OP = 'DELETE' THEN
+        ids := ARRAY(SELECT DISTINCT scholar_id FROM old_rows WHERE scholar_id IS NOT NULL);
+    ELSE
+        ids := ARRAY(
+            SELECT scholar_id FROM new_rows WHERE scholar_id IS NOT NULL
+            UNION
+            SELECT scholar_id FROM old_rows WHERE scholar_id IS NOT NULL
+        );
+    END IF;
+    PERFORM 1 FROM scholar WHERE scholar_id = ANY(ids) ORDER BY scholar_id FOR NO KEY UPDATE;
+    PERFORM refresh_scholar_metrics(ids);
+    RETURN NULL;
+END $$
+"""
+
+# Transition tables rule out multi-event triggers, so one trigger per event.
+SCHOLAR_METRICS_TRIGGERS = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'publication_metrics_insert') THEN
+        CREATE TRIGGER publication_metrics_insert AFTER INSERT ON publication
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION scholar_metrics_trigger();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'publication_metrics_update') THEN
+        CREATE TRIGGER publication_metrics_update AFTER UPDATE ON publication
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION scholar_metrics_trigger();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'publication_metrics_delete') THEN
+        CREATE TRIGGER publication_metrics_delete AFTER DELETE ON publication
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION scholar_metrics_trigger();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'scholar_metrics_insert') THEN
+        CREATE TRIGGER scholar_metrics_insert AFTER INSERT ON scholar
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION scholar_metrics_trigger();
+    END IF;
+END $$
+"""
+
+# Bumps profile_version when a field shown on the profile changes, unless the
+# statement sets it itself; vector writes leave it unchanged.
+SCHOLAR_PROFILE_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION scholar_profile_version_trigger()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.profile_version = OLD.profile_version AND (
+        NEW.yok_id, NEW.full_name, NEW.title, NEW.department_id, NEW.institution,
+        NEW.department, NEW.email, NEW.profile_url, NEW.orcid, NEW.research_areas
+    ) IS DISTINCT FROM (
+        OLD.yok_id, OLD.full_name, OLD.title, OLD.department_id, OLD.institution,
+        OLD.department, OLD.email, OLD.profile_url, OLD.orcid, OLD.research_areas
+    ) THEN
+        NEW.profile_version := OLD.profile_version + 1;
+    END IF;
+    RETURN NEW;
+END $$
+"""
+
+# Writes to the tables a profile is built from bump the owning scholars'
+# profile_version; statement-level, like the scholar_metrics triggers.
+SCHOLAR_PROFILE_CHILD_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION scholar_profile_child_trigger()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE scholar SET profile_version = profile_version + 1
+        WHERE scholar_id IN (SELECT scholar_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE scholar SET profile_version = profile_version + 1
+        WHERE scholar_id IN (SELECT scholar_id FROM old_rows);
+    ELSE
+        UPDATE scholar SET profile_version = profile_version + 1
+        WHERE scholar_id IN (SELECT scholar_id FROM new_rows UNION SELECT scholar_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END $$
+"""
+
+# Profiles show their department's and university's names.
+DEPARTMENT_PROFILE_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION department_profile_version_trigger()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE scholar SET profile_version = profile_version + 1
+    WHERE department_id IN (
+        SELECT n.department_id
+        FROM new_rows n
+        JOIN old_rows o ON o.department_id = n.department_id
+        WHERE (n.name, n.university_id) IS DISTINCT FROM (o.name, o.university_id)
+    );
+    RETURN NULL;
+END $$
+"""
+
+UNIVERSITY_PROFILE_VERSION_FUNCTION = """
+CREATE OR REPLACE FUNCTION university_profile_version_trigger()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE scholar SET profile_version = profile_version + 1
+    WHERE department_id IN (
+        SELECT d.department_id
+        FROM department d
+        JOIN new_rows n ON n.university_id = d.university_id
+        JOIN old_rows o ON o.university_id = n.university_id
+        WHERE n.name IS DISTINCT FROM o.name
+    );
+    RETURN NULL;
+END $$
+"""
+
+SCHOLAR_PROFILE_TABLES = [
+    "publication",
+    "scholar_image",
+    "education_history",
+    "academic_history",
+    "course",
+    "thesis_supervision",
+    "administrative_duty",
+]
+
+SCHOLAR_PROFILE_VERSION_TRIGGERS = """
+DO $$
+DECLARE
+    tbl text;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'scholar_profile_version') THEN
+        CREATE TRIGGER scholar_profile_version BEFORE UPDATE ON scholar
+        FOR EACH ROW EXECUTE FUNCTION scholar_profile_version_trigger();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'department_profile_version_update') THEN
+        CREATE TRIGGER department_profile_version_update AFTER UPDATE ON department
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION department_profile_version_trigger();
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'university_profile_version_update') THEN
+        CREATE TRIGGER university_profile_version_update AFTER UPDATE ON university
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION university_profile_version_trigger();
+    END IF;
+    FOREACH tbl IN ARRAY ARRAY['{tables}'] LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = tbl || '_profile_version_insert') THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+                'FOR EACH STATEMENT EXECUTE FUNCTION scholar_profile_child_trigger()',
+                tbl || '_profile_version_insert', tbl
+            );
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = tbl || '_profile_version_update') THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+                'FOR EACH STATEMENT EXECUTE FUNCTION scholar_profile_child_trigger()',
+                tbl || '_profile_version_update', tbl
+            );
+        END IF;
+        IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = tbl || '_profile_version_delete') THEN
+            EXECUTE format(
+                'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+                'FOR EACH STATEMENT EXECUTE FUNCTION scholar_profile_child_trigger()',
+                tbl || '_profile_version_delete', tbl
+            );
+        END IF;
+    END LOOP;
+END $$
+""".replace("{tables}", "', '".join(SCHOLAR_PROFILE_TABLES))
+
+# Needed by anything that reads or writes profile vectors, including the
+# scripts that run without the API's startup.
+VECTOR_COLUMN_UPGRADES = [
+    "CREATE EXTENSION IF NOT EXISTS vector",
+    LEGACY_VECTOR_CAST_FUNCTION,
+    PROFILE_VECTOR_TYPE_UPGRADE.format(table="scholar"),
+    PROFILE_VECTOR_TYPE_UPGRADE.format(table="user"),
+]
+
+# create_all() only creates missing tables, so columns and indexes added to
+# existing tables are applied here on startup. Every statement is idempotent.
+SCHEMA_UPGRADES = [
+    # First, so no later statement (or request) binds a vector to a text column.
+    *VECTOR_COLUMN_UPGRADES,
+    "ALTER TABLE scholar ADD COLUMN IF NOT EXISTS vector_dirty BOOLEAN NOT NULL DEFAULT false",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_vector_dirty ON scholar (scholar_id) WHERE vector_dirty",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Declared IMMUTABLE (array_to_string is only STABLE) so it can back an
+    # expression index; it only joins plain text values.
+    """
+    CREATE OR REPLACE FUNCTION scholar_search_text(full_name text, research_areas text[])
+    RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT lower(coalesce(full_name, '') || ' ' || coalesce(array_to_string(research_areas, ' '), ''))
+    $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION scholar_research_areas_text(research_areas text[])
+    RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT lower(array_to_string(research_areas, '|'))
+    $$
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_recommendation_user_active_score ON recommendation (user_id, similarity_score DESC) WHERE is_dismissed = false",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_search_text_trgm ON scholar USING gin (scholar_search_text(full_name, research_areas) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_research_areas_trgm ON scholar USING gin (scholar_research_areas_text(research_areas) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_institution_trgm ON scholar USING gin (lower(institution) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_full_name_trgm ON scholar USING gin (lower(full_name) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_research_areas_gin ON scholar USING gin (research_areas)",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_full_name_id ON scholar (full_name, scholar_id)",
+    'ALTER TABLE "user" ADD COLUMN IF NOT EXISTS recommendations_stale BOOLEAN NOT NULL DEFAULT false',
+    'ALTER TABLE "user" ADD COLUMN IF NOT EXISTS recommendations_requested_at TIMESTAMP',
+    'ALTER TABLE "user" ADD COLUMN IF NOT EXISTS recommendations_generated_at TIMESTAMP',
+    'ALTER TABLE "user" ADD COLUMN IF NOT EXISTS recommendation_vector_hash VARCHAR(64)',
+    'ALTER TABLE "user" ADD COLUMN IF NOT EXISTS recommendation_index_version VARCHAR(64)',
+    'CREATE INDEX IF NOT EXISTS ix_user_recommendations_stale ON "user" (recommendations_requested_at) WHERE recommendations_stale',
+    # Bumped on every scholar vector write; recommendations record the value they were built against.
+    "CREATE SEQUENCE IF NOT EXISTS scholar_vector_version_seq",
+    "ALTER TABLE scholar ADD COLUMN IF NOT EXISTS vector_version BIGINT NOT NULL DEFAULT 0",
+    "CREATE INDEX IF NOT EXISTS ix_scholar_vector_version ON scholar (vector_version)",
+    # Content hash behind image URLs and ETags; generated so scraper writes keep it current.
+    "ALTER TABLE scholar_image ADD COLUMN IF NOT EXISTS image_hash VARCHAR(32) GENERATED ALWAYS AS (md5(image_data)) STORED",
+    PUBLICATION_CITATIONS_FUNCTION,
+    REFRESH_SCHOLAR_METRICS_FUNCTION,
+    SCHOLAR_METRICS_TRIGGER_FUNCTION,
+    SCHOLAR_METRICS_TRIGGERS,
+    # Version of the serialized profile response; see ProfileResponseCache.
+    "ALTER TABLE scholar ADD COLUMN IF NOT EXISTS profile_version INTEGER NOT NULL DEFAULT 0",
+    SCHOLAR_PROFILE_VERSION_FUNCTION,
+    SCHOLAR_PROFILE_CHILD_TRIGGER_FUNCTION,
+    DEPARTMENT_PROFILE_VERSION_FUNCTION,
+    UNIVERSITY_PROFILE_VERSION_FUNCTION,
+    SCHOLAR_PROFILE_VERSION_TRIGGERS,
+    # Backfills scholars that predate the triggers; a no-op once every scholar has a row.
+    """
+    SELECT refresh_scholar_metrics(ARRAY(
+        SELECT s.scholar_id FROM scholar s
+        WHERE NOT EXISTS (SELECT 1 FROM scholar_metrics m WHERE m.scholar_id = s.scholar_id)
+    ))
+    """,
+]
+
+# Held until the upgrade transaction ends. Every API worker upgrades on boot,
+# and concurrent CREATE OR REPLACE / ALTER TABLE on the same objects fail
+# with "tuple concurrently updated" or deadlock; the lock makes the others
+# wait and then find everything in place.
+SCHEMA_UPGRADE_LOCK_KEY = 7305142800
+
+async def lock_schema_upgrades(conn):
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_UPGRADE_LOCK_KEY})
+
+async def apply_vector_column_upgrades(conn):
+    await lock_schema_upgrades(conn)
+    for statement in VECTOR_COLUMN_UPGRADES:
+        await conn.execute(text(statement))
+
+async def apply_schema_upgrades(conn):
+    await lock_schema_upgrades(conn)
+    for statement in SCHEMA_UPGRADES:
+        await conn.execute(text(statement))
@@ -6,7 +6,15 @@ import json
 from scalar_fastapi import get_scalar_api_reference
 from app.core.config import settings
 from app.api.routes import users, auth, scraper, metadata, recommendations, admin, scholars, edits, contact, universities
-from app.data_access.database import engine, Base
+from app.data_access.database import engine, Base, AsyncSessionLocal
+from app.data_access.schema_upgrades import apply_schema_upgrades, lock_schema_upgrades
+from app.services.vector_index_service import start_vector_index_check
+from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.services.research_areas_service import ResearchAreasService
+from app.api.deps import get_embedding_service
+from app.services.vector_refresh_queue import get_vector_refresh_queue
+from app.services.recommendation_refresh_queue import get_recommendation_refresh_queue
+from app.services.scholar_vector_index import get_scholar_vector_index, get_snapshot_rebuild_scheduler, refresh_scholar_vector_index
 
 class UTF8JSONResponse(JSONResponse):
     def render(self, content) -> bytes:
@@ -66,11 +74,37 @@ app.include_router(universities.router, prefix="/api/v1/universities", tags=["un
 @app.on_event("startup")
 async def startup():
     async with engine.begin() as conn:
+        # First statement, so create_all is serialised across workers too.
+        await lock_schema_upgrades(conn)
         await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         await conn.run_sync(Base.metadata.create_all)
+        await apply_schema_upgrades(conn)
+    await engine.dispose()
+    app.state.vector_index_task = start_vector_index_check(engine)
+    
+    if settings.user_vector_mode == "pooled":
+        async with AsyncSessionLocal() as session:
+            research_areas = await ResearchAreasService(ScholarRepository(session)).get_unique_research_areas()
+        embedding_service = get_embedding_service()
+        await embedding_service.run_in_executor(embedding_service.precompute_term_vectors, research_areas)
+    
+    if settings.scholar_vector_index_enabled:
+        scholar_vector_index = get_scholar_vector_index()
+        scholar_vector_index.load()
+        if not await refresh_scholar_vector_index():
+            # Another worker is building it; this one loads it on a later reload check.
+            get_snapshot_rebuild_scheduler().request()
+    
+    get_vector_refresh_queue().start()
+    if settings.recommendation_refresh_in_api:
+        get_recommendation_refresh_queue().start()
 
 @app.on_event("shutdown")
 async def shutdown():
+    await get_vector_refresh_queue().stop()
+    await get_recommendation_refresh_queue().stop()
+    await get_snapshot_rebuild_scheduler().stop()
+    app.state.vector_index_task.cancel()
     await engine.dispose()
 
 @app.get("/")
@@ -173,6 +173,7 @@ class ScraperOrchestrator:
 
                         if existing_scholar:
                             await self.scholar_repo.update(existing_scholar.scholar_id, **scholar_data)
+                            await self.scholar_repo.invalidate_profile_cache(existing_scholar.scholar_id)
                         else:
                             await self.scholar_repo.create(**scholar_data)
                             results["scholars_saved"] += 1
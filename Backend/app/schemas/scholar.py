@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
@@ -82,7 +83,8 @@ class ScholarListItemResponse(BaseModel):
     research_areas: Optional[List[str]] = None
     institution: Optional[str] = None
     department: Optional[str] = None
-    image: Optional[str] = Field(default=None, description="Base64 encoded image data")
+    image: Optional[str] = Field(default=None, description="URL of the scholar image endpoint, versioned with image_hash")
+    image_hash: Optional[str] = Field(default=None, description="Content hash of the scholar image")
     h_index: Optional[int] = None
     citation_count: Optional[int] = None
     publication_count: Optional[int] = None
@@ -96,11 +98,29 @@ class ScholarsListResponse(BaseModel):
     total: int
     page: int
     total_pages: int
+    next_cursor: Optional[str] = None
+    total_is_estimate: bool = False
 
     class Config:
         from_attributes = True
 
 
+class SemanticScholarItemResponse(ScholarListItemResponse):
+    similarity_score: float
+
+
+class SemanticSearchResponse(BaseModel):
+    query: str
+    scholars: List[SemanticScholarItemResponse]
+    total: int
+
+
+class SimilarScholarsResponse(BaseModel):
+    scholar_id: UUID
+    scholars: List[SemanticScholarItemResponse]
+    computed_at: Optional[datetime] = None
+
+
 class ScholarProfileResponse(BaseModel):
     scholar_id: UUID
     yok_id: Optional[str] = None
@@ -114,7 +134,8 @@ class ScholarProfileResponse(BaseModel):
     institution: Optional[str] = None
     department: Optional[str] = None
     
-    image: Optional[str] = Field(default=None, description="Base64 encoded image data")
+    image: Optional[str] = Field(default=None, description="URL of the scholar image endpoint, versioned with image_hash")
+    image_hash: Optional[str] = Field(default=None, description="Content hash of the scholar image")
     
     h_index: Optional[int] = None
     citation_count: Optional[int] = None
@@ -0,0 +1,134 @@
+import contextlib
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# How long a store call waits for another worker's write lock before it is
+# treated as a miss (reads) or skipped (writes).
+STORE_BUSY_TIMEOUT_SECONDS = 0.5
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embedding cache keyed by (model name, sha256 of the whitespace-normalised text).
+
+    An in-process LRU sits in front of an optional on-disk SQLite store, so
+    identical texts are encoded once across requests and process restarts.
+    Vectors are kept as float32 arrays. The store is best effort: if it is
+    locked by another worker or fails, lookups miss and writes are skipped.
+    """
+
+    def __init__(self, model_name: str, path: Optional[str] = None, max_entries: int = 10000):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, timeout=STORE_BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS embedding (
+                        model TEXT NOT NULL,
+                        text_hash TEXT NOT NULL,
+                        vector BLOB NOT NULL,
+                        PRIMARY KEY (model, text_hash)
+                    )
+                """)
+                self._db.commit()
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Embedding cache store {path} unavailable, using the in-process LRU only: {str(e)}")
+                self._db = None
+
+    def get_many(self, hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        missing = []
+        with self._lock:
+            for h in hashes:
+                vector = self._lru.get(h)
+                if vector is not None:
+                    self._lru.move_to_end(h)
+                    found[h] = vector
+                else:
+                    missing.append(h)
+
+        if missing and self._db is not None:
+            stored = self._read_store(missing)
+            with self._lock:
+                for h, vector in stored.items():
+                    found[h] = vector
+                    self._remember(h, vector)
+        return found
+
+    def _read_store(self, hashes: List[str]) -> Dict[str, np.ndarray]:
+        stored = {}
+        try:
+            with self._db_lock:
+                for i in range(0, len(hashes), 500):
+                    chunk = hashes[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._db.execute(
+                        f"SELECT text_hash, vector FROM embedding WHERE model = ? AND text_hash IN ({placeholders})",
+                        [self.model_name, *chunk]
+                    ).fetchall()
+                    for h, blob in rows:
+                        stored[h] = np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache store read failed: {str(e)}")
+        return stored
+
+    def get(self, h: str) -> Optional[np.ndarray]:
+        return self.get_many([h]).get(h)
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        if not vectors:
+            return
+        rows = []
+        with self._lock:
+            for h, vector in vectors.items():
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(h, vector)
+                rows.append((self.model_name, h, vector.tobytes()))
+
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    self._db.executemany(
+                        "INSERT OR REPLACE INTO embedding (model, text_hash, vector) VALUES (?, ?, ?)",
+                        rows
+                    )
+                    self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache store write failed: {str(e)}")
+                with self._db_lock, contextlib.suppress(sqlite3.Error):
+                    self._db.rollback()
+
+    def put(self, h: str, vector: np.ndarray):
+        self.put_many({h: vector})
+
+    def _remember(self, h: str, vector: np.ndarray):
+        self._lru[h] = vector
+        self._lru.move_to_end(h)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
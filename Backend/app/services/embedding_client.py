@@ -0,0 +1,94 @@
+import json
+import socket
+import struct
+import threading
+from typing import List, Union
+import numpy as np
+
+REQUEST_HEADER = struct.Struct("!I")
+RESPONSE_HEADER = struct.Struct("!BI")
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class EmbeddingClient:
+    """
+    Stand-in for SentenceTransformer.encode() that forwards texts to the shared
+    embedding server over a Unix socket, so API workers never load the model.
+
+    Frames are a 4-byte big-endian length followed by a JSON list of texts;
+    replies are a status byte, a 4-byte length and a float32 matrix (or an
+    error message). Each thread keeps its own connection.
+
+    A request is retried once on a fresh connection if the pooled one turns
+    out to be closed (e.g. after a server restart), but never after a
+    timeout: the server may still be encoding it, and sending it again
+    would only add load to a server that is already behind.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, convert_to_numpy: bool = True, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        matrix = self._request(texts)
+        return matrix[0] if single else matrix
+
+    def _request(self, texts: List[str]) -> np.ndarray:
+        payload = json.dumps(texts, ensure_ascii=False).encode("utf-8")
+        frame = REQUEST_HEADER.pack(len(payload)) + payload
+
+        for attempt in range(2):
+            sock = self._connection()
+            try:
+                sock.sendall(frame)
+                status, length = RESPONSE_HEADER.unpack(self._recv_exactly(sock, RESPONSE_HEADER.size))
+                body = self._recv_exactly(sock, length)
+                break
+            except socket.timeout:
+                # The reply may still arrive on this connection, so it cannot be reused.
+                self._close()
+                raise
+            except OSError:
+                self._close()
+                if attempt == 1:
+                    raise
+
+        if status != STATUS_OK:
+            raise RuntimeError(f"Embedding server error: {body.decode('utf-8', errors='replace')}")
+        return np.frombuffer(body, dtype=np.float32).reshape(len(texts), -1)
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = sock.recv_into(view[received:], size - received)
+            if count == 0:
+                raise ConnectionError("Embedding server closed the connection")
+            received += count
+        return bytes(buffer)
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import logging
+import os
+import numpy as np
+from app.services.embedding_client import REQUEST_HEADER, RESPONSE_HEADER, STATUS_OK, STATUS_ERROR
+from app.services.embedding_service import EmbeddingService, EMBEDDING_DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+# Larger frames are refused before they are read; the connection is closed
+# since the rest of the frame cannot be skipped safely.
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+
+
+class EmbeddingServer:
+    """
+    Serves embeddings to every API worker in the container from one model.
+
+    Requests from all connections go through EmbeddingService.aencode(), so
+    texts arriving from different workers within the batching window share a
+    single encode() call. See EmbeddingClient for the wire format.
+    """
+
+    def __init__(self, socket_path: str, embedding_service: EmbeddingService = None):
+        self.socket_path = socket_path
+        self.embedding_service = embedding_service or EmbeddingService(use_server=False)
+
+    async def serve_forever(self):
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        logger.info(f"Embedding server listening on {self.socket_path}")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(REQUEST_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = REQUEST_HEADER.unpack(header)
+                if length > MAX_REQUEST_BYTES:
+                    await self._reply(writer, STATUS_ERROR, f"Request of {length} bytes exceeds {MAX_REQUEST_BYTES}".encode("utf-8"))
+                    break
+                body = await reader.readexactly(length)
+
+                try:
+                    texts = self._parse_request(body)
+                except ValueError as e:
+                    logger.warning(f"Rejected malformed embedding request: {str(e)}")
+                    await self._reply(writer, STATUS_ERROR, f"Bad request: {str(e)}".encode("utf-8"))
+                    continue
+
+                try:
+                    vectors = await self.embedding_service.aencode(texts)
+                    matrix = np.zeros((len(texts), EMBEDDING_DIMENSIONS), dtype=np.float32)
+                    for i, vector in enumerate(vectors):
+                        if vector is not None:
+                            matrix[i] = vector
+                    status, payload = STATUS_OK, matrix.tobytes()
+                except Exception as e:
+                    logger.error(f"Error encoding {len(texts)} texts: {str(e)}")
+                    status, payload = STATUS_ERROR, str(e).encode("utf-8")
+
+                await self._reply(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_request(body: bytes) -> list:
+        """The JSON list of texts in a request frame; ValueError if it is not one."""
+        try:
+            texts = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"invalid JSON ({str(e)})")
+        if not isinstance(texts, list) or not all(text is None or isinstance(text, str) for text in texts):
+            raise ValueError("expected a JSON list of strings")
+        return texts
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, status: int, payload: bytes):
+        writer.write(RESPONSE_HEADER.pack(status, len(payload)) + payload)
+        await writer.drain()
@@ -1,17 +1,150 @@
-from typing import List
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
 import json
-from sentence_transformers import SentenceTransformer
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from app.core.config import settings
+from app.services.embedding_cache import EmbeddingCache, text_hash
+from app.services.embedding_client import EmbeddingClient
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+EMBEDDING_DIMENSIONS = 384
+# Separates interests in InterestMatcher's joined string; cannot occur in a term.
+_TERM_SEPARATOR = "\x00"
+
+
+class InterestMatcher:
+    """
+    Lexical matcher built once per user interest list. A research area
+    matches when an interest occurs in it or it occurs in an interest
+    (case-insensitive), checked with one regex scan over the area for the
+    first case and one substring search over the joined interests for the
+    second. Results are memoised per area, since the same areas repeat
+    across a user's recommended scholars.
+    """
+
+    def __init__(self, user_interests: List[str]):
+        interests = list(dict.fromkeys(i.lower() for i in user_interests if i and i.strip()))
+        self._joined = _TERM_SEPARATOR.join(interests)
+        self._pattern = re.compile("|".join(re.escape(i) for i in interests)) if interests else None
+        self._matches: Dict[str, bool] = {}
+
+    def matches(self, area: str) -> bool:
+        matched = self._matches.get(area)
+        if matched is None:
+            area_lower = area.lower()
+            matched = self._pattern is not None and (
+                self._pattern.search(area_lower) is not None or area_lower in self._joined
+            )
+            self._matches[area] = matched
+        return matched
+
 
 class EmbeddingService:
-    def __init__(self):
+    def __init__(self, use_server: bool = True):
 
-        self.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2', device='cpu')
+        self.model_name = MODEL_NAME
+        if use_server and settings.embedding_server_socket:
+            # The shared embedding server owns the model; this process only
+            # needs the client, so torch is never imported here.
+            self.model = EmbeddingClient(settings.embedding_server_socket)
+        else:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(self.model_name, device='cpu')
+        self.cache = EmbeddingCache(
+            self.model_name,
+            path=settings.embedding_cache_path,
+            max_entries=settings.embedding_cache_size
+        )
+        self.user_vector_mode = settings.user_vector_mode
+        # (term -> row, matrix) published as one tuple and replaced, never
+        # mutated, so a reader always gets a row map that fits its matrix.
+        self._terms = ({}, np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.float32))
+        self._term_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.embedding_executor_workers,
+            thread_name_prefix="embedding"
+        )
+        self._pending = []
+        self._flush_handle = None
+        # The loop only keeps weak references to tasks.
+        self._flush_tasks = set()
+    
+    async def run_in_executor(self, fn, *args):
+        """Run a blocking model call on the bounded embedding executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+    
+    async def aencode(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async counterpart of generate_embeddings_batch().
+        Requests arriving within embedding_batch_window_ms of each other are
+        merged into a single encode() call on the embedding executor, so the
+        event loop is never blocked by transformer inference.
+        """
+        if not texts:
+            return []
+        
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+        
+        if len(self._pending) >= settings.embedding_max_batch_size:
+            self._schedule_flush(loop, 0)
+        elif self._flush_handle is None:
+            self._schedule_flush(loop, settings.embedding_batch_window_ms / 1000)
+        
+        return list(await asyncio.gather(*futures))
+    
+    def _schedule_flush(self, loop, delay: float):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = loop.call_later(delay, self._start_flush)
+    
+    def _start_flush(self):
+        task = asyncio.ensure_future(self._flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_done)
+    
+    def _flush_done(self, task: asyncio.Task):
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Embedding batch flush failed: {task.exception()}")
+    
+    async def _flush(self):
+        batch, self._pending = self._pending, []
+        self._flush_handle = None
+        if not batch:
+            return
+        
+        try:
+            vectors = await self.run_in_executor(self.generate_embeddings_batch, [text for text, _ in batch])
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        except BaseException as e:
+            # Waiters must never hang, whatever went wrong (including cancellation).
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e if isinstance(e, Exception) else RuntimeError("Embedding batch was cancelled"))
+            raise
     
     def generate_embedding(self, text: str) -> List[float]:
         if not text or not text.strip():
             return None
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        h = text_hash(text)
+        embedding = self.cache.get(h)
+        if embedding is None:
+            embedding = self.model.encode(text, convert_to_numpy=True)
+            self.cache.put(h, embedding)
         return embedding.tolist()
     
     def generate_embedding_from_list(self, texts: List[str]) -> List[float]:
@@ -22,6 +155,76 @@ class EmbeddingService:
             return None
         return self.generate_embedding(combined_text)
     
+    def precompute_term_vectors(self, terms: List[str]):
+        """
+        Embed each term that is not yet in the term matrix, once.
+        Rows are L2-normalised so they can be mean-pooled directly.
+        """
+        term_rows, _ = self._terms
+        missing = [t for t in dict.fromkeys(terms) if t and t.strip() and t not in term_rows]
+        if not missing:
+            return
+        
+        vectors = self.generate_embeddings_batch(missing)
+        rows = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        rows = rows / np.where(norms == 0, 1.0, norms)
+        
+        with self._term_lock:
+            term_rows, matrix = self._terms
+            added = [(term, row) for term, row in zip(missing, rows) if term not in term_rows]
+            if not added:
+                return
+            term_rows = dict(term_rows)
+            for term, _ in added:
+                term_rows[term] = len(term_rows)
+            self._terms = (term_rows, np.vstack([matrix, np.stack([row for _, row in added])]))
+    
+    def compose_interest_vector(self, interests: List[str]) -> List[float]:
+        """
+        Build a user vector by mean-pooling the cached term vectors of the
+        given interests instead of encoding the joined interest string.
+        """
+        terms = [t for t in interests if t and t.strip()] if interests else []
+        if not terms:
+            return None
+        self.precompute_term_vectors(terms)
+        term_rows, matrix = self._terms
+        pooled = matrix[[term_rows[t] for t in terms]].mean(axis=0)
+        norm = np.linalg.norm(pooled)
+        if norm == 0:
+            return None
+        return (pooled / norm).tolist()
+    
+    def generate_user_interest_vector(self, interests: List[str]) -> List[float]:
+        if self.user_vector_mode == "pooled":
+            return self.compose_interest_vector(interests)
+        return self.generate_embedding_from_list(interests)
+    
+    async def agenerate_embedding_from_list(self, texts: List[str]) -> List[float]:
+        if not texts or len(texts) == 0:
+            return None
+        combined_text = " ".join([t for t in texts if t and t.strip()])
+        if not combined_text.strip():
+            return None
+        return (await self.aencode([combined_text]))[0]
+    
+    async def agenerate_user_interest_vector(self, interests: List[str]) -> List[float]:
+        if self.user_vector_mode == "pooled":
+            term_rows, _ = self._terms
+            if interests and all(t in term_rows for t in interests if t and t.strip()):
+                return self.compose_interest_vector(interests)
+            return await self.run_in_executor(self.compose_interest_vector, interests)
+        return await self.agenerate_embedding_from_list(interests)
+    
+    async def agenerate_scholar_profile_vector(self, research_areas: List[str], publication_titles: List[str] = None) -> List[float]:
+        texts = []
+        if research_areas:
+            texts.extend(research_areas)
+        if publication_titles:
+            texts.extend(publication_titles)
+        return await self.agenerate_embedding_from_list(texts)
+    
     def generate_scholar_profile_vector(self, research_areas: List[str], publication_titles: List[str] = None) -> List[float]:
         texts = []
         if research_areas:
@@ -34,33 +237,45 @@ class EmbeddingService:
         """
         Generate embeddings for multiple texts in batch.
         This is much faster than calling generate_embedding() multiple times.
+        Texts already in the embedding cache are not re-encoded, and
+        duplicate texts within the batch are encoded once.
         """
         if not texts or len(texts) == 0:
             return []
         
 
-        valid_texts = []
+        valid_hashes = []
         valid_indices = []
+        texts_by_hash = {}
         for i, text in enumerate(texts):
             if text and text.strip():
-                valid_texts.append(text)
+                h = text_hash(text)
+                valid_hashes.append(h)
                 valid_indices.append(i)
+                texts_by_hash.setdefault(h, text)
         
-        if not valid_texts:
+        if not valid_hashes:
             return [None] * len(texts)
         
 
-        embeddings = self.model.encode(
-            valid_texts,
-            batch_size=batch_size,
-            convert_to_numpy=True,
-            show_progress_bar=False
-        )
+        embeddings_by_hash = self.cache.get_many(texts_by_hash.keys())
+        missing_hashes = [h for h in texts_by_hash if h not in embeddings_by_hash]
+        
+        if missing_hashes:
+            embeddings = self.model.encode(
+                [texts_by_hash[h] for h in missing_hashes],
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False
+            )
+            encoded = dict(zip(missing_hashes, embeddings))
+            self.cache.put_many(encoded)
+            embeddings_by_hash.update(encoded)
         
 
         result = [None] * len(texts)
-        for idx, embedding in zip(valid_indices, embeddings):
-            result[idx] = embedding.tolist()
+        for idx, h in zip(valid_indices, valid_hashes):
+            result[idx] = embeddings_by_hash[h].tolist()
         
         return result
     
@@ -71,6 +286,18 @@ class EmbeddingService:
         """
         return self.generate_embeddings_batch(scholar_texts, batch_size)
     
+    def generate_user_interest_vectors_batch(self, interest_lists: List[List[str]], batch_size: int = 32) -> List[List[float]]:
+        """
+        Batch form of generate_user_interest_vector(): one encode() call for
+        all joined interest strings, or one term precompute in pooled mode.
+        """
+        if self.user_vector_mode == "pooled":
+            self.precompute_term_vectors([t for interests in interest_lists if interests for t in interests])
+            return [self.compose_interest_vector(interests) for interests in interest_lists]
+        
+        texts = [" ".join([t for t in interests if t and t.strip()]) if interests else "" for interests in interest_lists]
+        return self.generate_embeddings_batch(texts, batch_size)
+    
     def cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         if not vec1 or not vec2:
             return 0.0
@@ -84,13 +311,63 @@ class EmbeddingService:
         return float(dot_product / (norm1 * norm2))
     
     def find_matching_terms(self, user_interests: List[str], scholar_research_areas: List[str]) -> List[str]:
-        user_interests_lower = [interest.lower() for interest in user_interests]
-        matching = []
-        for area in scholar_research_areas:
-            area_lower = area.lower()
-            for interest in user_interests_lower:
-                if interest in area_lower or area_lower in interest:
-                    if area not in matching:
-                        matching.append(area)
-        return matching
+        return self.find_matching_terms_many(user_interests, [scholar_research_areas])[0]
+    
+    def find_matching_terms_many(
+        self,
+        user_interests: List[str],
+        research_area_lists: List[List[str]],
+        semantic_threshold: Optional[float] = None
+    ) -> List[List[str]]:
+        """
+        Matching research areas for each scholar's area list, in the list's
+        order without duplicates. Each distinct area is checked once: first
+        lexically, then, if a threshold is set (explanation_semantic_threshold
+        by default), by cosine similarity of cached term vectors against the
+        interests in one matrix product.
+        """
+        matcher = InterestMatcher(user_interests)
+        areas = list(dict.fromkeys(area for area_list in research_area_lists if area_list for area in area_list))
+        matched = {area for area in areas if matcher.matches(area)}
+        
+        if semantic_threshold is None:
+            semantic_threshold = settings.explanation_semantic_threshold
+        if semantic_threshold is not None:
+            matched |= self._semantic_matches(user_interests, [area for area in areas if area not in matched], semantic_threshold)
+        
+        return [
+            [area for area in dict.fromkeys(area_list or []) if area in matched]
+            for area_list in research_area_lists
+        ]
+    
+    def _semantic_matches(self, user_interests: List[str], areas: Iterable[str], threshold: float) -> Set[str]:
+        """
+        Areas whose term vector has cosine similarity >= threshold with any
+        interest vector. Only terms already in the term matrix are compared
+        (see precompute_term_vectors), so this never calls the model.
+        """
+        term_rows, matrix = self._terms
+        interest_rows = [term_rows[t] for t in user_interests if t in term_rows]
+        area_rows = [(area, term_rows[area]) for area in areas if area in term_rows]
+        if not interest_rows or not area_rows:
+            return set()
+        
+        similarities = matrix[[row for _, row in area_rows]] @ matrix[interest_rows].T
+        hits = (similarities >= threshold).any(axis=1)
+        return {area for (area, _), hit in zip(area_rows, hits) if hit}
+
+
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
 
+def get_embedding_service() -> EmbeddingService:
+    """
+    Process-wide EmbeddingService shared by routes, services, repositories
+    and scripts, so the model is loaded at most once per process.
+    """
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
+    return _embedding_service
@@ -0,0 +1,155 @@
+import contextlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# How long a store call waits for another worker's write lock before it is
+# treated as a miss (reads) or skipped (writes).
+STORE_BUSY_TIMEOUT_SECONDS = 0.5
+
+
+class ProfileResponseCache:
+    """
+    Serialized scholar profile responses keyed by (scholar_id, variant).
+
+    Each entry carries the scholar.profile_version it was built from and is
+    only returned for that version, so a profile changed by any writer
+    (including the scraper, through database triggers) is rebuilt on its next
+    request. invalidate() additionally drops a scholar's entries right away
+    after writes made through the API.
+
+    An in-process LRU sits in front of an optional on-disk SQLite store that
+    API workers on the same host share. Only the newest version of each entry
+    is kept. Store calls run in the threadpool and are best effort: if the
+    store is locked by another worker or fails, lookups miss and writes are
+    skipped.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self._lru: "OrderedDict[Tuple[str, str], Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, timeout=STORE_BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("""
+                    CREATE TABLE IF NOT EXISTS profile_response (
+                        scholar_id TEXT NOT NULL,
+                        variant TEXT NOT NULL,
+                        version INTEGER NOT NULL,
+                        body BLOB NOT NULL,
+                        PRIMARY KEY (scholar_id, variant)
+                    )
+                """)
+                self._db.commit()
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Profile cache store {path} unavailable, using the in-process LRU only: {str(e)}")
+                self._db = None
+
+    async def get(self, scholar_id: UUID, variant: str, version: int) -> Optional[bytes]:
+        key = (str(scholar_id), variant)
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and entry[0] == version:
+                self._lru.move_to_end(key)
+                return entry[1]
+
+        if self._db is None:
+            return None
+        body = await run_in_threadpool(self._read_store, key, version)
+        if body is not None:
+            with self._lock:
+                self._remember(key, version, body)
+        return body
+
+    async def put(self, scholar_id: UUID, variant: str, version: int, body: bytes):
+        key = (str(scholar_id), variant)
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None or entry[0] <= version:
+                self._remember(key, version, body)
+
+        if self._db is not None:
+            await run_in_threadpool(self._write_store, key, version, body)
+
+    async def invalidate(self, *scholar_ids: UUID):
+        ids = [str(scholar_id) for scholar_id in set(scholar_ids) if scholar_id]
+        if not ids:
+            return
+        with self._lock:
+            for key in [key for key in self._lru if key[0] in ids]:
+                del self._lru[key]
+
+        if self._db is not None:
+            await run_in_threadpool(self._delete_from_store, ids)
+
+    def _read_store(self, key: Tuple[str, str], version: int) -> Optional[bytes]:
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT body FROM profile_response WHERE scholar_id = ? AND variant = ? AND version = ?",
+                    [key[0], key[1], version]
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Profile cache store read failed: {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def _write_store(self, key: Tuple[str, str], version: int, body: bytes):
+        try:
+            with self._db_lock:
+                # A slower worker must not replace a newer version written meanwhile.
+                self._db.execute(
+                    """
+                    INSERT INTO profile_response (scholar_id, variant, version, body) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (scholar_id, variant) DO UPDATE SET version = excluded.version, body = excluded.body
+                    WHERE excluded.version >= profile_response.version
+                    """,
+                    [key[0], key[1], version, body]
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Profile cache store write failed: {str(e)}")
+            self._rollback()
+
+    def _delete_from_store(self, ids: List[str]):
+        try:
+            with self._db_lock:
+                placeholders = ",".join("?" * len(ids))
+                self._db.execute(f"DELETE FROM profile_response WHERE scholar_id IN ({placeholders})", ids)
+                self._db.commit()
+        except sqlite3.Error as e:
+            # Entries of the old profile_version are never served again anyway.
+            logger.warning(f"Profile cache store delete failed: {str(e)}")
+            self._rollback()
+
+    def _rollback(self):
+        with self._db_lock, contextlib.suppress(sqlite3.Error):
+            self._db.rollback()
+
+    def _remember(self, key: Tuple[str, str], version: int, body: bytes):
+        self._lru[key] = (version, body)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+
+@lru_cache()
+def get_profile_response_cache() -> ProfileResponseCache:
+    return ProfileResponseCache(settings.profile_cache_path, settings.profile_cache_size)
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationRefreshQueue:
+    """
+    Background drainer for users whose recommendations need recomputing.
+
+    Interest edits set ``user.recommendations_stale`` and bump
+    ``recommendations_requested_at`` instead of recalculating in the request.
+    A user is only claimed once no new request has arrived for
+    debounce_seconds, so a burst of edits coalesces into one recalculation,
+    and the flag itself deduplicates repeated requests. Claiming uses
+    SKIP LOCKED, so any number of drainers (API workers or the standalone
+    scripts/run_recommendation_worker.py) can run side by side.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float = 5.0,
+        poll_interval_seconds: float = 5.0,
+        batch_size: int = 50
+    ):
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self._wake: Optional[asyncio.Event] = None
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def run_forever(self):
+        """Run the drainer in the foreground (standalone worker process)."""
+        self.start()
+        try:
+            await self._worker
+        finally:
+            await self.stop()
+
+    def notify(self):
+        """Schedule a drain once the debounce window has passed; no-op without a running drainer."""
+        if self._wake is None or self._wake_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wake_handle = loop.call_later(self.debounce_seconds, self._set_wake)
+
+    def _set_wake(self):
+        self._wake_handle = None
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.drain()
+
+    async def drain(self) -> int:
+        """Refresh claimed users until none are due. Returns the number of recalculated users."""
+        from app.data_access.database import AsyncSessionLocal
+        from app.data_access.repositories.user_repository import UserRepository
+
+        total_refreshed = 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                try:
+                    batch = await UserRepository(session).claim_stale_recommendation_users(
+                        self.batch_size,
+                        self.debounce_seconds
+                    )
+                except Exception as e:
+                    logger.error(f"Error claiming stale recommendation users: {str(e)}")
+                    return total_refreshed
+            if not batch:
+                return total_refreshed
+
+            for user_id in batch:
+                if await self._refresh_user(user_id):
+                    total_refreshed += 1
+            logger.info(f"Processed recommendation refresh for {len(batch)} users")
+
+    async def _refresh_user(self, user_id) -> bool:
+        from app.data_access.database import AsyncSessionLocal
+        from app.data_access.repositories.recommendation_repository import RecommendationRepository
+        from app.data_access.repositories.scholar_repository import ScholarRepository
+        from app.data_access.repositories.user_repository import UserRepository
+        from app.services.embedding_service import get_embedding_service
+        from app.services.recommendation_service import RecommendationService
+        from app.services.user_service import UserService
+
+        async with AsyncSessionLocal() as session:
+            user_repo = UserRepository(session)
+            embedding_service = get_embedding_service()
+            recommendation_service = RecommendationService(
+                RecommendationRepository(session),
+                ScholarRepository(session),
+                user_repo,
+                embedding_service,
+                UserService(user_repo, embedding_service)
+            )
+            try:
+                return await recommendation_service.refresh_recommendations(user_id)
+            except Exception as e:
+                logger.error(f"Error refreshing recommendations for user {user_id}: {str(e)}")
+                # Leave the user queued for the next wake-up instead of retrying in a tight loop.
+                await session.rollback()
+                await user_repo.mark_recommendations_stale(user_id)
+                return False
+
+
+@lru_cache()
+def get_recommendation_refresh_queue() -> RecommendationRefreshQueue:
+    return RecommendationRefreshQueue(
+        debounce_seconds=settings.recommendation_refresh_debounce_seconds,
+        poll_interval_seconds=settings.recommendation_refresh_poll_seconds
+    )
@@ -1,15 +1,25 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
+import asyncio
+import hashlib
 import json
-from sqlalchemy import text, select
-from sqlalchemy.orm import selectinload
+import logging
+import time
+import numpy as np
+from sqlalchemy import text
 from app.data_access.repositories.recommendation_repository import RecommendationRepository
 from app.data_access.repositories.scholar_repository import ScholarRepository
 from app.data_access.repositories.user_repository import UserRepository
 from app.services.embedding_service import EmbeddingService
 from app.services.user_service import UserService
+from app.services.scholar_vector_index import ScholarVectorIndex, get_scholar_vector_index
+from app.core.config import settings
 from app.data_access.models import Scholar
 
+logger = logging.getLogger(__name__)
+
+RESEARCH_AREAS_FETCH_CHUNK_SIZE = 5000
+
 class RecommendationService:
     def __init__(
         self,
@@ -17,146 +27,302 @@ class RecommendationService:
         scholar_repo: ScholarRepository,
         user_repo: UserRepository,
         embedding_service: EmbeddingService,
-        user_service: UserService
+        user_service: UserService,
+        scholar_vector_index: Optional[ScholarVectorIndex] = None
     ):
         self.recommendation_repo = recommendation_repo
         self.scholar_repo = scholar_repo
         self.user_repo = user_repo
         self.embedding_service = embedding_service
         self.user_service = user_service
+        if scholar_vector_index is None and settings.scholar_vector_index_enabled:
+            scholar_vector_index = get_scholar_vector_index()
+        self.scholar_vector_index = scholar_vector_index
+    
+    async def find_nearest_scholars(self, user_vector, top_k: int = 20) -> List[Tuple[UUID, List[str], float]]:
+        """
+        Top-k scholars by cosine similarity as (scholar_id, research_areas, similarity).
+        Uses the in-process ScholarVectorIndex when one is loaded, otherwise
+        the HNSW index in Postgres.
+        """
+        index = self.scholar_vector_index
+        if index is not None:
+            await index.amaybe_reload()
+            if index.is_loaded():
+                nearest = await index.asearch(user_vector, top_k=top_k)
+                research_areas = await self.scholar_repo.get_research_areas_by_ids([scholar_id for scholar_id, _ in nearest])
+                return [
+                    (scholar_id, research_areas[scholar_id], similarity)
+                    for scholar_id, similarity in nearest
+                    if scholar_id in research_areas
+                ]
+        
+        return await self.scholar_repo.find_nearest_scholars(user_vector, top_k=top_k)
+    
+    @staticmethod
+    def vector_hash(vector) -> Optional[str]:
+        if vector is None:
+            return None
+        return hashlib.sha256(np.asarray(vector, dtype=np.float32).tobytes()).hexdigest()
+    
+    async def current_index_version(self) -> int:
+        """
+        scholar_vector_version_seq value of the scholar vectors recommendations
+        are computed against: the one the loaded snapshot was built from, or
+        the current one when querying Postgres.
+        """
+        index = self.scholar_vector_index
+        if index is not None:
+            await index.amaybe_reload()
+            if index.is_loaded():
+                return index.built_from
+        return await self.scholar_repo.get_vector_version()
+    
+    async def request_refresh(self, user_id: UUID):
+        """Queue a debounced recommendation refresh instead of recalculating in the request."""
+        from app.services.recommendation_refresh_queue import get_recommendation_refresh_queue
+        
+        await self.user_repo.mark_recommendations_stale(user_id)
+        get_recommendation_refresh_queue().notify()
+    
+    async def is_fresh(self, user_id: UUID) -> Optional[bool]:
+        """
+        True if the stored recommendations were built from the user's current
+        vector within the TTL, and no scholar vector written since can change
+        them; None if the user does not exist or a refresh is already queued.
+        Vector writes elsewhere in the catalogue leave the user fresh.
+        """
+        state = await self.user_repo.get_recommendation_state(user_id, settings.recommendation_ttl_seconds)
+        if state is None or state.recommendations_stale:
+            return None
+        if not state.within_ttl or state.recommendation_vector_hash != self.vector_hash(state.profile_vector):
+            return False
+        try:
+            built_from = int(state.recommendation_index_version)
+        except (TypeError, ValueError):
+            return False
+        current = await self.current_index_version()
+        if current <= built_from:
+            return True
+        return not await self.recommendation_repo.has_vector_changes_affecting(
+            user_id, state.profile_vector, built_from, current
+        )
+    
+    async def request_refresh_if_outdated(self, user_id: UUID) -> bool:
+        """Lazy freshness check for reads: queue a refresh when the recommendations are outdated."""
+        if await self.is_fresh(user_id) is False:
+            await self.request_refresh(user_id)
+            return True
+        return False
+    
+    async def refresh_recommendations(self, user_id: UUID, force: bool = False) -> bool:
+        """Recalculate unless the stored recommendations are still fresh. Returns True if recalculated."""
+        if not force and await self.is_fresh(user_id):
+            return False
+        await self.recalculate_recommendations(user_id)
+        return True
     
     async def recalculate_recommendations(self, user_id: UUID, top_k: int = 20):
         user = await self.user_repo.get(user_id)
         if not user:
             return
         
+        index_version = await self.current_index_version()
         user_interests = self.user_service.get_user_interests(user)
         if not user_interests or len(user_interests) == 0:
             await self.recommendation_repo.delete_by_user_id(user_id)
             await self.user_repo.update_user_vector(user_id, None)
+            await self.user_repo.set_recommendation_state({user_id: None}, index_version)
             return
         
         user_vector = user.profile_vector
-        if not user_vector:
-            user_vector = self.embedding_service.generate_embedding_from_list(user_interests)
+        if user_vector is None:
+            user_vector = await self.embedding_service.agenerate_user_interest_vector(user_interests)
             if user_vector:
                 await self.user_repo.update_user_vector(user_id, user_vector)
         
-        if not user_vector:
+        if user_vector is None:
             return
         
-        await self.recommendation_repo.delete_by_user_id(user_id)
+        nearest = await self.find_nearest_scholars(user_vector, top_k=top_k)
+        await self._prepare_semantic_explanations(
+            user_interests + [area for _, research_areas, _ in nearest for area in research_areas or []]
+        )
         
-
-
-
-        vector_str = '[' + ','.join(str(float(v)) for v in user_vector) + ']'
+        recommendations = self._build_recommendations(user_interests, nearest)
         
-
-        query = text(f"""
-            SELECT 
-                scholar_id,
-                1 - (profile_vector <=> '{vector_str}'::vector) as similarity_score
-            FROM scholar
-            WHERE profile_vector IS NOT NULL
-            ORDER BY profile_vector <=> '{vector_str}'::vector
-            LIMIT :top_k
-        """)
-        
-        result = await self.scholar_repo.session.execute(
-            query, {"top_k": top_k}
+        await self.recommendation_repo.replace_for_user(user_id, recommendations)
+        await self.user_repo.set_recommendation_state({user_id: self.vector_hash(user_vector)}, index_version)
+    
+    async def _prepare_semantic_explanations(self, terms: List[str]):
+        """Embed terms missing from the term matrix when semantic explanation matching is on."""
+        if settings.explanation_semantic_threshold is None:
+            return
+        await self.embedding_service.run_in_executor(self.embedding_service.precompute_term_vectors, terms)
+    
+    def _build_recommendations(
+        self,
+        user_interests: List[str],
+        nearest: List[Tuple[UUID, List[str], float]]
+    ) -> List[Dict[str, Any]]:
+        nearest = [(scholar_id, research_areas or [], similarity) for scholar_id, research_areas, similarity in nearest if similarity > 0.0]
+        matching_terms_by_row = self.embedding_service.find_matching_terms_many(
+            user_interests,
+            [research_areas for _, research_areas, _ in nearest]
         )
         
-        rows = result.fetchall()
-        
-
-
-        scholar_ids = [UUID(str(row[0])) for row in rows]
-        scholars_query = select(Scholar).options(
-            selectinload(Scholar.publications)
-        ).filter(Scholar.scholar_id.in_(scholar_ids))
+        recommendations = []
+        for (scholar_id, research_areas, similarity), matching_terms in zip(nearest, matching_terms_by_row):
+            explanation = {
+                "matching_research_areas": matching_terms,
+                "similarity_score": round(similarity, 4),
+                "user_interests_count": len(user_interests),
+                "scholar_research_areas_count": len(research_areas)
+            }
+            
+            recommendations.append({
+                "scholar_id": scholar_id,
+                "similarity_score": similarity,
+                "explanation": explanation
+            })
+        return recommendations
+    
+    async def recalculate_all_recommendations(self, top_k: int = 20, block_size: int = 256) -> Dict[str, Any]:
+        """
+        Regenerate every user's vector and recommendations as a matrix job over
+        pages of block_size users, keyed by user_id. For each page:
+        - encode the users' interests in one batch and write the vectors in bulk
+        - stack them into U and score U x S^T against the scholar matrix,
+          keeping the top_k per row
+        - write the page's recommendations with one COPY + upsert pass
+        Users without interests lose their vector and recommendations.
+        """
+        timings = {"user_vectors": 0.0, "scoring": 0.0, "write": 0.0}
+        stats = {
+            "total_users": 0,
+            "users_with_vectors": 0,
+            "skipped_no_interests": 0,
+            "scholars": 0,
+            "recommendations_written": 0,
+        }
         
-        scholars_result = await self.scholar_repo.session.execute(scholars_query)
-        scholars_dict = {scholar.scholar_id: scholar for scholar in scholars_result.scalars().all()}
+        index_version = await self.current_index_version()
+        index = self.scholar_vector_index
+        if index is not None:
+            await index.amaybe_reload()
+        if index is None or not index.is_loaded():
+            rows = []
+            async for batch in self.scholar_repo.iter_vector_index_rows():
+                rows.extend(batch)
+            index = ScholarVectorIndex.from_rows(rows)
+        stats["scholars"] = index.size
         
-        recommendations = []
-        for row in rows:
-
-            scholar_id = UUID(str(row[0]))
-            similarity = float(row[1])
+        # Users are paged by user_id so memory stays bounded by block_size.
+        after_user_id = None
+        while True:
+            users = await self.user_repo.get_interests_page(after_user_id, block_size)
+            if not users:
+                break
+            after_user_id = users[-1].user_id
             
-            if similarity > 0.0:
-                scholar = scholars_dict.get(scholar_id)
-                if not scholar:
-                    continue
-                
-                matching_terms = self.embedding_service.find_matching_terms(
-                    user_interests,
-                    scholar.research_areas or []
-                )
-                
-                explanation = {
-                    "matching_research_areas": matching_terms,
-                    "similarity_score": round(similarity, 4),
-                    "user_interests_count": len(user_interests),
-                    "scholar_research_areas_count": len(scholar.research_areas) if scholar.research_areas else 0
-                }
-                
-                recommendations.append({
-                    "scholar_id": scholar_id,
-                    "similarity_score": similarity,
-                    "explanation": explanation
-                })
+            written, active, scored = await self._recalculate_block(users, index, index_version, top_k, block_size, timings)
+            stats["total_users"] += len(users)
+            stats["users_with_vectors"] += scored
+            stats["skipped_no_interests"] += len(users) - active
+            stats["recommendations_written"] += written
         
-
-        for rec in recommendations:
-
-            existing = await self.recommendation_repo.get_existing_recommendation(
-                user_id=user_id,
-                scholar_id=rec["scholar_id"]
+        stats["seconds"] = {stage: round(seconds, 2) for stage, seconds in timings.items()}
+        logger.info(f"Recalculated recommendations for all users: {stats}")
+        return stats
+    
+    async def _recalculate_block(
+        self,
+        users,
+        index: ScholarVectorIndex,
+        index_version: int,
+        top_k: int,
+        block_size: int,
+        timings: Dict[str, float]
+    ) -> Tuple[int, int, int]:
+        """
+        Vectors and recommendations for one page of users. Returns the number of
+        recommendations written, of users with interests and of users scored.
+        """
+        started = time.perf_counter()
+        interests_by_user = {user.user_id: self.user_service.get_user_interests(user) for user in users}
+        active_user_ids = [user_id for user_id, interests in interests_by_user.items() if interests]
+        
+        vectors = await self.embedding_service.run_in_executor(
+            self.embedding_service.generate_user_interest_vectors_batch,
+            [interests_by_user[user_id] for user_id in active_user_ids]
+        )
+        user_vectors = {user_id: None for user_id in interests_by_user}
+        user_vectors.update({user_id: vector for user_id, vector in zip(active_user_ids, vectors) if vector})
+        await self.user_repo.bulk_update_user_vectors(user_vectors)
+        timings["user_vectors"] += time.perf_counter() - started
+        
+        started = time.perf_counter()
+        scored_user_ids = [user_id for user_id in active_user_ids if user_vectors[user_id] is not None]
+        user_matrix = np.asarray([user_vectors[user_id] for user_id in scored_user_ids], dtype=np.float32).reshape(-1, index.dimensions)
+        loop = asyncio.get_running_loop()
+        nearest_by_row = await loop.run_in_executor(None, index.search_many, user_matrix, top_k, block_size)
+        timings["scoring"] += time.perf_counter() - started
+        
+        started = time.perf_counter()
+        scholar_ids = list({scholar_id for nearest in nearest_by_row for scholar_id, _ in nearest})
+        research_areas = {}
+        for i in range(0, len(scholar_ids), RESEARCH_AREAS_FETCH_CHUNK_SIZE):
+            research_areas.update(
+                await self.scholar_repo.get_research_areas_by_ids(scholar_ids[i:i + RESEARCH_AREAS_FETCH_CHUNK_SIZE])
             )
-            
-            if existing:
-
-                existing.similarity_score = rec["similarity_score"]
-                existing.explanation = rec["explanation"]
-                existing.is_dismissed = False
-
-                await self.recommendation_repo.session.commit()
-                await self.recommendation_repo.session.refresh(existing)
-            else:
-
-                await self.recommendation_repo.create_recommendation(
-                    user_id=user_id,
-                    scholar_id=rec["scholar_id"],
-                    similarity_score=rec["similarity_score"],
-                    explanation=rec["explanation"]
-                )
+        
+        await self._prepare_semantic_explanations(
+            [t for user_id in scored_user_ids for t in interests_by_user[user_id]]
+            + [area for research_areas_list in research_areas.values() for area in research_areas_list or []]
+        )
+        
+        recommendations_by_user = {user_id: [] for user_id in interests_by_user}
+        for user_id, nearest in zip(scored_user_ids, nearest_by_row):
+            recommendations_by_user[user_id] = self._build_recommendations(
+                interests_by_user[user_id],
+                [
+                    (scholar_id, research_areas[scholar_id], similarity)
+                    for scholar_id, similarity in nearest
+                    if scholar_id in research_areas
+                ]
+            )
+        written = await self.recommendation_repo.replace_for_users(recommendations_by_user)
+        await self.user_repo.set_recommendation_state(
+            {user_id: self.vector_hash(vector) for user_id, vector in user_vectors.items()},
+            index_version
+        )
+        timings["write"] += time.perf_counter() - started
+        return written, len(active_user_ids), len(scored_user_ids)
     
-    async def get_recommendations(self, user_id: UUID, skip: int = 0, limit: int = 20) -> List[Dict[str, Any]]:
-        recommendations = await self.recommendation_repo.get_by_user_id(
+    async def get_recommendations(self, user_id: UUID, skip: int = 0, limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """Return one page of the user's active recommendations and their total count."""
+        rows, total = await self.recommendation_repo.get_page_with_scholars(
             user_id=user_id,
             skip=skip,
             limit=limit,
             exclude_dismissed=True
         )
         
-        result = []
-        for rec in recommendations:
-            scholar = await self.scholar_repo.get(rec.scholar_id)
-            if scholar:
-                result.append({
-                    "rec_id": rec.rec_id,
-                    "scholar_id": rec.scholar_id,
-                    "scholar_name": scholar.full_name,
-                    "scholar_title": scholar.title,
-                    "scholar_institution": scholar.institution,
-                    "similarity_score": rec.similarity_score,
-                    "explanation": rec.explanation,
-                    "generated_at": rec.generated_at.isoformat() if rec.generated_at else None
-                })
-        
-        return result
+        result = [
+            {
+                "rec_id": row.rec_id,
+                "scholar_id": row.scholar_id,
+                "scholar_name": row.scholar_name,
+                "scholar_title": row.scholar_title,
+                "scholar_institution": row.scholar_institution,
+                "similarity_score": row.similarity_score,
+                "explanation": row.explanation,
+                "generated_at": row.generated_at.isoformat() if row.generated_at else None
+            }
+            for row in rows
+        ]
+        
+        return result, total
     
     async def dismiss_recommendation(self, rec_id: UUID, user_id: UUID) -> bool:
         recommendation = await self.recommendation_repo.dismiss_recommendation(rec_id, user_id)
@@ -0,0 +1,128 @@
+import base64
+import binascii
+import io
+import logging
+import os
+from functools import lru_cache
+from typing import Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Thumbnail widths that may be requested; anything else would let clients fill the disk cache.
+THUMBNAIL_SIZES = (64, 128, 256)
+
+MEDIA_TYPE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+
+
+def _sniff_media_type(data: bytes) -> str:
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data.startswith(b"GIF8"):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+def decode_image_data(image_data: str) -> Tuple[bytes, str]:
+    """
+    Raw bytes and media type of a stored image. The scraper stores the
+    profile photo's data: URL ("data:image/jpeg;base64,..."); bare base64
+    is accepted as well. Raises ValueError if it cannot be decoded.
+    """
+    media_type = None
+    payload = image_data.strip()
+    if payload.startswith("data:"):
+        header, _, payload = payload.partition(",")
+        media_type = header[5:].split(";")[0] or None
+    try:
+        data = base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError("Image data is not valid base64") from e
+    if not data:
+        raise ValueError("Image data is empty")
+    if media_type not in MEDIA_TYPE_EXTENSIONS:
+        media_type = _sniff_media_type(data)
+    return data, media_type
+
+
+def _resize(data: bytes, size: int) -> bytes:
+    """JPEG thumbnail at most size x size."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((size, size))
+        out = io.BytesIO()
+        image.convert("RGB").save(out, format="JPEG", quality=85, optimize=True)
+        return out.getvalue()
+
+
+class ScholarImageService:
+    """
+    Serves scholar photos as files. Each image is decoded from its stored
+    base64 once and written to the disk cache under its content hash
+    (scholar_image.image_hash), as are thumbnails, so later requests for the
+    same version never touch image_data. A changed photo gets a new hash,
+    hence a new file and a new URL; files of replaced photos are simply no
+    longer requested.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _path(self, image_hash: str, size: Optional[int], media_type: str) -> str:
+        if size:
+            return os.path.join(self.cache_dir, f"{image_hash}-{size}.jpg")
+        return os.path.join(self.cache_dir, f"{image_hash}.{MEDIA_TYPE_EXTENSIONS[media_type]}")
+
+    def find_cached(self, image_hash: str, size: Optional[int] = None) -> Optional[Tuple[str, str]]:
+        """(path, media type) of an already cached file for this image version."""
+        if size:
+            path = self._path(image_hash, size, "image/jpeg")
+            return (path, "image/jpeg") if os.path.exists(path) else None
+        for media_type in MEDIA_TYPE_EXTENSIONS:
+            path = self._path(image_hash, None, media_type)
+            if os.path.exists(path):
+                return path, media_type
+        return None
+
+    def _write(self, path: str, data: bytes):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _store(self, image_hash: str, image_data: str, size: Optional[int]) -> Tuple[str, str]:
+        data, media_type = decode_image_data(image_data)
+        path = self._path(image_hash, None, media_type)
+        if not os.path.exists(path):
+            self._write(path, data)
+        if size:
+            try:
+                thumbnail = _resize(data, size)
+            except Exception as e:
+                logger.error(f"Error resizing image {image_hash}: {str(e)}")
+                return path, media_type
+            thumb_path = self._path(image_hash, size, "image/jpeg")
+            self._write(thumb_path, thumbnail)
+            return thumb_path, "image/jpeg"
+        return path, media_type
+
+    async def store(self, image_hash: str, image_data: str, size: Optional[int] = None) -> Tuple[str, str]:
+        """
+        Decode, cache and return (path, media type). If the image cannot be
+        resized, the original is returned for a thumbnail request.
+        """
+        return await run_in_threadpool(self._store, image_hash, image_data, size)
+
+
+@lru_cache()
+def get_scholar_image_service() -> ScholarImageService:
+    return ScholarImageService(settings.scholar_image_cache_path)
@@ -0,0 +1,460 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from uuid import UUID
+import numpy as np
+from sqlalchemy import text
+from app.core.config import settings
+from app.services.embedding_service import EMBEDDING_DIMENSIONS
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+TITLE_LENGTH = 100
+# Versions kept on disk besides the current one; other workers may still map them.
+KEEP_PREVIOUS_VERSIONS = 1
+
+# Held for the duration of a snapshot build, so only one process builds at a time.
+SNAPSHOT_BUILD_LOCK_KEY = 7305142801
+SNAPSHOT_BUILD_LOCK_QUERY = text("SELECT pg_try_advisory_xact_lock(:key)")
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: str
+    vectors: np.ndarray
+    scholar_ids: np.ndarray
+    department_ids: np.ndarray
+    university_ids: np.ndarray
+    titles: np.ndarray
+    # scholar_vector_version_seq value read before the vectors were exported.
+    built_from: int = -1
+
+
+def _uuid_bytes(value: Optional[UUID]) -> bytes:
+    return value.bytes if value is not None else b""
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class ScholarVectorIndex:
+    """
+    Exact top-k cosine search over all scholar profile vectors, in process.
+
+    The snapshot is a directory of versioned files written by build_snapshot():
+    an L2-normalised float32 matrix (vectors-<version>.npy, memory-mapped on
+    load) plus scholar/department/university ids and titles used as filter
+    masks (meta-<version>.npz). CURRENT names the live version and is
+    replaced atomically, so readers never see a half-written snapshot and
+    every worker picks up a new one within reload_check_seconds.
+
+    A query is one matmul over the matrix plus argpartition for the top k.
+    """
+
+    def __init__(self, path: Optional[str], reload_check_seconds: float = 30.0):
+        self.path = path
+        self.reload_check_seconds = reload_check_seconds
+        self._snapshot: Optional[_Snapshot] = None
+        self._uuids: Optional[Tuple[_Snapshot, List[UUID]]] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> Optional[str]:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    @property
+    def built_from(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.built_from if snapshot is not None else -1
+
+    @property
+    def dimensions(self) -> int:
+        return EMBEDDING_DIMENSIONS
+
+    @property
+    def size(self) -> int:
+        snapshot = self._snapshot
+        return len(snapshot.scholar_ids) if snapshot is not None else 0
+
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.path, CURRENT_FILE), "r") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> bool:
+        """Load the current snapshot if it differs from the loaded one. Returns True if a new one was loaded."""
+        with self._lock:
+            self._last_check = time.monotonic()
+            version = self._current_version()
+            if version is None or version == self.version:
+                return False
+
+            vectors = np.load(os.path.join(self.path, f"vectors-{version}.npy"), mmap_mode="r")
+            with np.load(os.path.join(self.path, f"meta-{version}.npz")) as meta:
+                snapshot = _Snapshot(
+                    version=version,
+                    vectors=vectors,
+                    scholar_ids=meta["scholar_ids"],
+                    department_ids=meta["department_ids"],
+                    university_ids=meta["university_ids"],
+                    titles=meta["titles"],
+                    built_from=int(meta["built_from"]) if "built_from" in meta.files else -1,
+                )
+            # In-flight searches keep the snapshot they started with.
+            self._snapshot = snapshot
+            logger.info(f"Loaded scholar vector index {version} ({len(snapshot.scholar_ids)} scholars)")
+            return True
+
+    def maybe_reload(self):
+        if self.path is None or time.monotonic() - self._last_check < self.reload_check_seconds:
+            return
+        try:
+            self.load()
+        except Exception as e:
+            logger.error(f"Error reloading scholar vector index: {str(e)}")
+
+    async def amaybe_reload(self):
+        """maybe_reload() for the event loop: the snapshot I/O runs in the default executor."""
+        if self.path is None or time.monotonic() - self._last_check < self.reload_check_seconds:
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self.maybe_reload)
+
+    async def asearch(self, query_vector, top_k: int = 20, **filters) -> List[Tuple[UUID, float]]:
+        """search() in the default executor, so the N x d matmul does not block the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self.search, query_vector, top_k, **filters)
+        )
+
+    def search(
+        self,
+        query_vector,
+        top_k: int = 20,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None,
+        exclude_ids: Optional[List[UUID]] = None
+    ) -> List[Tuple[UUID, float]]:
+        """Return up to top_k (scholar_id, cosine similarity) pairs, best first."""
+        self.maybe_reload()
+        snapshot = self._snapshot
+        if snapshot is None or top_k <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        scores = snapshot.vectors @ (query / norm)
+
+        mask = self._filter_mask(snapshot, university_id, department_id, title, exclude_ids)
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            candidates = int(mask.sum())
+        else:
+            candidates = len(scores)
+
+        k = min(top_k, candidates)
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        # numpy strips trailing NUL bytes from S16 items, so pad them back.
+        return [
+            (uuid.UUID(bytes=bytes(snapshot.scholar_ids[i]).ljust(16, b"\x00")), float(scores[i]))
+            for i in top
+        ]
+
+    def search_many(self, query_vectors: np.ndarray, top_k: int = 20, block_size: int = 256) -> List[List[Tuple[UUID, float]]]:
+        """
+        Top-k for every row of query_vectors. Queries are scored block_size
+        rows at a time (one block x N matmul each), which bounds the score
+        matrix to block_size x N floats. Zero rows get an empty result.
+        """
+        self.maybe_reload()
+        snapshot = self._snapshot
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        if snapshot is None or top_k <= 0 or len(snapshot.scholar_ids) == 0:
+            return [[] for _ in range(len(queries))]
+
+        scholar_ids = self._scholar_uuids(snapshot)
+        k = min(top_k, len(scholar_ids))
+        results = []
+        for start in range(0, len(queries), block_size):
+            block = queries[start:start + block_size]
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            valid = norms[:, 0] > 0
+            scores = (block / np.where(norms == 0, 1.0, norms)) @ snapshot.vectors.T
+            top, top_scores = self._top_k_rows(scores, k)
+
+            for row in range(len(block)):
+                if not valid[row]:
+                    results.append([])
+                    continue
+                results.append([
+                    (scholar_ids[i], float(score))
+                    for i, score in zip(top[row], top_scores[row])
+                ])
+        return results
+
+    def neighbors_block(self, start: int, stop: int, top_k: int) -> List[Tuple[UUID, List[Tuple[UUID, float]]]]:
+        """
+        Top-k most similar other scholars for snapshot rows [start, stop), as
+        (scholar_id, [(neighbor_id, cosine similarity), ...]) best first. One
+        (stop - start) x N matmul; call it block by block to cover the snapshot.
+        Scholars with a zero vector and non-positive similarities are left out.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or top_k <= 0 or len(snapshot.scholar_ids) < 2:
+            return []
+
+        scholar_ids = self._scholar_uuids(snapshot)
+        block = np.asarray(snapshot.vectors[start:stop])
+        scores = block @ snapshot.vectors.T
+        rows = np.arange(len(block))
+        scores[rows, start + rows] = -np.inf
+        top, top_scores = self._top_k_rows(scores, min(top_k, len(scholar_ids) - 1))
+
+        results = []
+        for row in rows:
+            neighbors = [
+                (scholar_ids[i], float(score))
+                for i, score in zip(top[row], top_scores[row])
+                if score > 0
+            ]
+            if neighbors:
+                results.append((scholar_ids[start + row], neighbors))
+        return results
+
+    @staticmethod
+    def _top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Column indices and scores of the k highest scores in each row, best first."""
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def _scholar_uuids(self, snapshot: _Snapshot) -> List[UUID]:
+        """Snapshot scholar ids as UUIDs, converted once per snapshot."""
+        cached = self._uuids
+        if cached is not None and cached[0] is snapshot:
+            return cached[1]
+        # numpy strips trailing NUL bytes from S16 items, so pad them back.
+        scholar_ids = [uuid.UUID(bytes=bytes(b).ljust(16, b"\x00")) for b in snapshot.scholar_ids]
+        self._uuids = (snapshot, scholar_ids)
+        return scholar_ids
+
+    @staticmethod
+    def _filter_mask(
+        snapshot: _Snapshot,
+        university_id: Optional[UUID],
+        department_id: Optional[UUID],
+        title: Optional[str],
+        exclude_ids: Optional[List[UUID]]
+    ) -> Optional[np.ndarray]:
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        if university_id is not None:
+            mask = combine(mask, snapshot.university_ids == university_id.bytes)
+        if department_id is not None:
+            mask = combine(mask, snapshot.department_ids == department_id.bytes)
+        if title:
+            mask = combine(mask, snapshot.titles == title)
+        if exclude_ids:
+            excluded = np.array([scholar_id.bytes for scholar_id in exclude_ids], dtype="S16")
+            mask = combine(mask, ~np.isin(snapshot.scholar_ids, excluded))
+        return mask
+
+    @staticmethod
+    def _snapshot_arrays(rows: List[Tuple[UUID, Optional[UUID], Optional[UUID], Optional[str], np.ndarray]]) -> dict:
+        vectors = np.empty((len(rows), EMBEDDING_DIMENSIONS), dtype=np.float32)
+        for i, row in enumerate(rows):
+            vectors[i] = row[4]
+        return {
+            "vectors": _normalize_rows(vectors),
+            "scholar_ids": np.array([_uuid_bytes(row[0]) for row in rows], dtype="S16"),
+            "department_ids": np.array([_uuid_bytes(row[1]) for row in rows], dtype="S16"),
+            "university_ids": np.array([_uuid_bytes(row[2]) for row in rows], dtype="S16"),
+            "titles": np.array([(row[3] or "")[:TITLE_LENGTH] for row in rows], dtype=f"U{TITLE_LENGTH}"),
+        }
+
+    @classmethod
+    def from_rows(cls, rows: List[Tuple[UUID, Optional[UUID], Optional[UUID], Optional[str], np.ndarray]]) -> "ScholarVectorIndex":
+        """Build an index held only in memory, for one-off jobs that run without a snapshot."""
+        index = cls(path=None)
+        index._snapshot = _Snapshot(version="memory", **cls._snapshot_arrays(rows))
+        return index
+
+    def write_snapshot(self, rows: List[Tuple[UUID, Optional[UUID], Optional[UUID], Optional[str], np.ndarray]], built_from: int = -1) -> str:
+        """Write rows from ScholarRepository.iter_vector_index_rows() as a new snapshot version."""
+        os.makedirs(self.path, exist_ok=True)
+        version = str(time.time_ns())
+
+        arrays = self._snapshot_arrays(rows)
+        np.save(os.path.join(self.path, f"vectors-{version}.npy"), arrays.pop("vectors"))
+        np.savez(os.path.join(self.path, f"meta-{version}.npz"), built_from=np.int64(built_from), **arrays)
+
+        current_tmp = os.path.join(self.path, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(current_tmp, "w") as f:
+            f.write(version)
+        os.replace(current_tmp, os.path.join(self.path, CURRENT_FILE))
+
+        self._remove_old_versions(version)
+        return version
+
+    def _remove_old_versions(self, current_version: str):
+        versions = sorted(
+            {
+                name.split("-", 1)[1].rsplit(".", 1)[0]
+                for name in os.listdir(self.path)
+                if name.startswith(("vectors-", "meta-"))
+            },
+            key=int
+        )
+        for version in versions[:-(KEEP_PREVIOUS_VERSIONS + 1)]:
+            if version == current_version:
+                continue
+            for name in (f"vectors-{version}.npy", f"meta-{version}.npz"):
+                try:
+                    os.unlink(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    pass
+
+
+async def build_snapshot(session, index: Optional["ScholarVectorIndex"] = None, built_from: Optional[int] = None) -> Optional[str]:
+    """
+    Export every scholar vector from the database into a new snapshot and
+    load it into this process. Other workers pick it up on their next reload check.
+    """
+    from app.data_access.repositories.scholar_repository import ScholarRepository
+
+    index = index or get_scholar_vector_index()
+    scholar_repo = ScholarRepository(session)
+    if built_from is None:
+        # Read before the export: vector writes bump the sequence after they
+        # commit, so every write counted here is in the exported rows.
+        built_from = await scholar_repo.get_vector_version()
+    rows = []
+    async for batch in scholar_repo.iter_vector_index_rows():
+        rows.extend(batch)
+
+    loop = asyncio.get_running_loop()
+    version = await loop.run_in_executor(None, index.write_snapshot, rows, built_from)
+    await loop.run_in_executor(None, index.load)
+    logger.info(f"Built scholar vector index snapshot {version} with {len(rows)} scholars")
+    return version
+
+
+async def refresh_scholar_vector_index() -> bool:
+    """
+    Rebuild the snapshot if scholar vectors were written since it was built;
+    no-op unless the index is enabled. Builds are serialised across processes
+    by an advisory lock: if another process is building, this returns False
+    and the caller retries later. Returns True once the snapshot is current.
+    """
+    if not settings.scholar_vector_index_enabled:
+        return True
+    from app.data_access.database import AsyncSessionLocal
+    from app.data_access.repositories.scholar_repository import ScholarRepository
+
+    index = get_scholar_vector_index()
+    try:
+        async with AsyncSessionLocal() as session:
+            locked = (await session.execute(SNAPSHOT_BUILD_LOCK_QUERY, {"key": SNAPSHOT_BUILD_LOCK_KEY})).scalar()
+            if not locked:
+                return False
+            # Another process may have just written a newer snapshot.
+            await asyncio.get_running_loop().run_in_executor(None, index.load)
+            vector_version = await ScholarRepository(session).get_vector_version()
+            if index.is_loaded() and index.built_from >= vector_version:
+                return True
+            await build_snapshot(session, index, built_from=vector_version)
+            await session.commit()
+            return True
+    except Exception as e:
+        logger.error(f"Error rebuilding scholar vector index: {str(e)}")
+        return False
+
+
+class SnapshotRebuildScheduler:
+    """
+    Coalesces rebuild requests from vector writes. However many writes call
+    request(), at most one rebuild runs per min_interval_seconds in this
+    process, and the advisory lock in refresh_scholar_vector_index() keeps
+    other processes from building the same changes again; they only reload.
+    A rebuild that could not run (busy or failed) is retried after the interval.
+    """
+
+    def __init__(self, min_interval_seconds: float = 60.0):
+        self.min_interval_seconds = min_interval_seconds
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_run = float("-inf")
+
+    def request(self):
+        if not settings.scholar_vector_index_enabled or self._handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        delay = max(0.0, self._last_run + self.min_interval_seconds - time.monotonic())
+        self._handle = loop.call_later(delay, self._start)
+
+    def _start(self):
+        self._handle = None
+        if self._task is not None and not self._task.done():
+            # Still building; run again once it is done and the interval passed.
+            self._task.add_done_callback(lambda _: self.request())
+            return
+        self._last_run = time.monotonic()
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self):
+        if not await refresh_scholar_vector_index():
+            self.request()
+
+    async def stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+@lru_cache()
+def get_scholar_vector_index() -> ScholarVectorIndex:
+    return ScholarVectorIndex(
+        settings.scholar_vector_index_path,
+        reload_check_seconds=settings.scholar_vector_index_reload_seconds
+    )
+
+
+@lru_cache()
+def get_snapshot_rebuild_scheduler() -> SnapshotRebuildScheduler:
+    return SnapshotRebuildScheduler(settings.scholar_vector_index_rebuild_min_seconds)
@@ -1,10 +1,19 @@
-from typing import List, Optional
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
 from uuid import UUID
 import json
+from app.core.config import settings
 from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.data_access.repositories.scholar_neighbor_repository import ScholarNeighborRepository
 from app.services.embedding_service import EmbeddingService
+from app.services.scholar_vector_index import ScholarVectorIndex, get_scholar_vector_index, refresh_scholar_vector_index
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+logger = logging.getLogger(__name__)
+
 class ScholarVectorService:
     def __init__(
         self,
@@ -37,7 +46,7 @@ class ScholarVectorService:
         if not research_areas and not publication_titles:
             return None
         
-        vector = self.embedding_service.generate_scholar_profile_vector(
+        vector = await self.embedding_service.agenerate_scholar_profile_vector(
             research_areas=research_areas,
             publication_titles=publication_titles
         )
@@ -47,104 +56,232 @@ class ScholarVectorService:
         
         return vector
     
-    async def generate_vectors_for_all_scholars(self, batch_size: int = 100, force_regenerate: bool = False, encoding_batch_size: int = 32) -> dict:
+    @staticmethod
+    def build_profile_text(research_areas: List[str], publication_titles: List[str]) -> str:
+        return " ".join([t for t in research_areas + publication_titles if t and t.strip()])
+    
+    async def generate_vectors_for_scholars(self, scholar_ids: List[UUID], encoding_batch_size: int = 32, clear_dirty: bool = False) -> int:
         """
-        Optimized batch processing for vector generation.
-        - Loads scholars with publications in batch using eager loading
-        - Encodes all texts in a batch at once using model.encode()
-        - Updates vectors in bulk using bulk_update_scholar_vectors()
+        Regenerate profile vectors for the given scholars with one encode()
+        call and one bulk write. With clear_dirty=True their vector_dirty
+        flags are cleared in the write's transaction. Returns the number of
+        updated rows.
         """
-        from app.data_access.models import Scholar, Publication
-        from sqlalchemy.future import select
+        rows = await self.scholar_repo.get_scholar_vector_inputs(scholar_ids)
+        
+        texts_by_scholar = {}
+        for scholar_id, research_areas, publication_titles in rows:
+            combined_text = self.build_profile_text(research_areas, publication_titles)
+            if combined_text.strip():
+                texts_by_scholar[scholar_id] = combined_text
+        
+        if not texts_by_scholar:
+            if clear_dirty:
+                await self.scholar_repo.clear_vector_dirty(scholar_ids)
+            return 0
         
+        vectors = await self.embedding_service.run_in_executor(
+            self.embedding_service.generate_scholar_profile_vectors_batch,
+            list(texts_by_scholar.values()),
+            encoding_batch_size
+        )
+        
+        return await self.scholar_repo.bulk_update_scholar_vectors(
+            {
+                scholar_id: vector
+                for scholar_id, vector in zip(texts_by_scholar.keys(), vectors)
+                if vector
+            },
+            clear_dirty=scholar_ids if clear_dirty else None
+        )
+    
+    async def generate_vectors_for_all_scholars(
+        self,
+        batch_size: int = 100,
+        force_regenerate: bool = False,
+        encoding_batch_size: int = 32,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        queue_depth: int = 2
+    ) -> dict:
+        """
+        Pipelined batch processing for vector generation, in three stages:
+        - fetch: walks scholars in scholar_id keyset order, fetching only
+          (scholar_id, research_areas, publication titles) tuples per batch
+        - encode: runs model.encode() for a whole batch on the embedding executor
+        - write: updates vectors in bulk using bulk_update_scholar_vectors()
+          on a dedicated session
+        Batch N+1 is fetched while batch N encodes and batch N-1 is written.
+        The queues between stages hold at most queue_depth batches.
+        progress_callback, if given, receives a snapshot of the stats dict
+        after every written batch; otherwise progress is logged. The final
+        stats include per-stage throughput in scholars/sec.
+        """
         stats = {
+            "total": await self.scholar_repo.count_scholars_for_vectors(only_missing=not force_regenerate),
             "total_processed": 0,
             "successful": 0,
             "failed": 0,
             "skipped": 0
         }
+        stage_scholars = {"fetch": 0, "encode": 0, "write": 0}
+        stage_seconds = {"fetch": 0.0, "encode": 0.0, "write": 0.0}
         
-        if force_regenerate:
-            scholars = await self.scholar_repo.get_all_scholars()
-        else:
-            scholars = await self.scholar_repo.get_scholars_without_vectors()
-        
-        total = len(scholars)
-        stats["total_processed"] = total
+        encode_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_depth)
         
-        print(f"Processing {total} scholars in batches of {batch_size}...")
+        def report_progress():
+            if progress_callback:
+                progress_callback(dict(stats))
+            else:
+                logger.info(
+                    f"Processed {stats['total_processed']}/{stats['total']} scholars... "
+                    f"(Success: {stats['successful']}, Skipped: {stats['skipped']}, Failed: {stats['failed']})"
+                )
         
-        for i in range(0, total, batch_size):
-            batch_scholar_ids = [scholar.scholar_id for scholar in scholars[i:i + batch_size]]
-            
+        async def fetch_stage():
             try:
-
-                result = await self.scholar_repo.session.execute(
-                    select(Scholar)
-                    .options(selectinload(Scholar.publications))
-                    .filter(Scholar.scholar_id.in_(batch_scholar_ids))
+                batches = self.scholar_repo.iter_scholar_vector_inputs(
+                    batch_size=batch_size,
+                    only_missing=not force_regenerate
                 )
-                batch_scholars = result.scalars().unique().all()
-                
-
-                scholar_texts = []
-                scholar_id_map = {}
-                valid_scholars = []
-                
-                for scholar in batch_scholars:
-                    research_areas = scholar.research_areas or []
-                    publication_titles = []
+                started = time.perf_counter()
+                async for batch in batches:
+                    scholar_ids = []
+                    scholar_texts = []
                     
-                    if scholar.publications:
-                        publication_titles = [pub.title for pub in scholar.publications if pub.title]
+                    for scholar_id, research_areas, publication_titles in batch:
+                        combined_text = self.build_profile_text(research_areas, publication_titles)
+                        
+                        if not combined_text.strip():
+                            stats["skipped"] += 1
+                            continue
+                        
+                        scholar_ids.append(scholar_id)
+                        scholar_texts.append(combined_text)
                     
-                    if not research_areas and not publication_titles:
-                        stats["skipped"] += 1
+                    stats["total_processed"] += len(batch)
+                    stage_scholars["fetch"] += len(batch)
+                    stage_seconds["fetch"] += time.perf_counter() - started
+                    
+                    if scholar_texts:
+                        await encode_queue.put((scholar_ids, scholar_texts))
+                    started = time.perf_counter()
+            finally:
+                await encode_queue.put(None)
+        
+        async def encode_stage():
+            try:
+                while True:
+                    item = await encode_queue.get()
+                    if item is None:
+                        break
+                    scholar_ids, scholar_texts = item
+                    
+                    started = time.perf_counter()
+                    try:
+                        vectors = await self.embedding_service.run_in_executor(
+                            self.embedding_service.generate_scholar_profile_vectors_batch,
+                            scholar_texts,
+                            encoding_batch_size
+                        )
+                    except Exception as e:
+                        stats["failed"] += len(scholar_ids)
+                        logger.error(f"Error encoding batch starting at scholar {scholar_ids[0]}: {str(e)}")
                         continue
+                    finally:
+                        stage_seconds["encode"] += time.perf_counter() - started
+                    stage_scholars["encode"] += len(scholar_ids)
                     
-
-                    combined_text = " ".join([t for t in research_areas + publication_titles if t and t.strip()])
+                    await write_queue.put({
+                        scholar_id: vector
+                        for scholar_id, vector in zip(scholar_ids, vectors)
+                        if vector
+                    })
+            finally:
+                await write_queue.put(None)
+        
+        async def write_stage():
+            async with AsyncSession(self.scholar_repo.session.bind, expire_on_commit=False) as write_session:
+                write_repo = ScholarRepository(write_session)
+                while True:
+                    scholar_vector_map = await write_queue.get()
+                    if scholar_vector_map is None:
+                        break
+                    if not scholar_vector_map:
+                        continue
                     
-                    if combined_text.strip():
-                        scholar_texts.append(combined_text)
-                        scholar_id_map[len(scholar_texts) - 1] = scholar.scholar_id
-                        valid_scholars.append(scholar)
-                
-                if not scholar_texts:
-                    continue
-                
-
-                vectors = self.embedding_service.generate_scholar_profile_vectors_batch(
-                    scholar_texts,
-                    batch_size=encoding_batch_size
-                )
-                
-
-                scholar_vector_map = {}
-                for idx, vector in enumerate(vectors):
-                    if vector and idx in scholar_id_map:
-                        scholar_id = scholar_id_map[idx]
-                        scholar_vector_map[scholar_id] = vector
-                
-
-                if scholar_vector_map:
-                    updated_count = await self.scholar_repo.bulk_update_scholar_vectors(scholar_vector_map)
-                    stats["successful"] += updated_count
-                
-
-                processed_so_far = min(i + batch_size, total)
-                if processed_so_far % 100 == 0 or processed_so_far == total:
-                    print(f"Processed {processed_so_far}/{total} scholars... (Success: {stats['successful']}, Skipped: {stats['skipped']}, Failed: {stats['failed']})")
+                    started = time.perf_counter()
+                    try:
+                        updated_count = await write_repo.bulk_update_scholar_vectors(scholar_vector_map)
+                        stats["successful"] += updated_count
+                        stage_scholars["write"] += len(scholar_vector_map)
+                    except Exception as e:
+                        stats["failed"] += len(scholar_vector_map)
+                        logger.error(f"Error writing batch starting at scholar {next(iter(scholar_vector_map))}: {str(e)}")
+                    finally:
+                        stage_seconds["write"] += time.perf_counter() - started
                     
-            except Exception as e:
-                stats["failed"] += len(batch_scholar_ids)
-                print(f"Error processing batch starting at index {i}: {str(e)}")
-
-                try:
-                    await self.scholar_repo.session.rollback()
-                except:
-                    pass
-                continue
+                    report_progress()
+        
+        await asyncio.gather(fetch_stage(), encode_stage(), write_stage())
+        
+        stats["throughput"] = {
+            stage: round(stage_scholars[stage] / stage_seconds[stage], 1) if stage_seconds[stage] > 0 else None
+            for stage in stage_scholars
+        }
+        logger.info(f"Vector generation throughput (scholars/sec): {stats['throughput']}")
+        
+        if stats["successful"]:
+            await refresh_scholar_vector_index()
         
         return stats
-
+    
+    async def compute_similar_scholars(
+        self,
+        top_k: Optional[int] = None,
+        block_size: int = 512,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> dict:
+        """
+        Rebuild the scholar_neighbor table: the top_k most similar scholars
+        of every scholar with a profile vector. Uses the loaded vector index
+        snapshot, or builds one in memory from the database, and scores
+        block_size scholars at a time (one block x N matmul on a worker
+        thread) so the score matrix stays bounded. Each block is upserted as
+        it completes; rows of scholars that no longer have a vector are
+        deleted at the end.
+        """
+        top_k = top_k or settings.similar_scholars_top_k
+        started = time.perf_counter()
+        
+        index = get_scholar_vector_index() if settings.scholar_vector_index_enabled else None
+        if index is not None:
+            await index.amaybe_reload()
+        if index is None or not index.is_loaded():
+            rows = []
+            async for batch in self.scholar_repo.iter_vector_index_rows():
+                rows.extend(batch)
+            index = ScholarVectorIndex.from_rows(rows)
+        
+        neighbor_repo = ScholarNeighborRepository(self.scholar_repo.session)
+        computed_since = await neighbor_repo.get_database_time()
+        stats = {"total": index.size, "processed": 0, "written": 0}
+        loop = asyncio.get_running_loop()
+        for start in range(0, index.size, block_size):
+            neighbors = await loop.run_in_executor(None, index.neighbors_block, start, start + block_size, top_k)
+            stats["written"] += await neighbor_repo.upsert_neighbors([
+                (
+                    scholar_id,
+                    [neighbor_id for neighbor_id, _ in scholar_neighbors],
+                    [similarity for _, similarity in scholar_neighbors]
+                )
+                for scholar_id, scholar_neighbors in neighbors
+            ])
+            stats["processed"] = min(start + block_size, index.size)
+            if progress_callback:
+                progress_callback(dict(stats))
+        
+        stats["deleted"] = await neighbor_repo.delete_computed_before(computed_since)
+        stats["seconds"] = round(time.perf_counter() - started, 2)
+        logger.info(f"Computed similar scholars: {stats}")
+        return stats
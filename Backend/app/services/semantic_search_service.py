@@ -0,0 +1,128 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from app.core.config import settings
+from app.data_access.models import Scholar
+from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.services.embedding_service import EmbeddingService
+from app.services.scholar_vector_index import ScholarVectorIndex, get_scholar_vector_index
+
+# Reciprocal-rank fusion constant; 60 is the value from the original RRF paper.
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(*rankings: List[UUID], k: int = RRF_K) -> List[Tuple[UUID, float]]:
+    """Fuse ranked id lists by summing 1 / (k + rank); best first."""
+    scores: Dict[UUID, float] = {}
+    for ranking in rankings:
+        for rank, scholar_id in enumerate(ranking, start=1):
+            scores[scholar_id] = scores.get(scholar_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class SemanticSearchService:
+    def __init__(
+        self,
+        scholar_repo: ScholarRepository,
+        embedding_service: EmbeddingService,
+        scholar_vector_index: Optional[ScholarVectorIndex] = None
+    ):
+        self.scholar_repo = scholar_repo
+        self.embedding_service = embedding_service
+        if scholar_vector_index is None and settings.scholar_vector_index_enabled:
+            scholar_vector_index = get_scholar_vector_index()
+        self.scholar_vector_index = scholar_vector_index
+
+    async def search_scholars(
+        self,
+        query: str,
+        top_k: int = 20,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None
+    ) -> List[Tuple[Scholar, float]]:
+        """
+        Embed the query once and return up to top_k (scholar, cosine similarity)
+        pairs, best first. Filters are applied inside the vector search.
+        """
+        query_vector = (await self.embedding_service.aencode([query]))[0]
+        if query_vector is None:
+            return []
+
+        nearest = await self.find_nearest(query_vector, top_k, university_id, department_id, title)
+        scores = dict(nearest)
+        scholars = await self.scholar_repo.get_scholars_for_listing(list(scores.keys()))
+        return [(scholar, scores[scholar.scholar_id]) for scholar in scholars]
+
+    async def hybrid_search(
+        self,
+        query: str,
+        candidates: Optional[int] = None,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None,
+        **list_filters
+    ) -> List[Tuple[UUID, float]]:
+        """
+        Rank scholars for a free-text query by fusing two retrievers with
+        reciprocal-rank fusion: trigram word similarity on name and research
+        areas (exact and partial name matches) and vector cosine similarity
+        (topical matches). Each retriever returns its top `candidates` from
+        its index. Returns (scholar_id, fused score), best first.
+        All filters, including the list_scholars() filters in list_filters,
+        are applied inside both retrievers, so every fused candidate matches.
+        """
+        candidates = candidates or settings.hybrid_search_candidates
+        # The query is embedded on the embedding executor while the lexical query runs.
+        lexical, query_vectors = await asyncio.gather(
+            self.scholar_repo.find_lexical_matches(
+                query,
+                limit=candidates,
+                university_id=university_id,
+                department_id=department_id,
+                title=title,
+                **list_filters
+            ),
+            self.embedding_service.aencode([query])
+        )
+
+        semantic = []
+        if query_vectors[0] is not None:
+            semantic = await self.find_nearest(query_vectors[0], candidates, university_id, department_id, title, **list_filters)
+
+        return reciprocal_rank_fusion(
+            [scholar_id for scholar_id, _ in lexical],
+            [scholar_id for scholar_id, _ in semantic]
+        )
+
+    async def find_nearest(
+        self,
+        query_vector,
+        top_k: int,
+        university_id: Optional[UUID] = None,
+        department_id: Optional[UUID] = None,
+        title: Optional[str] = None,
+        **list_filters
+    ) -> List[Tuple[UUID, float]]:
+        index = self.scholar_vector_index
+        # The snapshot only carries university, department and title.
+        if index is not None and not any(value is not None for value in list_filters.values()):
+            await index.amaybe_reload()
+            if index.is_loaded():
+                return await index.asearch(
+                    query_vector,
+                    top_k=top_k,
+                    university_id=university_id,
+                    department_id=department_id,
+                    title=title
+                )
+
+        nearest = await self.scholar_repo.find_nearest_scholars(
+            query_vector,
+            top_k=top_k,
+            university_id=university_id,
+            department_id=department_id,
+            title=title,
+            **list_filters
+        )
+        return [(scholar_id, similarity) for scholar_id, _, similarity in nearest]
@@ -4,12 +4,12 @@ import json
 from app.data_access.repositories.user_repository import UserRepository
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash, verify_password
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import EmbeddingService, get_embedding_service
 
 class UserService:
     def __init__(self, user_repo: UserRepository, embedding_service: Optional[EmbeddingService] = None):
         self.user_repo = user_repo
-        self.embedding_service = embedding_service or EmbeddingService()
+        self.embedding_service = embedding_service or get_embedding_service()
 
     async def create_user(self, user_in: UserCreate):
         existing_user = await self.user_repo.get_by_email(user_in.email)
@@ -131,7 +131,7 @@ class UserService:
         updated_user = await self.user_repo.update(user_id, research_interests=interests_json)
         
         if updated_user and normalized_interests:
-            user_vector = self.embedding_service.generate_embedding_from_list(normalized_interests)
+            user_vector = await self.embedding_service.agenerate_user_interest_vector(normalized_interests)
             if user_vector:
                 await self.user_repo.update_user_vector(user_id, user_vector)
         
@@ -190,7 +190,7 @@ class UserService:
         updated_user = await self.user_repo.update(user_id, research_interests=interests_json)
         
         if updated_user:
-            user_vector = self.embedding_service.generate_embedding_from_list(updated_interests)
+            user_vector = await self.embedding_service.agenerate_user_interest_vector(updated_interests)
             if user_vector:
                 await self.user_repo.update_user_vector(user_id, user_vector)
         
@@ -229,7 +229,7 @@ class UserService:
         
         if updated_user:
             if updated_interests:
-                user_vector = self.embedding_service.generate_embedding_from_list(updated_interests)
+                user_vector = await self.embedding_service.agenerate_user_interest_vector(updated_interests)
                 if user_vector:
                     await self.user_repo.update_user_vector(user_id, user_vector)
             else:
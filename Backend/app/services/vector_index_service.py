@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from app.core.config import settings
+from app.data_access.repositories.scholar_repository import ScholarRepository
+
+logger = logging.getLogger(__name__)
+
+# HNSW indexes on profile vectors, keyed by index name.
+VECTOR_INDEXES = {
+    "ix_scholar_profile_vector_hnsw": "scholar",
+    "ix_user_profile_vector_hnsw": "user",
+}
+
+SAMPLE_QUERY_VECTORS_QUERY = text("""
+    SELECT profile_vector FROM scholar
+    WHERE profile_vector IS NOT NULL
+    ORDER BY random()
+    LIMIT :sample_size
+""")
+
+
+def hnsw_index_ddl(index_name: str, table: str, concurrently: bool = False) -> str:
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index_name} "
+        f"ON \"{table}\" USING hnsw (profile_vector vector_cosine_ops) "
+        f"WITH (m = {int(settings.vector_index_m)}, ef_construction = {int(settings.vector_index_ef_construction)})"
+    )
+
+
+# Session-level lock held while a process creates or rebuilds the HNSW indexes,
+# so workers do not run the same concurrent build side by side.
+VECTOR_INDEX_BUILD_LOCK_KEY = 7305142802
+
+INVALID_INDEXES_QUERY = """
+    SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid AND c.relname = ANY($1::text[])
+"""
+
+
+async def _autocommit_driver(conn):
+    """
+    asyncpg connection of an AUTOCOMMIT SQLAlchemy connection. CONCURRENTLY
+    cannot run inside a transaction block, so these statements go through
+    the driver directly (simple query protocol).
+    """
+    conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+async def ensure_vector_indexes(engine: AsyncEngine):
+    """
+    Create missing HNSW indexes, concurrently so writes are not blocked while
+    a large table is indexed. Existing indexes keep their build parameters.
+    Only the process holding the build lock does this; the others return at
+    once. An index left INVALID by an interrupted build is reported rather
+    than dropped; rebuild it through the admin endpoint.
+    """
+    async with engine.connect() as conn:
+        driver = await _autocommit_driver(conn)
+        if not await driver.fetchval("SELECT pg_try_advisory_lock($1)", VECTOR_INDEX_BUILD_LOCK_KEY):
+            return
+        try:
+            for index_name, table in VECTOR_INDEXES.items():
+                await driver.execute(hnsw_index_ddl(index_name, table, concurrently=True))
+            for row in await driver.fetch(INVALID_INDEXES_QUERY, list(VECTOR_INDEXES)):
+                logger.warning(f"Vector index {row['relname']} is INVALID; rebuild it with POST /admin/vector-index/rebuild")
+        finally:
+            await driver.execute("SELECT pg_advisory_unlock($1)", VECTOR_INDEX_BUILD_LOCK_KEY)
+
+
+def _log_vector_index_check(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Error creating vector indexes: {str(task.exception())}")
+
+
+def start_vector_index_check(engine: AsyncEngine) -> asyncio.Task:
+    """
+    Run ensure_vector_indexes() in the background, so a worker does not wait
+    for an HNSW build before serving. Keep the task to cancel it on shutdown.
+    """
+    task = asyncio.ensure_future(ensure_vector_indexes(engine))
+    task.add_done_callback(_log_vector_index_check)
+    return task
+
+
+class VectorIndexService:
+    """
+    Maintenance for the pgvector HNSW indexes: concurrent rebuilds (to apply
+    new m / ef_construction values or compact after heavy churn) and a
+    recall/latency comparison of the index scan against exact search.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    async def rebuild_index(self, index_name: str) -> Dict[str, Any]:
+        """
+        Build a replacement index concurrently, then swap it in. Reads and
+        writes keep running against the old index during the build, and the
+        two renames of the swap commit together, so there is always an index
+        under index_name; the old one is dropped afterwards.
+        """
+        table = VECTOR_INDEXES[index_name]
+        temp_name = f"{index_name}_rebuild"
+        old_name = f"{index_name}_old"
+        start = time.perf_counter()
+
+        async with self.engine.connect() as conn:
+            driver = await _autocommit_driver(conn)
+            # Waits for a startup index check or another rebuild to finish.
+            await driver.execute("SELECT pg_advisory_lock($1)", VECTOR_INDEX_BUILD_LOCK_KEY)
+            try:
+                # A failed concurrent build leaves an INVALID index behind, and an
+                # interrupted swap an old one.
+                await driver.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {temp_name}")
+                await driver.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+                await driver.execute(hnsw_index_ddl(temp_name, table, concurrently=True))
+                async with driver.transaction():
+                    await driver.execute(f"ALTER INDEX IF EXISTS {index_name} RENAME TO {old_name}")
+                    await driver.execute(f"ALTER INDEX {temp_name} RENAME TO {index_name}")
+                await driver.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+            finally:
+                await driver.execute("SELECT pg_advisory_unlock($1)", VECTOR_INDEX_BUILD_LOCK_KEY)
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Rebuilt vector index {index_name} in {elapsed:.1f}s")
+        return {
+            "index": index_name,
+            "m": settings.vector_index_m,
+            "ef_construction": settings.vector_index_ef_construction,
+            "seconds": round(elapsed, 2),
+        }
+
+    async def rebuild_all(self) -> List[Dict[str, Any]]:
+        results = []
+        for index_name in VECTOR_INDEXES:
+            try:
+                results.append(await self.rebuild_index(index_name))
+            except Exception as e:
+                logger.error(f"Error rebuilding vector index {index_name}: {str(e)}")
+                results.append({"index": index_name, "error": str(e)})
+        return results
+
+    async def check_recall(self, sample_size: int = 50, top_k: int = 20, ef_search: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run sample_size kNN queries (random scholar vectors as queries) through
+        the HNSW index and through an exact scan, and report recall@top_k and
+        per-query latency for both.
+        """
+        ef_search = ef_search or settings.vector_index_ef_search
+
+        async with AsyncSession(self.engine) as session:
+            result = await session.execute(SAMPLE_QUERY_VECTORS_QUERY, {"sample_size": sample_size})
+            query_vectors = [row[0] for row in result.fetchall()]
+
+        if not query_vectors:
+            return {"message": "No scholar vectors to sample"}
+
+        recalls = []
+        index_latencies = []
+        exact_latencies = []
+        async with AsyncSession(self.engine) as session:
+            scholar_repo = ScholarRepository(session)
+            for query_vector in query_vectors:
+                start = time.perf_counter()
+                approximate = await scholar_repo.find_nearest_scholars(query_vector, top_k=top_k, ef_search=ef_search)
+                index_latencies.append(time.perf_counter() - start)
+                await session.rollback()
+
+                start = time.perf_counter()
+                exact = await scholar_repo.find_nearest_scholars(query_vector, top_k=top_k, exact=True)
+                exact_latencies.append(time.perf_counter() - start)
+                await session.rollback()
+
+                expected = {row[0] for row in exact}
+                if expected:
+                    found = {row[0] for row in approximate}
+                    recalls.append(len(found & expected) / len(expected))
+
+        return {
+            "queries": len(query_vectors),
+            "top_k": top_k,
+            "ef_search": max(ef_search, top_k),
+            "recall": round(float(np.mean(recalls)), 4) if recalls else None,
+            "min_recall": round(float(np.min(recalls)), 4) if recalls else None,
+            "index_latency_ms": self._latency_summary(index_latencies),
+            "exact_latency_ms": self._latency_summary(exact_latencies),
+        }
+
+    @staticmethod
+    def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+        millis = np.asarray(latencies) * 1000
+        return {
+            "mean": round(float(millis.mean()), 2),
+            "p50": round(float(np.percentile(millis, 50)), 2),
+            "p95": round(float(np.percentile(millis, 95)), 2),
+        }
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VectorRefreshQueue:
+    """
+    Background drainer for scholars whose profile vectors are stale.
+
+    Writes set ``scholar.vector_dirty`` in the same transaction as the change
+    and call notify(). The drainer wakes up after a short debounce (or every
+    poll_interval_seconds), claims dirty scholars in batches and re-embeds
+    each batch with one encode() call, so repeated edits to the same scholar
+    coalesce into a single regeneration. Claiming locks rows with SKIP
+    LOCKED, so one drainer per worker process is safe, and a flag is only
+    cleared when the new vector commits, so a crash mid-batch loses nothing.
+    """
+
+    def __init__(self, delay_seconds: float = 2.0, poll_interval_seconds: float = 60.0, batch_size: int = 256):
+        self.delay_seconds = delay_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self._wake: Optional[asyncio.Event] = None
+        self._wake_handle: Optional[asyncio.TimerHandle] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def notify(self):
+        """Schedule a drain after the debounce delay; no-op without a running drainer."""
+        if self._wake is None or self._wake_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._wake_handle = loop.call_later(self.delay_seconds, self._set_wake)
+
+    def _set_wake(self):
+        self._wake_handle = None
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.drain()
+
+    async def drain(self) -> int:
+        """Re-embed dirty scholars until none are left. Returns the number of updated rows."""
+        total_updated = await self._drain_batches()
+        if total_updated:
+            from app.services.scholar_vector_index import get_snapshot_rebuild_scheduler
+            get_snapshot_rebuild_scheduler().request()
+        return total_updated
+
+    async def _drain_batches(self) -> int:
+        from app.data_access.database import AsyncSessionLocal
+        from app.data_access.repositories.scholar_repository import ScholarRepository
+        from app.services.embedding_service import get_embedding_service
+        from app.services.scholar_vector_service import ScholarVectorService
+
+        total_updated = 0
+        while True:
+            async with AsyncSessionLocal() as session:
+                scholar_repo = ScholarRepository(session)
+                try:
+                    batch = await scholar_repo.claim_dirty_scholars(self.batch_size)
+                except Exception as e:
+                    logger.error(f"Error claiming dirty scholars: {str(e)}")
+                    return total_updated
+                if not batch:
+                    return total_updated
+
+                try:
+                    vector_service = ScholarVectorService(scholar_repo, get_embedding_service())
+                    updated_count = await vector_service.generate_vectors_for_scholars(batch, clear_dirty=True)
+                    total_updated += updated_count
+                    logger.info(f"Regenerated profile vectors for {updated_count}/{len(batch)} dirty scholars")
+                except Exception as e:
+                    logger.error(f"Error regenerating vectors for {len(batch)} dirty scholars: {str(e)}")
+                    # The rollback releases the claim with the flags still set; they
+                    # are retried on the next wake-up rather than in a tight loop.
+                    await session.rollback()
+                    return total_updated
+
+
+@lru_cache()
+def get_vector_refresh_queue() -> VectorRefreshQueue:
+    return VectorRefreshQueue()
@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import os
+import random
+import time
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.future import select
+from app.data_access.database import AsyncSessionLocal
+from app.data_access.models import Scholar
+from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.services.embedding_service import get_embedding_service
+from app.services.semantic_search_service import SemanticSearchService
+
+
+def summarize(name, timings):
+    if not timings:
+        print(f"{name:<10} no queries measured")
+        return
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{name:<10} mean {statistics.mean(timings) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  ({len(timings)} queries)")
+
+
+async def main():
+    query_count = 100
+    if "--queries" in sys.argv:
+        try:
+            idx = sys.argv.index("--queries")
+            query_count = int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print("Invalid queries argument, using default: 100")
+    
+    print(f"Benchmarking hybrid scholar search with {query_count} queries...")
+    print("-" * 50)
+    
+    async with AsyncSessionLocal() as session:
+        scholar_repo = ScholarRepository(session)
+        search_service = SemanticSearchService(scholar_repo, get_embedding_service())
+        
+        # Half research-area queries, half (partial) scholar names.
+        areas = await scholar_repo.get_unique_research_areas()
+        result = await session.execute(select(Scholar.full_name).order_by(Scholar.scholar_id).limit(5000))
+        names = [name for name in result.scalars().all() if name]
+        rng = random.Random(0)
+        queries = rng.sample(areas, min(len(areas), query_count // 2))
+        queries += [" ".join(name.split()[-1:]) for name in rng.sample(names, min(len(names), query_count - len(queries)))]
+        
+        # Warm the embedding cache and connection.
+        if queries:
+            await search_service.hybrid_search(queries[0])
+        
+        timings = {"lexical": [], "vector": [], "hybrid": []}
+        for query in queries:
+            start = time.perf_counter()
+            await scholar_repo.find_lexical_matches(query)
+            timings["lexical"].append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            query_vector = (await search_service.embedding_service.aencode([query]))[0]
+            await search_service.find_nearest(query_vector, 100)
+            timings["vector"].append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            await search_service.hybrid_search(query)
+            timings["hybrid"].append(time.perf_counter() - start)
+            await session.rollback()
+        
+        for name, values in timings.items():
+            summarize(name, values)
+
+if __name__ == "__main__":
+    asyncio.run(main())
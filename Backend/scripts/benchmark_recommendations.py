@@ -0,0 +1,132 @@
+import asyncio
+import sys
+import os
+import time
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy.future import select
+from app.data_access.database import AsyncSessionLocal
+from app.data_access.models import Recommendation, User
+from app.data_access.repositories.user_repository import UserRepository
+from app.data_access.repositories.recommendation_repository import RecommendationRepository
+from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.services.embedding_service import get_embedding_service
+from app.services.user_service import UserService
+from app.services.recommendation_service import RecommendationService
+
+
+async def legacy_persist(recommendation_repo: RecommendationRepository, user_id, recommendations):
+    """The previous per-row persistence: row-by-row delete, then lookup + commit per recommendation."""
+    result = await recommendation_repo.session.execute(
+        select(Recommendation).filter(Recommendation.user_id == user_id)
+    )
+    for rec in result.scalars().all():
+        await recommendation_repo.session.delete(rec)
+    await recommendation_repo.session.commit()
+    
+    for rec in recommendations:
+        existing = await recommendation_repo.get_existing_recommendation(user_id, rec["scholar_id"])
+        if existing:
+            existing.similarity_score = rec["similarity_score"]
+            existing.explanation = rec["explanation"]
+            existing.is_dismissed = False
+            await recommendation_repo.session.commit()
+            await recommendation_repo.session.refresh(existing)
+        else:
+            await recommendation_repo.create_recommendation(
+                user_id=user_id,
+                scholar_id=rec["scholar_id"],
+                similarity_score=rec["similarity_score"],
+                explanation=rec["explanation"]
+            )
+
+
+def summarize(name, timings):
+    if not timings:
+        print(f"{name:<10} no users measured")
+        return
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{name:<10} mean {statistics.mean(timings) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  ({len(timings)} users)")
+
+
+async def main():
+    user_limit = 50
+    if "--users" in sys.argv:
+        try:
+            idx = sys.argv.index("--users")
+            user_limit = int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print("Invalid users argument, using default: 50")
+    
+    print(f"Benchmarking recommendation persistence for up to {user_limit} users...")
+    print("-" * 50)
+    
+    async with AsyncSessionLocal() as session:
+        user_repo = UserRepository(session)
+        recommendation_repo = RecommendationRepository(session)
+        embedding_service = get_embedding_service()
+        user_service = UserService(user_repo, embedding_service)
+        recommendation_service = RecommendationService(
+            recommendation_repo,
+            ScholarRepository(session),
+            user_repo,
+            embedding_service,
+            user_service
+        )
+        
+        result = await session.execute(
+            select(User).filter(User.research_interests.isnot(None)).limit(user_limit)
+        )
+        users = result.scalars().all()
+        
+        legacy_timings = []
+        set_based_timings = []
+        for user in users:
+            start = time.perf_counter()
+            await recommendation_service.recalculate_recommendations(user.user_id)
+            set_based_timings.append(time.perf_counter() - start)
+            
+            current = await recommendation_repo.get_by_user_id(user.user_id, exclude_dismissed=False)
+            recommendations = [
+                {
+                    "scholar_id": rec.scholar_id,
+                    "similarity_score": rec.similarity_score,
+                    "explanation": rec.explanation
+                }
+                for rec in current
+            ]
+            if not recommendations:
+                continue
+            
+            start = time.perf_counter()
+            await legacy_persist(recommendation_repo, user.user_id, recommendations)
+            legacy_timings.append(time.perf_counter() - start)
+        
+        print("Full recalculation (kNN + set-based upsert):")
+        summarize("set-based", set_based_timings)
+        print("Persistence only:")
+        summarize("legacy", legacy_timings)
+        
+        set_based_persist = []
+        for user in users:
+            current = await recommendation_repo.get_by_user_id(user.user_id, exclude_dismissed=False)
+            recommendations = [
+                {
+                    "scholar_id": rec.scholar_id,
+                    "similarity_score": rec.similarity_score,
+                    "explanation": rec.explanation
+                }
+                for rec in current
+            ]
+            if not recommendations:
+                continue
+            start = time.perf_counter()
+            await recommendation_repo.replace_for_user(user.user_id, recommendations)
+            set_based_persist.append(time.perf_counter() - start)
+        summarize("set-based", set_based_persist)
+
+if __name__ == "__main__":
+    asyncio.run(main())
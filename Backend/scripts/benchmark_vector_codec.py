@@ -0,0 +1,100 @@
+import asyncio
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from pgvector import Vector as PgVector
+
+DIMENSIONS = 384
+
+
+def text_encode(vector):
+    return '[' + ','.join(str(float(v)) for v in vector) + ']'
+
+
+def text_decode(value):
+    value = value.strip('[]')
+    return [float(x) for x in value.split(',') if x.strip()]
+
+
+def binary_encode(vector):
+    return PgVector(vector).to_binary()
+
+
+def binary_decode(value):
+    return np.asarray(PgVector.from_binary(value).to_numpy(), dtype=np.float32)
+
+
+def time_codec(name, encode, decode, vectors):
+    start = time.perf_counter()
+    encoded = [encode(v) for v in vectors]
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for value in encoded:
+        decode(value)
+    decode_seconds = time.perf_counter() - start
+
+    payload_bytes = sum(len(value) for value in encoded)
+    print(
+        f"{name:<8} encode {encode_seconds:8.3f}s  decode {decode_seconds:8.3f}s  "
+        f"payload {payload_bytes / 1024 / 1024:8.1f} MB"
+    )
+
+
+async def time_database_round_trip(rows: int):
+    """Read the same rows back through the text cast and the binary codec."""
+    from sqlalchemy import text
+    from app.data_access.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(text(f"CREATE TEMP TABLE bench_vector (id int, v vector({DIMENSIONS}))"))
+        await session.execute(text(f"""
+            INSERT INTO bench_vector
+            SELECT i, ARRAY(SELECT random() FROM generate_series(1, {DIMENSIONS}))::real[]::vector
+            FROM generate_series(1, :rows) AS i
+        """), {"rows": rows})
+
+        start = time.perf_counter()
+        result = await session.execute(text("SELECT v::text FROM bench_vector"))
+        for row in result:
+            text_decode(row[0])
+        text_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = await session.execute(text("SELECT v FROM bench_vector"))
+        for row in result:
+            np.asarray(row[0], dtype=np.float32)
+        binary_seconds = time.perf_counter() - start
+
+        await session.rollback()
+
+    print(f"text     round trip {text_seconds:8.3f}s")
+    print(f"binary   round trip {binary_seconds:8.3f}s")
+
+
+async def main():
+    rows = 50000
+    if "--rows" in sys.argv:
+        try:
+            idx = sys.argv.index("--rows")
+            rows = int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print("Invalid rows argument, using default: 50000")
+
+    print(f"Benchmarking vector codecs for {rows} rows of {DIMENSIONS} dimensions...")
+    print("-" * 50)
+
+    vectors = np.random.default_rng(0).standard_normal((rows, DIMENSIONS)).astype(np.float32)
+    time_codec("text", lambda v: text_encode(v.tolist()), text_decode, vectors)
+    time_codec("binary", binary_encode, binary_decode, vectors)
+
+    if "--database" in sys.argv:
+        print("-" * 50)
+        await time_database_round_trip(rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+from app.data_access.database import AsyncSessionLocal
+from app.data_access.repositories.scholar_repository import ScholarRepository, explain_query
+
+# (description, list_scholars filters, index the filter must be able to use)
+CASES = [
+    # search matches names or research areas, so both indexes must be scanned.
+    ("search (name)", {"search": "makine öğrenmesi"}, "ix_scholar_full_name_trgm"),
+    ("search (research areas)", {"search": "makine öğrenmesi"}, "ix_scholar_research_areas_trgm"),
+    ("interests", {"interests": ["yapay zeka", "robot"]}, "ix_scholar_research_areas_trgm"),
+    ("institution", {"institution": "teknik üniversite"}, "ix_scholar_institution_trgm"),
+    ("field", {"field": "Bilgisayar Mühendisliği"}, "ix_scholar_research_areas_gin"),
+]
+
+
+def index_names(plan: dict) -> set:
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+async def explain(session, query, force_index: bool) -> dict:
+    if force_index:
+        # Small tables are cheaper to scan sequentially; this only checks that
+        # the filter expressions still match an index.
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+    result = await session.execute(explain_query(query))
+    plan = result.scalar()
+    await session.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def main():
+    force_index = "--natural" not in sys.argv
+    verbose = "--verbose" in sys.argv
+
+    print("Checking that list_scholars filters use their indexes...")
+    print(f"Sequential scans disabled: {force_index}")
+    print("-" * 50)
+
+    failures = 0
+    async with AsyncSessionLocal() as session:
+        scholar_repo = ScholarRepository(session)
+        for name, filters, expected_index in CASES:
+            query = scholar_repo.build_list_scholars_query(**filters)
+            plan = await explain(session, query, force_index)
+            used = index_names(plan)
+            ok = expected_index in used
+            failures += 0 if ok else 1
+            print(f"{'OK  ' if ok else 'FAIL'} {name:<12} expects {expected_index} (uses: {', '.join(sorted(used)) or 'none'})")
+            if verbose:
+                print(json.dumps(plan, indent=2))
+
+    print("-" * 50)
+    if failures:
+        print(f"{failures} filter(s) no longer use their index")
+        sys.exit(1)
+    print("All filters use their indexes")
+
+if __name__ == "__main__":
+    asyncio.run(main())
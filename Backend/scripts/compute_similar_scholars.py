@@ -0,0 +1,49 @@
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+from app.data_access.database import AsyncSessionLocal
+from app.data_access.repositories.scholar_repository import ScholarRepository
+from app.services.embedding_service import get_embedding_service
+from app.services.scholar_vector_service import ScholarVectorService
+
+def parse_int_arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        try:
+            idx = sys.argv.index(name)
+            return int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print(f"Invalid {name} argument, using default: {default}")
+    return default
+
+def print_progress(stats: dict):
+    print(f"Processed {stats['processed']}/{stats['total']} scholars... (Written: {stats['written']})")
+
+async def main():
+    top_k = parse_int_arg("--top-k", settings.similar_scholars_top_k)
+    block_size = parse_int_arg("--block-size", 512)
+
+    print("Computing similar scholars...")
+    print(f"Top K: {top_k}")
+    print(f"Block size: {block_size}")
+    print("-" * 50)
+
+    async with AsyncSessionLocal() as session:
+        vector_service = ScholarVectorService(ScholarRepository(session), get_embedding_service())
+        stats = await vector_service.compute_similar_scholars(
+            top_k=top_k,
+            block_size=block_size,
+            progress_callback=print_progress
+        )
+
+    print("-" * 50)
+    print("Similar scholars computed!")
+    print(f"Scholars with neighbours: {stats['written']}")
+    print(f"Stale rows deleted: {stats['deleted']}")
+    print(f"Seconds: {stats['seconds']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,11 +4,18 @@ import os
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.data_access.database import AsyncSessionLocal
+from app.data_access.database import AsyncSessionLocal, engine
+from app.data_access.schema_upgrades import apply_vector_column_upgrades
 from app.data_access.repositories.scholar_repository import ScholarRepository
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import get_embedding_service
 from app.services.scholar_vector_service import ScholarVectorService
 
+def print_progress(stats: dict):
+    print(
+        f"Processed {stats['total_processed']}/{stats['total']} scholars... "
+        f"(Success: {stats['successful']}, Skipped: {stats['skipped']}, Failed: {stats['failed']})"
+    )
+
 async def main():
     force_regenerate = "--force" in sys.argv
     batch_size = 100
@@ -25,14 +32,20 @@ async def main():
     print(f"Batch size: {batch_size}")
     print("-" * 50)
     
+    # The API normally converts legacy text vector columns on startup.
+    async with engine.begin() as conn:
+        await apply_vector_column_upgrades(conn)
+    await engine.dispose()
+    
     async with AsyncSessionLocal() as session:
         scholar_repo = ScholarRepository(session)
-        embedding_service = EmbeddingService()
+        embedding_service = get_embedding_service()
         vector_service = ScholarVectorService(scholar_repo, embedding_service)
         
         stats = await vector_service.generate_vectors_for_all_scholars(
             batch_size=batch_size,
-            force_regenerate=force_regenerate
+            force_regenerate=force_regenerate,
+            progress_callback=print_progress
         )
         
         print("-" * 50)
@@ -41,6 +54,7 @@ async def main():
         print(f"Successful: {stats['successful']}")
         print(f"Failed: {stats['failed']}")
         print(f"Skipped: {stats['skipped']}")
+        print(f"Throughput (scholars/sec): {stats['throughput']}")
 
 if __name__ == "__main__":
     asyncio.run(main())
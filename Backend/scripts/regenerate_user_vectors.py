@@ -5,23 +5,65 @@ import json
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from app.data_access.database import AsyncSessionLocal
+from app.data_access.database import AsyncSessionLocal, engine
+from app.data_access.schema_upgrades import apply_vector_column_upgrades
 from app.data_access.repositories.user_repository import UserRepository
 from app.data_access.repositories.recommendation_repository import RecommendationRepository
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_service import get_embedding_service
 from app.services.user_service import UserService
 from app.services.recommendation_service import RecommendationService
 from app.data_access.repositories.scholar_repository import ScholarRepository
 
+def parse_int_arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        try:
+            idx = sys.argv.index(name)
+            return int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print(f"Invalid {name} argument, using default: {default}")
+    return default
+
+async def iter_users(user_repo: UserRepository, page_size: int = 500):
+    after_user_id = None
+    while True:
+        users = await user_repo.get_interests_page(after_user_id, page_size)
+        if not users:
+            return
+        after_user_id = users[-1].user_id
+        for user in users:
+            yield user
+
+async def run_bulk(recommendation_service: RecommendationService):
+    top_k = parse_int_arg("--top-k", 20)
+    block_size = parse_int_arg("--block-size", 256)
+    print(f"Bulk mode: top_k={top_k}, block_size={block_size}")
+    
+    stats = await recommendation_service.recalculate_all_recommendations(top_k=top_k, block_size=block_size)
+    
+    print("-" * 50)
+    print("User vector regeneration completed!")
+    print(f"Total users: {stats['total_users']}")
+    print(f"Users with vectors: {stats['users_with_vectors']}")
+    print(f"Skipped (no interests): {stats['skipped_no_interests']}")
+    print(f"Scholars scored: {stats['scholars']}")
+    print(f"Recommendations written: {stats['recommendations_written']}")
+    for stage, seconds in stats["seconds"].items():
+        print(f"  {stage}: {seconds}s")
+
 async def main():
     print("Starting user vector regeneration and recommendation recalculation...")
     print("-" * 50)
     
+    # The API normally converts legacy text vector columns on startup.
+    async with engine.begin() as conn:
+        await apply_vector_column_upgrades(conn)
+    await engine.dispose()
+    
     async with AsyncSessionLocal() as session:
         user_repo = UserRepository(session)
         scholar_repo = ScholarRepository(session)
         recommendation_repo = RecommendationRepository(session)
-        embedding_service = EmbeddingService()
+        embedding_service = get_embedding_service()
         user_service = UserService(user_repo, embedding_service)
         recommendation_service = RecommendationService(
             recommendation_repo,
@@ -31,17 +73,24 @@ async def main():
             user_service
         )
         
-        users = await user_repo.get_all()
+        if "--bulk" in sys.argv:
+            await run_bulk(recommendation_service)
+            return
+        
+        if embedding_service.user_vector_mode == "pooled":
+            research_areas = await scholar_repo.get_unique_research_areas()
+            embedding_service.precompute_term_vectors(research_areas)
         
         stats = {
-            "total_users": len(users),
+            "total_users": 0,
             "processed": 0,
             "regenerated_vectors": 0,
             "recalculated_recommendations": 0,
             "skipped_no_interests": 0
         }
         
-        for user in users:
+        async for user in iter_users(user_repo):
+            stats["total_users"] += 1
             try:
                 interests = user_service.get_user_interests(user)
                 
@@ -50,7 +99,7 @@ async def main():
                     stats["processed"] += 1
                     continue
                 
-                user_vector = embedding_service.generate_embedding_from_list(interests)
+                user_vector = await embedding_service.agenerate_user_interest_vector(interests)
                 if user_vector:
                     await user_repo.update_user_vector(user.user_id, user_vector)
                     stats["regenerated_vectors"] += 1
@@ -61,7 +110,7 @@ async def main():
                 stats["processed"] += 1
                 
                 if stats["processed"] % 10 == 0:
-                    print(f"Processed {stats['processed']}/{stats['total_users']} users...")
+                    print(f"Processed {stats['processed']} users...")
                     
             except Exception as e:
                 print(f"Error processing user {user.user_id}: {str(e)}")
@@ -0,0 +1,42 @@
+import asyncio
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.data_access.database import AsyncSessionLocal
+from app.data_access.repositories.scholar_repository import ScholarRepository
+
+def parse_int_arg(name: str, default: int) -> int:
+    if name in sys.argv:
+        try:
+            idx = sys.argv.index(name)
+            return int(sys.argv[idx + 1])
+        except (IndexError, ValueError):
+            print(f"Invalid {name} argument, using default: {default}")
+    return default
+
+async def main():
+    batch_size = parse_int_arg("--batch-size", 500)
+    print(f"Recomputing scholar_metrics for every scholar (batch_size={batch_size})...")
+    print("-" * 50)
+    
+    started = time.perf_counter()
+    total = 0
+    after_scholar_id = None
+    async with AsyncSessionLocal() as session:
+        scholar_repo = ScholarRepository(session)
+        while True:
+            scholar_ids = await scholar_repo.resync_metrics_batch(after_scholar_id, batch_size)
+            if not scholar_ids:
+                break
+            after_scholar_id = scholar_ids[-1]
+            total += len(scholar_ids)
+            print(f"Recomputed {total} scholars...")
+    
+    print("-" * 50)
+    print(f"Recomputed metrics for {total} scholars in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,26 @@
+import asyncio
+import logging
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+from app.services.embedding_server import EmbeddingServer
+
+async def main():
+    socket_path = settings.embedding_server_socket or "/run/hivemind/embedding.sock"
+    
+    if "--socket" in sys.argv:
+        try:
+            idx = sys.argv.index("--socket")
+            socket_path = sys.argv[idx + 1]
+        except IndexError:
+            print(f"Invalid socket argument, using default: {socket_path}")
+    
+    print(f"Starting embedding server on {socket_path}...")
+    await EmbeddingServer(socket_path).serve_forever()
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
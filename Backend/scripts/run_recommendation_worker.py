@@ -0,0 +1,30 @@
+import asyncio
+import logging
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+from app.services.recommendation_refresh_queue import get_recommendation_refresh_queue
+
+async def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    queue = get_recommendation_refresh_queue()
+
+    if "--once" in sys.argv:
+        refreshed = await queue.drain()
+        print(f"Refreshed recommendations for {refreshed} users")
+        return
+
+    print("Starting recommendation refresh worker...")
+    print(f"Debounce: {settings.recommendation_refresh_debounce_seconds}s")
+    print(f"Poll interval: {settings.recommendation_refresh_poll_seconds}s")
+    print("-" * 50)
+    await queue.run_forever()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("Recommendation worker stopped")
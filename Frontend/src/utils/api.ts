@@ -2,6 +2,9 @@ const API_BASE_URL =
   (typeof import.meta !== 'undefined' && import.meta.env?.VITE_API_URL)
     ? import.meta.env.VITE_API_URL
     : 'http://127.0.0.1:8000';
+// Image URLs come back as paths on the API; resolve them against its origin.
+const resolveApiUrl = (url?: string | null): string | null =>
+  url && url.startsWith('/') ? `${API_BASE_URL.replace(/\/$/, '')}${url}` : url || null;
 interface ApiError {
   message: string;
   status: number;
@@ -309,7 +312,7 @@ class ApiClient {
         publicationCount: s.publication_count || 0,
         availability: s.availability || 'Available',
         email: s.email || '',
-        image: s.image || null,
+        image: resolveApiUrl(s.image),
       })),
       total: response.total,
       page: response.page,
@@ -338,7 +341,7 @@ class ApiClient {
       availability: s.availability || 'Available',
       email: s.email || '',
       bio: s.bio || '',
-      image: s.image || null,
+      image: resolveApiUrl(s.image),
       orcid: s.orcid || '',
       profileUrl: s.profile_url || '',
       education: (s.education || []).sort((a: any, b: any) => sortByDate(a, b, 'year_range')),
@@ -357,7 +360,11 @@ class ApiClient {
     return this.request<any[]>(`/api/v1/scholars/${id}/publications`);
   }
   async getScholarCollaborations(id: string) {
-    return this.request<any>(`/api/v1/scholars/${id}/collaborations`);
+    const graph = await this.request<any>(`/api/v1/scholars/${id}/collaborations`);
+    return {
+      ...graph,
+      nodes: (graph.nodes || []).map((node: any) => ({ ...node, image: resolveApiUrl(node.image) })),
+    };
   }
   async getUniversities() {
     return this.request<any[]>('/api/v1/universities/');
@@ -412,7 +419,7 @@ class ApiClient {
       citationCount: s.citation_count || s.scholar?.citation_count || 0,
       publicationCount: s.publication_count || s.scholar?.publication_count || 0,
       email: s.email || s.scholar?.email || '',
-      image: s.image || s.scholar?.image || null,
+      image: resolveApiUrl(s.image || s.scholar?.image),
       note: s.note,
       savedAt: s.created_at || s.saved_at
     }));